@@ -1,29 +1,75 @@
+import argparse
+from pathlib import Path
+
 import structlog
 
-from project.logging import configure_logging
-from project.settings import get_settings
+from project.game.constants import NUMBER_OF_INGREDIENTS
 from project.game.engine import GameEngine
+from project.game.events import EventBus, LoggingSubscriber
+from project.game.fastforward import FastForwardEngine
+from project.game.rules import Rules
+from project.logging import configure_logging_from_settings
+from project.settings import get_settings
+from project.simulation.backends import BACKENDS, PROCESS
+from project.simulation.benchmark import benchmark_backends
+from project.simulation.golden import (
+    check_engine,
+    describe_divergence,
+    load_traces,
+    record_traces,
+    save_traces,
+)
+from project.simulation.ingest import CHUNK_SIZE, ingest_logs
+from project.simulation.replay import (
+    SNAPSHOT_INTERVAL,
+    Replay,
+    load_recording,
+    record_game,
+    save_recording,
+)
+from project.simulation.results import ResultsStore, simulate
+from project.simulation.shards import (
+    LEASE_SECONDS,
+    SHARD_SIZE,
+    ShardQueue,
+    work_locally,
+)
+from project.simulation.sweep import (
+    grid_variants,
+    random_variants,
+    run_sweep,
+    write_results,
+)
 
+# Safety limit to prevent infinite loops
+MAX_TURNS = 1000
 
-def main():
-    # Load settings
-    settings = get_settings()
+# Engines that can be checked against the reference engine
+ENGINES = {"reference": GameEngine, "fastforward": FastForwardEngine}
 
-    # Logging configuration (must be done before any logging is done)
-    configure_logging(level=settings.log.level, format=settings.log.format)
 
+def play(args: argparse.Namespace) -> None:
+    """
+    Play a single game until someone wins, logging every event.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
     logger = structlog.get_logger(__name__)
 
     logger.info("Starting Crazy Pizza RL game")
 
+    # Game events are reported through the logs
+    events = EventBus()
+    events.subscribe(LoggingSubscriber())
+
     # Initialize game with seed
-    game = GameEngine(seed=42)
+    game = GameEngine(seed=args.seed, events=events)
 
     # Run game until someone wins
     winner_id = None
-    max_turns = 1000  # Safety limit to prevent infinite loops
 
-    while winner_id is None and game.turn_count < max_turns:
+    while winner_id is None and game.turn_count < MAX_TURNS:
         winner_id = game.step()
 
     if winner_id is not None:
@@ -35,9 +81,497 @@ def main():
     else:
         logger.warning(
             "Game reached maximum turn limit without a winner",
-            max_turns=max_turns,
+            max_turns=MAX_TURNS,
+        )
+
+
+def record(args: argparse.Namespace) -> None:
+    """
+    Play a single game and save its recording.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    logger = structlog.get_logger(__name__)
+
+    recording = record_game(args.seed, max_turns=MAX_TURNS)
+    save_recording(recording, args.output)
+
+    logger.info(
+        "Game recorded",
+        seed=recording.seed,
+        steps=recording.steps,
+        decisions=len(recording.decisions),
+        winner_id=recording.winner_id,
+        output=str(args.output),
+    )
+
+
+def describe(replay: Replay) -> str:
+    """
+    Describe the current state of a replayed game.
+
+    Args:
+        replay (Replay): Replay to describe.
+
+    Returns:
+        str: Multi-line human-readable description.
+    """
+    engine = replay.engine
+
+    lines = [
+        (
+            f"Step {replay.step_index}/{replay.recording.steps}"
+            f" | next agent {engine.current_agent_index}"
+            f" | position {engine.board_position} ({engine.board[engine.board_position]})"
+            f" | {len(engine.action_queue)} cards left"
+        )
+    ]
+
+    for agent in engine.agents:
+        held = [i for i in range(NUMBER_OF_INGREDIENTS) if agent.state & (1 << i)]
+        needed = [
+            i for i in range(NUMBER_OF_INGREDIENTS) if agent.needed_mask & (1 << i)
+        ]
+        lines.append(f"  agent {agent.id}: held {held} needed {needed}")
+
+    return "\n".join(lines)
+
+
+def replay(args: argparse.Namespace) -> None:
+    """
+    Step interactively through a recorded game.
+
+    Commands: n (next step), p (previous step), g <step> (go to step), q (quit).
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    events = EventBus()
+    events.subscribe(LoggingSubscriber())
+
+    game_replay = Replay(load_recording(args.recording), args.interval, events)
+    game_replay.seek(args.step)
+
+    print(describe(game_replay))
+
+    while True:
+        command = input("[n]ext, [p]revious, [g]oto <step>, [q]uit > ").split()
+
+        try:
+            match command:
+                case ["n"] | []:
+                    game_replay.forward()
+                case ["p"]:
+                    game_replay.backward()
+                case ["g", step]:
+                    game_replay.seek(int(step))
+                case ["q"]:
+                    return
+                case _:
+                    print("Unknown command")
+                    continue
+        except ValueError as error:
+            print(error)
+            continue
+
+        print(describe(game_replay))
+
+
+def simulate_games(args: argparse.Namespace) -> None:
+    """
+    Play many games and append their outcomes to a results store.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    logger = structlog.get_logger(__name__)
+
+    with ResultsStore(args.output) as store:
+        simulate(
+            store,
+            range(args.first_seed, args.first_seed + args.games),
+            max_turns=MAX_TURNS,
+            workers=args.workers,
+            backend=args.backend,
+        )
+
+    logger.info("Results stored", games=len(store), output=str(args.output))
+
+
+def parse_rule_values(specs: list[str]) -> dict[str, str]:
+    """
+    Split rule specifications of the form name=value into a mapping.
+
+    Args:
+        specs (list[str]): Specifications given on the command line.
+
+    Returns:
+        dict[str, str]: Unparsed value of each rule field.
+    """
+    values = {}
+
+    for spec in specs:
+        name, separator, value = spec.partition("=")
+
+        if not separator or name not in Rules._fields:
+            raise SystemExit(
+                f"Invalid rule specification {spec!r}, expected one of {Rules._fields} followed by =value"
+            )
+
+        values[name] = value
+
+    return values
+
+
+def sweep(args: argparse.Namespace) -> None:
+    """
+    Play many games with each rule variant and write their statistics.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    logger = structlog.get_logger(__name__)
+
+    if args.random:
+        ranges = {
+            name: tuple(int(bound) for bound in value.split(":"))
+            for name, value in parse_rule_values(args.random).items()
+        }
+        variants = random_variants(ranges, args.samples, seed=args.variant_seed)
+    else:
+        variants = grid_variants(
+            {
+                name: [int(item) for item in value.split(",")]
+                for name, value in parse_rule_values(args.grid).items()
+            }
+        )
+
+    seeds = range(args.first_seed, args.first_seed + args.games)
+
+    if args.queue is not None:
+        if args.cache is not None:
+            raise SystemExit(
+                "--cache cannot be used with --queue: queued shards are played without a cache"
+            )
+
+        queue = ShardQueue.create(
+            args.queue,
+            variants,
+            seeds,
+            shard_size=args.shard_size,
+            max_turns=MAX_TURNS,
+            lease=args.lease,
+        )
+
+        logger.info("Sweep queued", shards=len(queue), queue=str(args.queue))
+        return
+
+    summaries = run_sweep(
+        variants,
+        seeds,
+        max_turns=MAX_TURNS,
+        workers=args.workers,
+        backend=args.backend,
+        cache=args.cache,
+    )
+    write_results(summaries, args.output)
+
+    logger.info(
+        "Sweep results written", variants=len(summaries), output=str(args.output)
+    )
+
+
+def sweep_work(args: argparse.Namespace) -> None:
+    """
+    Play shards of a queued sweep until none is pending.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    logger = structlog.get_logger(__name__)
+
+    played = work_locally(args.queue, args.processes)
+
+    logger.info(
+        "Sweep work finished",
+        shards=played,
+        remaining=ShardQueue(args.queue).remaining(),
+    )
+
+
+def sweep_merge(args: argparse.Namespace) -> None:
+    """
+    Combine the shard results of a queued sweep.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    logger = structlog.get_logger(__name__)
+
+    try:
+        summaries = ShardQueue(args.queue).merge()
+    except ValueError as error:
+        raise SystemExit(str(error)) from None
+
+    write_results(summaries, args.output)
+
+    logger.info(
+        "Sweep results written", variants=len(summaries), output=str(args.output)
+    )
+
+
+def benchmark(args: argparse.Namespace) -> None:
+    """
+    Compare how the execution backends scale with the number of workers.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    results = benchmark_backends(args.workers, args.games, args.backend)
+
+    print(f"{'backend':<12} {'workers':>7} {'games/s':>10} {'speedup':>8}")
+
+    for result in results:
+        print(
+            f"{result.backend:<12} {result.workers:>7}"
+            f" {result.games_per_second:>10.1f} {result.speedup:>8.2f}"
         )
 
 
+def golden(args: argparse.Namespace) -> None:
+    """
+    Record golden traces of many games with the reference engine.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    logger = structlog.get_logger(__name__)
+
+    traces = record_traces(
+        range(args.first_seed, args.first_seed + args.games),
+        max_turns=MAX_TURNS,
+        workers=args.workers,
+        backend=args.backend,
+    )
+    save_traces(traces, args.output)
+
+    logger.info(
+        "Golden traces written", games=len(traces.traces), output=str(args.output)
+    )
+
+
+def verify(args: argparse.Namespace) -> None:
+    """
+    Check that an engine plays exactly like the reference engine.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    if args.traces is not None:
+        games = load_traces(args.traces)
+    else:
+        games = range(args.first_seed, args.first_seed + args.games)
+
+    divergences = check_engine(
+        ENGINES[args.engine],
+        games,
+        max_turns=MAX_TURNS,
+        workers=args.workers,
+        backend=args.backend,
+        max_divergences=args.max_divergences,
+    )
+
+    for divergence in divergences:
+        print(describe_divergence(divergence))
+
+    if divergences:
+        raise SystemExit(1)
+
+
+def ingest(args: argparse.Namespace) -> None:
+    """
+    Convert JSON game logs into a trajectory store.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    logger = structlog.get_logger(__name__)
+
+    stats = ingest_logs(args.logs, args.output, chunk_size=args.chunk_size)
+
+    logger.info(
+        "Trajectories written",
+        games=stats.games,
+        incomplete=stats.incomplete,
+        output=str(args.output),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="project", description="Crazy Pizza RL")
+    parser.set_defaults(seed=42)
+    commands = parser.add_subparsers(dest="command")
+
+    play_parser = commands.add_parser("play", help="Play a single game (default)")
+    play_parser.add_argument("--seed", type=int, default=42)
+
+    record_parser = commands.add_parser("record", help="Record a single game")
+    record_parser.add_argument("--seed", type=int, default=42)
+    record_parser.add_argument("--output", type=Path, required=True)
+
+    replay_parser = commands.add_parser("replay", help="Step through a recording")
+    replay_parser.add_argument("recording", type=Path)
+    replay_parser.add_argument("--step", type=int, default=0)
+    replay_parser.add_argument("--interval", type=int, default=SNAPSHOT_INTERVAL)
+
+    simulate_parser = commands.add_parser(
+        "simulate", help="Append game outcomes to a results store"
+    )
+    simulate_parser.add_argument("--games", type=int, default=1000)
+    simulate_parser.add_argument("--first-seed", type=int, default=0)
+    simulate_parser.add_argument("--workers", type=int, default=None)
+    simulate_parser.add_argument("--backend", choices=BACKENDS, default=PROCESS)
+    simulate_parser.add_argument("--output", type=Path, required=True)
+
+    sweep_parser = commands.add_parser("sweep", help="Compare rule variants")
+    sweep_search = sweep_parser.add_mutually_exclusive_group()
+    sweep_search.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        metavar="RULE=V1,V2,...",
+        help="Values of a rule field to combine with every other swept field",
+    )
+    sweep_search.add_argument(
+        "--random",
+        action="append",
+        default=[],
+        metavar="RULE=LOW:HIGH",
+        help="Inclusive range of a rule field to sample from",
+    )
+    sweep_parser.add_argument("--samples", type=int, default=32)
+    sweep_parser.add_argument("--variant-seed", type=int, default=None)
+    sweep_parser.add_argument("--games", type=int, default=1000)
+    sweep_parser.add_argument("--first-seed", type=int, default=0)
+    sweep_parser.add_argument("--workers", type=int, default=None)
+    sweep_parser.add_argument("--backend", choices=BACKENDS, default=PROCESS)
+    sweep_output = sweep_parser.add_mutually_exclusive_group(required=True)
+    sweep_output.add_argument("--output", type=Path)
+    sweep_output.add_argument(
+        "--queue",
+        type=Path,
+        help="Shared directory to enqueue the sweep in, for sweep-work nodes",
+    )
+    sweep_parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="Outcome cache directory, so already played seeds are not played again",
+    )
+    sweep_parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    sweep_parser.add_argument(
+        "--lease",
+        type=float,
+        default=LEASE_SECONDS,
+        help="Seconds after which the shard of an unresponsive node is re-queued",
+    )
+
+    sweep_work_parser = commands.add_parser(
+        "sweep-work", help="Play shards of a queued sweep"
+    )
+    sweep_work_parser.add_argument("--queue", type=Path, required=True)
+    sweep_work_parser.add_argument("--processes", type=int, default=1)
+
+    sweep_merge_parser = commands.add_parser(
+        "sweep-merge", help="Combine the results of a queued sweep"
+    )
+    sweep_merge_parser.add_argument("--queue", type=Path, required=True)
+    sweep_merge_parser.add_argument("--output", type=Path, required=True)
+
+    benchmark_parser = commands.add_parser(
+        "benchmark", help="Compare the scaling of the execution backends"
+    )
+    benchmark_parser.add_argument("--games", type=int, default=2000)
+    benchmark_parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, 8]
+    )
+    benchmark_parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        nargs="+",
+        help="Backends to compare, every available one by default",
+    )
+
+    golden_parser = commands.add_parser(
+        "golden", help="Record golden traces with the reference engine"
+    )
+    golden_parser.add_argument("--games", type=int, default=1000)
+    golden_parser.add_argument("--first-seed", type=int, default=0)
+    golden_parser.add_argument("--workers", type=int, default=None)
+    golden_parser.add_argument("--backend", choices=BACKENDS, default=PROCESS)
+    golden_parser.add_argument("--output", type=Path, required=True)
+
+    verify_parser = commands.add_parser(
+        "verify", help="Check an engine against the reference engine"
+    )
+    verify_parser.add_argument("--engine", choices=ENGINES, default="fastforward")
+    verify_parser.add_argument(
+        "--traces",
+        type=Path,
+        default=None,
+        help="Golden traces to check against, instead of replaying the reference engine",
+    )
+    verify_parser.add_argument("--games", type=int, default=1000)
+    verify_parser.add_argument("--first-seed", type=int, default=0)
+    verify_parser.add_argument("--workers", type=int, default=None)
+    verify_parser.add_argument("--backend", choices=BACKENDS, default=PROCESS)
+    verify_parser.add_argument("--max-divergences", type=int, default=10)
+
+    ingest_parser = commands.add_parser(
+        "ingest", help="Rebuild game trajectories from JSON logs"
+    )
+    ingest_parser.add_argument(
+        "logs",
+        type=Path,
+        nargs="+",
+        help="JSON log files, plain or gzip-compressed, oldest first",
+    )
+    ingest_parser.add_argument("--output", type=Path, required=True)
+    ingest_parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    args = parser.parse_args()
+
+    # Load settings
+    settings = get_settings()
+
+    # Logging configuration (must be done before any logging is done)
+    configure_logging_from_settings(settings.log)
+
+    match args.command:
+        case "record":
+            record(args)
+        case "replay":
+            replay(args)
+        case "simulate":
+            simulate_games(args)
+        case "sweep":
+            sweep(args)
+        case "sweep-work":
+            sweep_work(args)
+        case "sweep-merge":
+            sweep_merge(args)
+        case "benchmark":
+            benchmark(args)
+        case "golden":
+            golden(args)
+        case "verify":
+            verify(args)
+        case "ingest":
+            ingest(args)
+        case _:
+            play(args)
+
+
 if __name__ == "__main__":
     main()
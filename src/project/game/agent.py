@@ -1,5 +1,10 @@
+from typing import Self
+
 import structlog
 
+from project.game.events import IngredientsGained, IngredientsLost, IngredientsStolen
+from project.game.table import AgentTable
+
 logger = structlog.get_logger(__name__)
 
 
@@ -9,20 +14,29 @@ class Agent:
 
     The agent's goal is to match their state to their condition by collecting ingredients.
     Both condition and state are represented as bitmasks where each bit represents an ingredient.
+
+    An agent is a thin view over one column of an `AgentTable`, so that the data of every
+    player in a game lives in a single contiguous array.
     """
 
+    __slots__ = ("id", "index", "logger", "table")
+
     def __init__(self, agent_id: int, condition: int, state: int):
         """
         Initializes an agent with a unique ID, winning condition, and starting state.
 
+        The agent is backed by its own single-agent table. Use `Agent.view` to create
+        agents that share a table with other players.
+
         Args:
             agent_id (int): Unique identifier for the agent.
             condition (int): Bitmask representing the ingredients needed to win.
             state (int): Bitmask representing the ingredients currently held.
         """
         self.id = agent_id
-        self.condition = condition
-        self.state = state
+        self.table = AgentTable([condition], [state])
+        self.index = 0
+        self.logger = logger
         logger.debug(
             "Agent initialized",
             agent_id=agent_id,
@@ -30,6 +44,55 @@ def __init__(self, agent_id: int, condition: int, state: int):
             state=bin(state),
         )
 
+    @classmethod
+    def view(cls, table: AgentTable, index: int) -> Self:
+        """
+        Creates an agent backed by an existing table column.
+
+        The agent ID is the column index.
+
+        Args:
+            table (AgentTable): Table holding the agent's condition and state.
+            index (int): Column of the agent in the table.
+
+        Returns:
+            Agent: View over the table column.
+        """
+        agent = cls.__new__(cls)
+        agent.id = index
+        agent.table = table
+        agent.logger = table.logger if table.logger is not None else logger
+        agent.index = index
+        return agent
+
+    @property
+    def condition(self) -> int:
+        """
+        Returns the bitmask of ingredients needed to win.
+
+        Returns:
+            int: Bitmask where each set bit represents a required ingredient.
+        """
+        return int(self.table.conditions[self.index])
+
+    @condition.setter
+    def condition(self, value: int) -> None:
+        self.table.conditions[self.index] = value
+
+    @property
+    def state(self) -> int:
+        """
+        Returns the bitmask of ingredients currently held.
+
+        Returns:
+            int: Bitmask where each set bit represents a held ingredient.
+        """
+        return int(self.table.states[self.index])
+
+    @state.setter
+    def state(self, value: int) -> None:
+        self.table.states[self.index] = value
+
     @property
     def needed_mask(self) -> int:
         """
@@ -70,16 +133,17 @@ def choose(self, mask: int) -> None:
         old_state = self.state
         self.state |= mask
 
-        if mask != 0:
-            logger.info(
-                "Agent gained ingredients",
-                agent_id=self.id,
-                gained=[i for i in range(10) if mask & (1 << i)],
-                state=[i for i in range(10) if self.state & (1 << i)],
-                still_needed=self.needed_count,
+        if mask != 0 and self.table.events.active:
+            self.table.events.publish(
+                IngredientsGained(
+                    agent_id=self.id,
+                    gained=mask,
+                    state=self.state,
+                    still_needed=self.needed_count,
+                )
             )
 
-        logger.debug(
+        self.logger.debug(
             "Agent chose ingredients",
             agent_id=self.id,
             mask=bin(mask),
@@ -97,16 +161,17 @@ def lose(self, mask: int) -> None:
         old_state = self.state
         self.state &= ~mask
 
-        if mask != 0:
-            logger.info(
-                "Agent lost ingredients",
-                agent_id=self.id,
-                lost=[i for i in range(10) if mask & (1 << i)],
-                state=[i for i in range(10) if self.state & (1 << i)],
-                still_needed=self.needed_count,
+        if mask != 0 and self.table.events.active:
+            self.table.events.publish(
+                IngredientsLost(
+                    agent_id=self.id,
+                    lost=mask,
+                    state=self.state,
+                    still_needed=self.needed_count,
+                )
             )
 
-        logger.debug(
+        self.logger.debug(
             "Agent lost ingredients",
             agent_id=self.id,
             mask=bin(mask),
@@ -131,17 +196,18 @@ def steal_from(self, target: "Agent", mask: int) -> None:
         target.state &= ~stolen
         self.state |= stolen
 
-        if stolen != 0:
-            logger.info(
-                "Agent stole ingredients",
-                thief_id=self.id,
-                target_id=target.id,
-                stolen=[i for i in range(10) if stolen & (1 << i)],
-                thief_state=[i for i in range(10) if self.state & (1 << i)],
-                target_state=[i for i in range(10) if target.state & (1 << i)],
+        if stolen != 0 and self.table.events.active:
+            self.table.events.publish(
+                IngredientsStolen(
+                    thief_id=self.id,
+                    target_id=target.id,
+                    stolen=stolen,
+                    thief_state=self.state,
+                    target_state=target.state,
+                )
             )
 
-        logger.debug(
+        self.logger.debug(
             "Agent stole from another agent",
             thief_id=self.id,
             target_id=target.id,
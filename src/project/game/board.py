@@ -1,29 +1,35 @@
 from random import Random
 
+import numpy as np
 import structlog
 
 from project.game.constants import (
-    NUMBER_OF_INGREDIENTS,
-    TILES_PER_INGREDIENT,
-    INGREDIENT_PREFIX,
-    CHOOSE_ANY_INGREDIENT_TILES,
     CHOOSE_ANY_INGREDIENT_TILE_NAME,
-    QUEUED_RANDOM_ACTION_TILES,
-    QUEUED_RANDOM_ACTION_TILE_NAME,
-    LOSE_ALL_INGREDIENTS_TILES,
+    INGREDIENT_PREFIX,
     LOSE_ALL_INGREDIENTS_TILE_NAME,
-    TOTAL_BOARD_SIZE,
+    NUMBER_OF_INGREDIENTS,
+    QUEUED_RANDOM_ACTION_TILE_NAME,
 )
+from project.game.rules import DEFAULT_RULES, Rules
 
 logger = structlog.get_logger(__name__)
 
+# Integer codes of the tile types: ingredient tiles use their ingredient index
+CHOOSE_ANY_INGREDIENT_TILE_CODE: int = NUMBER_OF_INGREDIENTS
+QUEUED_RANDOM_ACTION_TILE_CODE: int = NUMBER_OF_INGREDIENTS + 1
+LOSE_ALL_INGREDIENTS_TILE_CODE: int = NUMBER_OF_INGREDIENTS + 2
+NUMBER_OF_TILE_CODES: int = NUMBER_OF_INGREDIENTS + 3
+
 
-def generate_board(random_number_generator_seed: int | None) -> list[str]:
+def generate_board(
+    random_number_generator_seed: int | None, rules: Rules = DEFAULT_RULES
+) -> list[str]:
     """
-    Generates a shuffled board based on constants.
+    Generates a shuffled board based on the rules.
 
     Args:
         random_number_generator_seed (int | None): The seed to use for the random number generator. If None, a random seed is used.
+        rules (Rules): Tile counts of the board. Defaults to the constants.
 
     Returns:
         list[str]: A shuffled list of board tiles.
@@ -31,32 +37,64 @@ def generate_board(random_number_generator_seed: int | None) -> list[str]:
     logger.debug(
         "Generating board",
         seed=random_number_generator_seed,
-        total_size=TOTAL_BOARD_SIZE,
+        total_size=rules.board_size,
     )
     rng = Random(random_number_generator_seed)
     board = []
 
     for i in range(NUMBER_OF_INGREDIENTS):
         tile_name = f"{INGREDIENT_PREFIX}{i}"
-        board.extend([tile_name] * TILES_PER_INGREDIENT)
+        board.extend([tile_name] * rules.tiles_per_ingredient)
 
-    board.extend([CHOOSE_ANY_INGREDIENT_TILE_NAME] * CHOOSE_ANY_INGREDIENT_TILES)
-    board.extend([QUEUED_RANDOM_ACTION_TILE_NAME] * QUEUED_RANDOM_ACTION_TILES)
-    board.extend([LOSE_ALL_INGREDIENTS_TILE_NAME] * LOSE_ALL_INGREDIENTS_TILES)
+    board.extend([CHOOSE_ANY_INGREDIENT_TILE_NAME] * rules.choose_any_ingredient_tiles)
+    board.extend([QUEUED_RANDOM_ACTION_TILE_NAME] * rules.queued_random_action_tiles)
+    board.extend([LOSE_ALL_INGREDIENTS_TILE_NAME] * rules.lose_all_ingredients_tiles)
 
     assert (
-        len(board) == TOTAL_BOARD_SIZE
-    ), f"Expected board size {TOTAL_BOARD_SIZE}, but got {len(board)}"
+        len(board) == rules.board_size
+    ), f"Expected board size {rules.board_size}, but got {len(board)}"
 
     rng.shuffle(board)
 
     logger.debug(
         "Board generated successfully",
         board_size=len(board),
-        ingredient_tiles=NUMBER_OF_INGREDIENTS * TILES_PER_INGREDIENT,
-        special_tiles=CHOOSE_ANY_INGREDIENT_TILES
-        + QUEUED_RANDOM_ACTION_TILES
-        + LOSE_ALL_INGREDIENTS_TILES,
+        ingredient_tiles=NUMBER_OF_INGREDIENTS * rules.tiles_per_ingredient,
+        special_tiles=rules.choose_any_ingredient_tiles
+        + rules.queued_random_action_tiles
+        + rules.lose_all_ingredients_tiles,
     )
 
     return board
+
+
+def encode_board(board: list[str]) -> np.ndarray:
+    """
+    Converts a board into an array of integer tile codes.
+
+    Ingredient tiles are encoded by their ingredient index, and special tiles by the
+    CHOOSE_ANY_INGREDIENT_TILE_CODE, QUEUED_RANDOM_ACTION_TILE_CODE and LOSE_ALL_INGREDIENTS_TILE_CODE constants.
+
+    Args:
+        board (list[str]): Board tiles, as returned by generate_board.
+
+    Returns:
+        np.ndarray: Tile codes, one per board position.
+    """
+    special_codes = {
+        CHOOSE_ANY_INGREDIENT_TILE_NAME: CHOOSE_ANY_INGREDIENT_TILE_CODE,
+        QUEUED_RANDOM_ACTION_TILE_NAME: QUEUED_RANDOM_ACTION_TILE_CODE,
+        LOSE_ALL_INGREDIENTS_TILE_NAME: LOSE_ALL_INGREDIENTS_TILE_CODE,
+    }
+
+    codes = np.empty(len(board), dtype=np.int8)
+
+    for position, tile in enumerate(board):
+        if tile.startswith(INGREDIENT_PREFIX):
+            codes[position] = int(tile[len(INGREDIENT_PREFIX) :])
+        elif tile in special_codes:
+            codes[position] = special_codes[tile]
+        else:
+            raise ValueError(f"Unknown tile: {tile}")
+
+    return codes
@@ -0,0 +1,28 @@
+from functools import cache
+
+from project.game.constants import MOVEMENT_DICE_COUNT, MOVEMENT_DICE_SIDES
+
+
+@cache
+def movement_distribution() -> tuple[tuple[int, float], ...]:
+    """
+    Computes the exact distribution of the movement dice total.
+
+    Returns:
+        tuple[tuple[int, float], ...]: Pairs of (total, probability), ordered by total.
+    """
+    # Number of ways to reach each total, built one die at a time
+    ways = {0: 1}
+
+    for _ in range(MOVEMENT_DICE_COUNT):
+        next_ways: dict[int, int] = {}
+
+        for total, count in ways.items():
+            for face in range(1, MOVEMENT_DICE_SIDES + 1):
+                next_ways[total + face] = next_ways.get(total + face, 0) + count
+
+        ways = next_ways
+
+    outcomes = MOVEMENT_DICE_SIDES**MOVEMENT_DICE_COUNT
+
+    return tuple((total, ways[total] / outcomes) for total in sorted(ways))
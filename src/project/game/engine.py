@@ -1,22 +1,44 @@
+from collections.abc import Iterable
+from functools import cached_property
 from random import Random
+from typing import Self
 
+import numpy as np
 import structlog
 
 from project.game.agent import Agent
-from project.game.board import generate_board
+from project.game.board import encode_board, generate_board
 from project.game.condition import generate_conditions
-from project.game.queue import generate_action_queue
-
 from project.game.constants import (
-    NUMBER_OF_PLAYERS,
-    NUMBER_OF_INGREDIENTS,
+    CHOOSE_ANY_INGREDIENT_TILE_NAME,
+    INGREDIENT_PREFIX,
+    LOSE_ALL_INGREDIENTS_TILE_NAME,
     MOVEMENT_DICE_COUNT,
     MOVEMENT_DICE_SIDES,
-    INGREDIENT_PREFIX,
-    CHOOSE_ANY_INGREDIENT_TILE_NAME,
+    NUMBER_OF_INGREDIENTS,
+    NUMBER_OF_PLAYERS,
     QUEUED_RANDOM_ACTION_TILE_NAME,
-    LOSE_ALL_INGREDIENTS_TILE_NAME,
 )
+from project.game.events import (
+    CardDrawn,
+    EventBus,
+    GameWon,
+    TileLanded,
+    TileResolved,
+    TurnStarted,
+)
+from project.game.landing import landing_table
+from project.game.policy import CHOOSE, LOSE, STEAL, Policy, RandomPolicy
+from project.game.queue import (
+    ACTION_INDEX,
+    DECK_DTYPE,
+    count_actions,
+    generate_action_queue,
+)
+from project.game.rules import DEFAULT_RULES, Rules
+from project.game.scenario import Scenario
+from project.game.snapshot import GameSnapshot
+from project.game.table import AgentTable
 
 logger = structlog.get_logger(__name__)
 
@@ -26,7 +48,15 @@ class GameEngine:
     Core game engine class.
     """
 
-    def __init__(self, seed: int | None = None) -> None:
+    def __init__(
+        self,
+        seed: int | None = None,
+        policies: list[Policy] | None = None,
+        events: EventBus | None = None,
+        rules: Rules = DEFAULT_RULES,
+        bound_logger: structlog.typing.BindableLogger | None = None,
+        scenario: Scenario | None = None,
+    ) -> None:
         """
         Initialize the game engine.
 
@@ -34,31 +64,103 @@ def __init__(self, seed: int | None = None) -> None:
             seed (int | None):
                 Seed for deterministic randomness.
                 If None, randomness will be non-deterministic.
+            policies (list[Policy] | None):
+                Decision policy for each agent.
+                If None, every agent decides at random.
+            events (EventBus | None):
+                Bus receiving the game events.
+                If None, a bus without subscribers is used.
+            rules (Rules):
+                Board and deck composition.
+                Defaults to the constants.
+            bound_logger (structlog.typing.BindableLogger | None):
+                Logger of this game, shared with its agents.
+                If None, the module loggers are used.
+            scenario (Scenario | None):
+                Position to start from, checked against the rules.
+                If None, the board, deck and conditions are generated from the seed
+                and the game starts at the first turn. Engines built from a scenario
+                log nothing while setting up, so they can be created in bulk.
         """
 
-        logger.debug("Initializing game engine", seed=seed)
+        self.logger = bound_logger if bound_logger is not None else logger
+
+        if scenario is None:
+            self.logger.debug("Initializing game engine", seed=seed)
 
-        # RNG used for all game randomness
+        # RNG used for dice rolls and deck replenishment
         self.rng = Random(seed)
 
         # Generate deterministic components using derived seeds
         board_seed = seed + 1 if seed is not None else None
         queue_seed = seed + 2 if seed is not None else None
         condition_seed = seed + 3 if seed is not None else None
+        decision_seed = seed + 4 if seed is not None else None
 
-        self.board = generate_board(board_seed)
-        self.action_queue = generate_action_queue(queue_seed)
-        conditions = generate_conditions(condition_seed)
+        # Separate RNG for random decisions, so that dice and deck streams
+        # are identical for the same seed whatever the policies decide
+        self.decision_rng = Random(decision_seed)
 
-        # Create agents with empty starting state
-        self.agents = [
-            Agent(agent_id=i, condition=conditions[i], state=0)
-            for i in range(NUMBER_OF_PLAYERS)
-        ]
+        if policies is None:
+            policies = [RandomPolicy()] * NUMBER_OF_PLAYERS
+
+        if len(policies) != NUMBER_OF_PLAYERS:
+            raise ValueError(
+                f"Expected {NUMBER_OF_PLAYERS} policies, but got {len(policies)}"
+            )
+
+        self.policies = policies
+
+        self.events = events if events is not None else EventBus()
+
+        self.rules = rules
+
+        if scenario is None:
+            self.board = generate_board(board_seed, rules)
+            self.board_codes = encode_board(self.board)
+            self.action_queue = generate_action_queue(queue_seed, rules)
+            conditions = generate_conditions(condition_seed)[:NUMBER_OF_PLAYERS]
+        else:
+            scenario.validate(rules)
+
+            self.board = list(scenario.board)
+            self.board_codes = scenario.board_codes(rules)
+            self.action_queue = list(scenario.action_queue)
+            conditions = list(scenario.conditions)
+
+        # Remaining copies of each action, kept up to date on every draw and replenishment,
+        # so card-aware policies and observations never scan the queue
+        self.full_deck = np.array(
+            tuple(rules.action_queue_composition().values()), dtype=DECK_DTYPE
+        )
+        self.deck_counts = np.array(count_actions(self.action_queue), dtype=DECK_DTYPE)
+
+        # Store every agent's condition and state in one table, empty unless given a scenario
+        self.table = AgentTable(
+            conditions,
+            states=list(scenario.states) if scenario is not None else None,
+            events=self.events,
+            bound_logger=bound_logger,
+        )
+
+        self.agents = [Agent.view(self.table, i) for i in range(NUMBER_OF_PLAYERS)]
+
+        # Shared board pointer (global position)
+        self.board_position = 0
+
+        # Turn tracking
+        self.current_agent_index = 0
+        self.turn_count = 0
+
+        if scenario is not None:
+            self.board_position = scenario.board_position
+            self.current_agent_index = scenario.current_agent_index
+            self.turn_count = scenario.turn_count
+            return
 
         # Log each agent's winning condition
         for agent in self.agents:
-            logger.info(
+            self.logger.info(
                 "Agent created",
                 agent_id=agent.id,
                 needs=[
@@ -69,14 +171,7 @@ def __init__(self, seed: int | None = None) -> None:
                 total_needed=agent.condition.bit_count(),
             )
 
-        # Shared board pointer (global position)
-        self.board_position = 0
-
-        # Turn tracking
-        self.current_agent_index = 0
-        self.turn_count = 0
-
-        logger.info(
+        self.logger.info(
             "Game engine initialized",
             board_size=len(self.board),
             queue_size=len(self.action_queue),
@@ -100,7 +195,7 @@ def roll_movement_dice(self) -> int:
         for _ in range(MOVEMENT_DICE_COUNT):
             total += self.rng.randint(1, MOVEMENT_DICE_SIDES)
 
-        logger.debug("Movement dice rolled", total=total)
+        self.logger.debug("Movement dice rolled", total=total)
 
         return total
 
@@ -121,7 +216,7 @@ def advance_board(self, steps: int) -> str:
 
         tile = self.board[self.board_position]
 
-        logger.debug(
+        self.logger.debug(
             "Board advanced",
             old_position=old_position,
             new_position=self.board_position,
@@ -130,6 +225,17 @@ def advance_board(self, steps: int) -> str:
 
         return tile
 
+    @cached_property
+    def landing(self) -> np.ndarray:
+        """
+        Landing table of the board, computed on first use and kept for the whole game.
+
+        Returns:
+            np.ndarray: Read-only table, see project.game.landing.landing_table.
+        """
+
+        return landing_table(self.board_codes)
+
     # =============================================================================
     # Action queue handling
     # =============================================================================
@@ -148,16 +254,38 @@ def pop_action(self) -> str:
 
             # Replenish queue
             new_seed = self.rng.randint(0, 2**31 - 1)
-            self.action_queue = generate_action_queue(new_seed)
+            self.action_queue = generate_action_queue(new_seed, self.rules)
+            self.deck_counts[:] = self.full_deck
 
-            logger.debug("Action queue replenished", seed=new_seed)
+            self.logger.debug("Action queue replenished", seed=new_seed)
 
         action = self.action_queue.pop(0)
+        self.deck_counts[ACTION_INDEX[action]] -= 1
 
-        logger.debug("Action popped", action=action)
+        self.logger.debug("Action popped", action=action)
 
         return action
 
+    def next_card_probabilities(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Compute the probability of each action being the next card drawn.
+
+        The order of the remaining cards is treated as unknown. An empty queue is replenished
+        before drawing, so the next card then follows the full deck composition.
+
+        Args:
+            out (np.ndarray | None): Float buffer of len(ACTION_NAMES) to fill. If None, one is allocated.
+
+        Returns:
+            np.ndarray: Probabilities indexed like ACTION_NAMES.
+        """
+
+        counts = self.deck_counts if self.action_queue else self.full_deck
+
+        return np.divide(
+            counts, len(self.action_queue) or self.rules.action_queue_size, out=out
+        )
+
     # =============================================================================
     # Mask computation
     # =============================================================================
@@ -205,14 +333,7 @@ def compute_steal_mask(self, agent: Agent) -> int:
             int: Bitmask
         """
 
-        other_owned = 0
-
-        for other in self.agents:
-
-            if other.id != agent.id:
-                other_owned |= other.state
-
-        return other_owned & agent.needed_mask
+        return self.table.owned_by_others(agent.index) & agent.needed_mask
 
     # =============================================================================
     # Bit selection
@@ -232,7 +353,7 @@ def select_random_bits(self, mask: int, count: int) -> int:
 
         available = [bit for bit in range(NUMBER_OF_INGREDIENTS) if mask & (1 << bit)]
 
-        selected_bits = self.rng.sample(available, count)
+        selected_bits = self.decision_rng.sample(available, count)
 
         result = 0
 
@@ -247,7 +368,7 @@ def select_random_bits(self, mask: int, count: int) -> int:
 
     def auto_resolve_choose(self, agent: Agent, mask: int, amount: int) -> None:
         """
-        Resolve choose action automatically or randomly.
+        Resolve choose action automatically or through the agent's policy.
 
         Args:
             agent (Agent): Choosing agent
@@ -264,13 +385,13 @@ def auto_resolve_choose(self, agent: Agent, mask: int, amount: int) -> None:
             agent.choose(mask)
             return
 
-        selected = self.select_random_bits(mask, amount)
+        selected = self.policies[agent.index].select(self, agent, CHOOSE, mask, amount)
 
         agent.choose(selected)
 
     def auto_resolve_lose(self, agent: Agent, mask: int, amount: int) -> None:
         """
-        Resolve lose action automatically or randomly.
+        Resolve lose action automatically or through the agent's policy.
 
         Args:
             agent (Agent): Losing agent
@@ -287,13 +408,13 @@ def auto_resolve_lose(self, agent: Agent, mask: int, amount: int) -> None:
             agent.lose(mask)
             return
 
-        selected = self.select_random_bits(mask, amount)
+        selected = self.policies[agent.index].select(self, agent, LOSE, mask, amount)
 
         agent.lose(selected)
 
     def auto_resolve_steal(self, agent: Agent, amount: int) -> None:
         """
-        Resolve steal action automatically or randomly.
+        Resolve steal action automatically or through the agent's policy.
 
         Args:
             agent (Agent): Stealing agent
@@ -313,7 +434,7 @@ def auto_resolve_steal(self, agent: Agent, amount: int) -> None:
                     agent.steal_from(other, mask)
             return
 
-        selected = self.select_random_bits(mask, amount)
+        selected = self.policies[agent.index].select(self, agent, STEAL, mask, amount)
 
         for other in self.agents:
             if other.id != agent.id:
@@ -332,7 +453,7 @@ def resolve_tile(self, agent: Agent, tile: str) -> None:
             tile (str): Tile name
         """
 
-        logger.debug("Resolving tile", agent_id=agent.id, tile=tile)
+        self.logger.debug("Resolving tile", agent_id=agent.id, tile=tile)
 
         if tile.startswith(INGREDIENT_PREFIX):
 
@@ -367,13 +488,10 @@ def resolve_action(self, agent: Agent, action: str) -> None:
             agent (Agent): Agent affected by the action
             action (str): Action string
         """
-        logger.info(
-            "Resolving action from card",
-            agent_id=agent.id,
-            action=action,
-        )
+        if self.events.active:
+            self.events.publish(CardDrawn(agent_id=agent.id, action=action))
 
-        logger.debug("Resolving action", agent_id=agent.id, action=action)
+        self.logger.debug("Resolving action", agent_id=agent.id, action=action)
 
         if action.startswith("choose"):
 
@@ -403,14 +521,115 @@ def resolve_action(self, agent: Agent, action: str) -> None:
 
             self.auto_resolve_steal(agent, amount)
 
+    # =============================================================================
+    # Snapshots
+    # =============================================================================
+
+    def snapshot(self) -> GameSnapshot:
+        """
+        Capture the dynamic state of the game.
+
+        Returns:
+            GameSnapshot: Immutable copy of the current state.
+        """
+
+        return GameSnapshot(
+            board_position=self.board_position,
+            current_agent_index=self.current_agent_index,
+            turn_count=self.turn_count,
+            states=tuple(int(state) for state in self.table.states),
+            action_queue=tuple(self.action_queue),
+            deck_counts=tuple(int(count) for count in self.deck_counts),
+            rng_state=self.rng.getstate(),
+            decision_rng_state=self.decision_rng.getstate(),
+        )
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """
+        Restore a previously captured state of the same game.
+
+        Args:
+            snapshot (GameSnapshot): State to restore.
+        """
+
+        self.board_position = snapshot.board_position
+        self.current_agent_index = snapshot.current_agent_index
+        self.turn_count = snapshot.turn_count
+        self.table.states[:] = snapshot.states
+        self.action_queue = list(snapshot.action_queue)
+        self.deck_counts[:] = snapshot.deck_counts
+        self.rng.setstate(snapshot.rng_state)
+        self.decision_rng.setstate(snapshot.decision_rng_state)
+
+        self.logger.debug(
+            "Game state restored",
+            turn=snapshot.turn_count,
+            position=snapshot.board_position,
+        )
+
+    def scenario(self) -> Scenario:
+        """
+        Describe the current position of the game, to start other engines from it.
+
+        Returns:
+            Scenario: Board, conditions and dynamic state, without RNG states.
+        """
+
+        return Scenario(
+            board=tuple(self.board),
+            conditions=tuple(int(condition) for condition in self.table.conditions),
+            states=tuple(int(state) for state in self.table.states),
+            action_queue=tuple(self.action_queue),
+            board_position=self.board_position,
+            current_agent_index=self.current_agent_index,
+            turn_count=self.turn_count,
+        )
+
+    @classmethod
+    def from_scenarios(
+        cls,
+        scenarios: Iterable[Scenario],
+        seeds: Iterable[int | None],
+        policies: list[Policy] | None = None,
+        rules: Rules = DEFAULT_RULES,
+    ) -> list[Self]:
+        """
+        Create one engine per scenario, without setup logging.
+
+        Boards are checked and encoded once per distinct board, and the engines share the
+        policies, so the cost per engine is little more than copying the scenario.
+
+        Args:
+            scenarios (Iterable[Scenario]): Position of each engine. A scenario may repeat.
+            seeds (Iterable[int | None]): Seed of each engine, for its dice, cards and decisions.
+            policies (list[Policy] | None): Decision policy for each agent, shared by every engine.
+            rules (Rules): Board and deck composition of every scenario.
+
+        Returns:
+            list[GameEngine]: Engines of the class this is called on, in scenario order.
+        """
+
+        if policies is None:
+            policies = [RandomPolicy()] * NUMBER_OF_PLAYERS
+
+        return [
+            cls(seed=seed, policies=policies, rules=rules, scenario=scenario)
+            for scenario, seed in zip(scenarios, seeds, strict=True)
+        ]
+
     # =============================================================================
     # Game step
     # =============================================================================
 
-    def step(self) -> int | None:
+    def step(self, movement: int | None = None) -> int | None:
         """
         Execute one turn.
 
+        Args:
+            movement (int | None):
+                Dice total to move by.
+                If None, the movement dice are rolled.
+
         Returns:
             int | None:
                 Winning agent ID, or None if no winner yet.
@@ -418,34 +637,42 @@ def step(self) -> int | None:
 
         agent = self.agents[self.current_agent_index]
 
-        logger.info(
-            "Turn started",
-            turn=self.turn_count,
-            agent_id=agent.id,
-        )
+        if self.events.active:
+            self.events.publish(TurnStarted(turn=self.turn_count, agent_id=agent.id))
 
-        movement = self.roll_movement_dice()
+        if movement is None:
+            movement = self.roll_movement_dice()
 
         tile = self.advance_board(movement)
 
-        logger.info(
-            "Agent landed on tile",
-            agent_id=agent.id,
-            movement=movement,
-            position=self.board_position,
-            tile=tile,
-        )
+        if self.events.active:
+            self.events.publish(
+                TileLanded(
+                    turn=self.turn_count,
+                    agent_id=agent.id,
+                    movement=movement,
+                    position=self.board_position,
+                    tile=tile,
+                )
+            )
 
         self.resolve_tile(agent, tile)
 
-        # Check win condition
+        if self.events.active:
+            self.events.publish(
+                TileResolved(
+                    turn=self.turn_count,
+                    agent_id=agent.id,
+                    tile=tile,
+                    state=agent.state,
+                )
+            )
+
+        # Check win condition: only the current agent can gain ingredients during a turn
         if agent.has_won:
 
-            logger.info(
-                "Agent won",
-                agent_id=agent.id,
-                turn=self.turn_count,
-            )
+            if self.events.active:
+                self.events.publish(GameWon(agent_id=agent.id, turn=self.turn_count))
 
             return agent.id
 
@@ -455,3 +682,26 @@ def step(self) -> int | None:
         self.turn_count += 1
 
         return None
+
+    def advance(self, max_turns: int | None = None) -> int | None:
+        """
+        Play turns up to and including the next one that can change the game.
+
+        Every turn is played here, so this is one `step`. Engines able to tell no-op turns apart
+        override it to skip them without events; drivers that only need outcomes and states, like
+        the differential harness of project.simulation.golden, play through it.
+
+        Args:
+            max_turns (int | None):
+                Turn limit.
+                If the turn count already reached it, no turn is played.
+
+        Returns:
+            int | None:
+                Winning agent ID, or None if no winner yet.
+        """
+
+        if max_turns is not None and self.turn_count >= max_turns:
+            return None
+
+        return self.step()
@@ -0,0 +1,323 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import structlog
+
+from project.game.constants import NUMBER_OF_INGREDIENTS
+
+logger = structlog.get_logger(__name__)
+
+
+# =============================================================================
+# Events
+# =============================================================================
+
+
+@dataclass(slots=True)
+class GameEvent:
+    """
+    Base class of every event published by a game engine.
+    """
+
+
+@dataclass(slots=True)
+class TurnStarted(GameEvent):
+    """
+    An agent starts its turn.
+
+    Attributes:
+        turn: int - Turn number.
+        agent_id: int - Agent about to roll.
+    """
+
+    turn: int
+    agent_id: int
+
+
+@dataclass(slots=True)
+class TileLanded(GameEvent):
+    """
+    The shared piece landed on a tile, before the tile is resolved.
+
+    Attributes:
+        turn: int - Turn number.
+        agent_id: int - Agent who rolled.
+        movement: int - Dice total.
+        position: int - New board position.
+        tile: str - Tile name.
+    """
+
+    turn: int
+    agent_id: int
+    movement: int
+    position: int
+    tile: str
+
+
+@dataclass(slots=True)
+class CardDrawn(GameEvent):
+    """
+    An agent drew an action card.
+
+    Attributes:
+        agent_id: int - Drawing agent.
+        action: str - Action string of the card.
+    """
+
+    agent_id: int
+    action: str
+
+
+@dataclass(slots=True)
+class IngredientsGained(GameEvent):
+    """
+    An agent added ingredients to its state.
+
+    Attributes:
+        agent_id: int - Gaining agent.
+        gained: int - Bitmask of the gained ingredients.
+        state: int - Bitmask of the agent's state afterwards.
+        still_needed: int - Number of ingredients the agent still needs.
+    """
+
+    agent_id: int
+    gained: int
+    state: int
+    still_needed: int
+
+
+@dataclass(slots=True)
+class IngredientsLost(GameEvent):
+    """
+    An agent removed ingredients from its state.
+
+    Attributes:
+        agent_id: int - Losing agent.
+        lost: int - Bitmask of the lost ingredients.
+        state: int - Bitmask of the agent's state afterwards.
+        still_needed: int - Number of ingredients the agent still needs.
+    """
+
+    agent_id: int
+    lost: int
+    state: int
+    still_needed: int
+
+
+@dataclass(slots=True)
+class IngredientsStolen(GameEvent):
+    """
+    An agent took ingredients from another agent.
+
+    Attributes:
+        thief_id: int - Stealing agent.
+        target_id: int - Agent stolen from.
+        stolen: int - Bitmask of the stolen ingredients.
+        thief_state: int - Bitmask of the thief's state afterwards.
+        target_state: int - Bitmask of the target's state afterwards.
+    """
+
+    thief_id: int
+    target_id: int
+    stolen: int
+    thief_state: int
+    target_state: int
+
+
+@dataclass(slots=True)
+class TileResolved(GameEvent):
+    """
+    The tile of the current turn has been fully resolved.
+
+    Attributes:
+        turn: int - Turn number.
+        agent_id: int - Agent who rolled.
+        tile: str - Tile name.
+        state: int - Bitmask of the agent's state afterwards.
+    """
+
+    turn: int
+    agent_id: int
+    tile: str
+    state: int
+
+
+@dataclass(slots=True)
+class GameWon(GameEvent):
+    """
+    An agent collected all of its ingredients.
+
+    Attributes:
+        agent_id: int - Winning agent.
+        turn: int - Turn number of the win.
+    """
+
+    agent_id: int
+    turn: int
+
+
+# =============================================================================
+# Bus
+# =============================================================================
+
+EventHandler = Callable[[GameEvent], None]
+
+
+class EventBus:
+    """
+    Synchronous in-process publisher of game events.
+
+    Publishers must check `active` before building an event, so that a bus without
+    subscribers costs a single attribute lookup per publishing site.
+    """
+
+    __slots__ = ("active", "catch_all", "handlers")
+
+    def __init__(self) -> None:
+        """
+        Initializes a bus without subscribers.
+        """
+        self.active = False
+        self.handlers: dict[type[GameEvent], list[EventHandler]] = {}
+        self.catch_all: list[EventHandler] = []
+
+    def subscribe(self, handler: EventHandler, *event_types: type[GameEvent]) -> None:
+        """
+        Registers a handler.
+
+        Args:
+            handler (EventHandler): Callable receiving each event.
+            *event_types (type[GameEvent]): Event types to receive. If none are given, every event is received.
+        """
+        if event_types:
+            for event_type in event_types:
+                self.handlers.setdefault(event_type, []).append(handler)
+        else:
+            self.catch_all.append(handler)
+
+        self.active = True
+
+    def unsubscribe(self, handler: EventHandler) -> None:
+        """
+        Removes every registration of a handler.
+
+        Args:
+            handler (EventHandler): Previously registered handler.
+        """
+        for event_type in list(self.handlers):
+            remaining = [h for h in self.handlers[event_type] if h != handler]
+
+            if remaining:
+                self.handlers[event_type] = remaining
+            else:
+                del self.handlers[event_type]
+
+        self.catch_all = [h for h in self.catch_all if h != handler]
+
+        self.active = bool(self.handlers or self.catch_all)
+
+    def publish(self, event: GameEvent) -> None:
+        """
+        Delivers an event to its subscribers, in registration order.
+
+        Args:
+            event (GameEvent): Event to deliver.
+        """
+        for handler in self.handlers.get(type(event), ()):
+            handler(event)
+
+        for handler in self.catch_all:
+            handler(event)
+
+
+# =============================================================================
+# Logging subscriber
+# =============================================================================
+
+
+def _ingredients(mask: int) -> list[int]:
+    """
+    Lists the ingredients of a bitmask.
+
+    Args:
+        mask (int): Ingredient bitmask.
+
+    Returns:
+        list[int]: Indices of the set bits.
+    """
+    return [i for i in range(NUMBER_OF_INGREDIENTS) if mask & (1 << i)]
+
+
+class LoggingSubscriber:
+    """
+    Writes game events as INFO log lines.
+    """
+
+    def __init__(self, bound_logger: structlog.typing.BindableLogger | None = None):
+        """
+        Initializes the subscriber.
+
+        Args:
+            bound_logger (structlog.typing.BindableLogger | None): Logger to write to. If None, the module logger is used.
+        """
+        self.logger = bound_logger if bound_logger is not None else logger
+
+    def __call__(self, event: GameEvent) -> None:
+        """
+        Logs one event.
+
+        Args:
+            event (GameEvent): Event to log.
+        """
+        match event:
+            case TurnStarted():
+                self.logger.info(
+                    "Turn started", turn=event.turn, agent_id=event.agent_id
+                )
+
+            case TileLanded():
+                self.logger.info(
+                    "Agent landed on tile",
+                    agent_id=event.agent_id,
+                    movement=event.movement,
+                    position=event.position,
+                    tile=event.tile,
+                )
+
+            case CardDrawn():
+                self.logger.info(
+                    "Resolving action from card",
+                    agent_id=event.agent_id,
+                    action=event.action,
+                )
+
+            case IngredientsGained():
+                self.logger.info(
+                    "Agent gained ingredients",
+                    agent_id=event.agent_id,
+                    gained=_ingredients(event.gained),
+                    state=_ingredients(event.state),
+                    still_needed=event.still_needed,
+                )
+
+            case IngredientsLost():
+                self.logger.info(
+                    "Agent lost ingredients",
+                    agent_id=event.agent_id,
+                    lost=_ingredients(event.lost),
+                    state=_ingredients(event.state),
+                    still_needed=event.still_needed,
+                )
+
+            case IngredientsStolen():
+                self.logger.info(
+                    "Agent stole ingredients",
+                    thief_id=event.thief_id,
+                    target_id=event.target_id,
+                    stolen=_ingredients(event.stolen),
+                    thief_state=_ingredients(event.thief_state),
+                    target_state=_ingredients(event.target_state),
+                )
+
+            case GameWon():
+                self.logger.info("Agent won", agent_id=event.agent_id, turn=event.turn)
@@ -0,0 +1,104 @@
+from functools import cached_property
+
+from project.game.board import LOSE_ALL_INGREDIENTS_TILE_CODE
+from project.game.constants import (
+    MOVEMENT_DICE_COUNT,
+    MOVEMENT_DICE_SIDES,
+    NUMBER_OF_INGREDIENTS,
+    NUMBER_OF_PLAYERS,
+)
+from project.game.engine import GameEngine
+
+
+class FastForwardEngine(GameEngine):
+    """
+    Game engine that jumps over turns that cannot change the game.
+
+    A turn is a no-op when the agent lands on an ingredient it does not need, or on the loseall
+    tile while holding nothing. Such turns only move the piece, so `advance` rolls their dice
+    without resolving anything, scans for the first turn landing on a tile that matters to the
+    agent playing it, moves the piece and turn counters straight there and plays that turn normally.
+
+    Skipped turns publish no events. Their dice come from the engine's own dice stream, in the
+    order `step` would roll them, and no-op turns draw nothing else, so a fast-forwarded game
+    plays exactly like GameEngine with the same seed and snapshots stay valid.
+    """
+
+    @cached_property
+    def codes(self) -> list[int]:
+        """
+        Returns the tile codes of the board as a list, read faster than the array in Python loops.
+
+        Returns:
+            list[int]: Tile code of each board position.
+        """
+        return self.board_codes.tolist()
+
+    def advance(self, max_turns: int | None = None) -> int | None:
+        """
+        Skip the upcoming no-op turns and play the first effective one.
+
+        Args:
+            max_turns (int | None): Turn limit. If the next effective turn would be played at or after it, the game stops at the limit instead.
+
+        Returns:
+            int | None: Winning agent ID, or None if no winner yet.
+        """
+        needed = self.table.needed().tolist()
+        states = self.table.states.tolist()
+        randint = self.rng.randint
+
+        codes = self.codes
+        board_size = len(codes)
+
+        position = self.board_position
+        seat = self.current_agent_index
+        turn = self.turn_count
+
+        while max_turns is None or turn < max_turns:
+            movement = 0
+
+            for _ in range(MOVEMENT_DICE_COUNT):
+                movement += randint(1, MOVEMENT_DICE_SIDES)
+
+            landing = (position + movement) % board_size
+            code = codes[landing]
+
+            if code < NUMBER_OF_INGREDIENTS:
+                effective = needed[seat] >> code & 1
+            elif code == LOSE_ALL_INGREDIENTS_TILE_CODE:
+                effective = states[seat] != 0
+            else:
+                # Cards are always drawn and chef tiles are only reached before a win
+                effective = True
+
+            if effective:
+                self.skip_to(position, seat, turn)
+
+                return self.step(movement)
+
+            position = landing
+            seat = (seat + 1) % NUMBER_OF_PLAYERS
+            turn += 1
+
+        self.skip_to(position, seat, turn)
+
+        return None
+
+    def skip_to(self, position: int, seat: int, turn: int) -> None:
+        """
+        Moves the piece and turn counters over skipped turns.
+
+        Args:
+            position (int): Board position after the skipped turns.
+            seat (int): Index of the agent playing next.
+            turn (int): Turn count after the skipped turns.
+        """
+        skipped = turn - self.turn_count
+
+        if skipped:
+            self.board_position = position
+            self.current_agent_index = seat
+            self.turn_count = turn
+
+            self.logger.debug("Turns skipped", skipped=skipped, position=position)
@@ -0,0 +1,138 @@
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from project.game.board import NUMBER_OF_TILE_CODES
+from project.game.constants import NUMBER_OF_INGREDIENTS, NUMBER_OF_PLAYERS
+from project.game.dice import movement_distribution
+
+if TYPE_CHECKING:
+    from project.game.engine import GameEngine
+
+# Number of upcoming turns covered by the tables: a full round, up to the current agent's next turn
+LANDING_HORIZON: int = NUMBER_OF_PLAYERS
+
+# Maximum number of boards whose tables are kept in memory
+LANDING_CACHE_SIZE: int = 4096
+
+LANDING_DTYPE = np.float32
+
+
+@lru_cache(maxsize=LANDING_CACHE_SIZE)
+def _landing_table(codes: bytes) -> np.ndarray:
+    """
+    Computes the landing table of a board, given its tile codes as raw bytes.
+
+    Args:
+        codes (bytes): Raw int8 tile codes of the board.
+
+    Returns:
+        np.ndarray: Read-only landing table, see landing_table.
+    """
+    board_codes = np.frombuffer(codes, dtype=np.int8)
+    board_size = len(board_codes)
+
+    # One-roll transition matrix between board positions
+    transition = np.zeros((board_size, board_size))
+
+    for steps, probability in movement_distribution():
+        for position in range(board_size):
+            transition[position, (position + steps) % board_size] += probability
+
+    tile_one_hot = np.eye(NUMBER_OF_TILE_CODES)[board_codes]
+
+    table = np.empty((board_size, LANDING_HORIZON, NUMBER_OF_TILE_CODES))
+    reach = np.eye(board_size)
+
+    for turn in range(LANDING_HORIZON):
+        reach = reach @ transition
+        table[:, turn] = reach @ tile_one_hot
+
+    table = table.astype(LANDING_DTYPE)
+    table.setflags(write=False)
+
+    return table
+
+
+def landing_table(board_codes: np.ndarray) -> np.ndarray:
+    """
+    Returns the cached landing table of a board.
+
+    Boards with the same tiles share one table. Looking a board up hashes its tiles, so code
+    playing many turns should use GameEngine.landing, computed once per engine.
+
+    Entry [start, k, code] is the probability that the (k + 1)-th roll counted from a piece at
+    `start` lands on a tile of the given code. On the current agent's turn, roll k is taken by
+    seat (current_agent_index + k) % NUMBER_OF_PLAYERS, so k = NUMBER_OF_PLAYERS - 1 is the last
+    opponent before the current agent plays again.
+
+    Args:
+        board_codes (np.ndarray): Tile codes of the board, see project.game.board.encode_board.
+
+    Returns:
+        np.ndarray: Read-only (board_size, LANDING_HORIZON, NUMBER_OF_TILE_CODES) table.
+    """
+    return _landing_table(board_codes.astype(np.int8, copy=False).tobytes())
+
+
+def landing_probabilities(
+    engines: Sequence[GameEngine], out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Looks up the landing probabilities of the upcoming rolls of many engines.
+
+    Each engine holds its board's table, so a lookup is one row copy per engine.
+
+    Args:
+        engines (Sequence[GameEngine]): Engines to look up, each at the start of a turn.
+        out (np.ndarray | None): Buffer of shape (len(engines), LANDING_HORIZON, NUMBER_OF_TILE_CODES) to fill. If None, one is allocated.
+
+    Returns:
+        np.ndarray: Row i holds engines[i].landing[position].
+    """
+    if out is None:
+        out = np.empty(
+            (len(engines), LANDING_HORIZON, NUMBER_OF_TILE_CODES), dtype=LANDING_DTYPE
+        )
+
+    for row, engine in enumerate(engines):
+        out[row] = engine.landing[engine.board_position]
+
+    return out
+
+
+def needed_landing_probabilities(
+    engines: Sequence[GameEngine], out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Computes, for each upcoming roll, the probability that the rolling seat lands on an ingredient it needs.
+
+    Needs are taken from the current states, as if nobody gained or lost anything in between.
+
+    Args:
+        engines (Sequence[GameEngine]): Engines to look up, each at the start of a turn.
+        out (np.ndarray | None): Buffer of shape (len(engines), LANDING_HORIZON) to fill. If None, one is allocated.
+
+    Returns:
+        np.ndarray: Entry [i, k] is the probability for roll k of engines[i], taken by seat (current_agent_index + k) % NUMBER_OF_PLAYERS.
+    """
+    probabilities = landing_probabilities(engines)
+
+    seats = (
+        np.array([engine.current_agent_index for engine in engines])[:, None]
+        + np.arange(LANDING_HORIZON)
+    ) % NUMBER_OF_PLAYERS
+
+    needed = np.stack([engine.table.needed() for engine in engines])
+    rolling_needed = np.take_along_axis(needed, seats, axis=1)
+
+    needed_bits = (rolling_needed[..., None] >> np.arange(NUMBER_OF_INGREDIENTS)) & 1
+
+    return np.einsum(
+        "bki,bki->bk",
+        probabilities[..., :NUMBER_OF_INGREDIENTS],
+        needed_bits.astype(LANDING_DTYPE),
+        out=out,
+    )
@@ -0,0 +1,199 @@
+"""
+Numeric observations of games, written into caller-provided buffers.
+
+Every observation is one float32 row of OBSERVATION_SIZE features, taken from the point of view of
+one seat (by default, the agent whose turn it is). Opponents are listed in turn order starting
+from the seat after the observer. Layout version 2, in order:
+
+    needed           10   Ingredients the observer still needs (one 0/1 flag per ingredient)
+    held             10   Ingredients the observer holds
+    opponent_held    50   Ingredients held by each of the 5 opponents, 10 flags each
+    opponent_needed  50   Ingredients still needed by each of the 5 opponents, 10 flags each
+    position         35   One-hot board position of the shared piece
+    lookahead        78   Next 6 tiles after the piece, one-hot over 13 tile codes each
+                          (10 ingredients, chef, card, loseall; see project.game.board)
+    deck              7   Remaining copies of each action card, ordered like ACTION_NAMES
+    next_card         7   Probability of each action being the next card drawn
+
+Sizes above are for the default constants; OBSERVATION_LAYOUT holds the actual offsets.
+Engines playing rules with another board size cannot be observed.
+Any change to the layout must bump OBSERVATION_VERSION.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from project.game.board import NUMBER_OF_TILE_CODES
+from project.game.constants import (
+    MOVEMENT_DICE_COUNT,
+    MOVEMENT_DICE_SIDES,
+    NUMBER_OF_INGREDIENTS,
+    NUMBER_OF_PLAYERS,
+    TOTAL_BOARD_SIZE,
+)
+from project.game.engine import GameEngine
+from project.game.queue import ACTION_NAMES
+
+OBSERVATION_VERSION: int = 2
+OBSERVATION_DTYPE = np.float32
+
+# Number of tiles ahead of the piece that can be reached with one roll
+LOOKAHEAD_TILES: int = MOVEMENT_DICE_COUNT * MOVEMENT_DICE_SIDES
+
+NUMBER_OF_OPPONENTS: int = NUMBER_OF_PLAYERS - 1
+
+# Feature groups in buffer order, with their sizes
+OBSERVATION_FEATURES: dict[str, int] = {
+    "needed": NUMBER_OF_INGREDIENTS,
+    "held": NUMBER_OF_INGREDIENTS,
+    "opponent_held": NUMBER_OF_OPPONENTS * NUMBER_OF_INGREDIENTS,
+    "opponent_needed": NUMBER_OF_OPPONENTS * NUMBER_OF_INGREDIENTS,
+    "position": TOTAL_BOARD_SIZE,
+    "lookahead": LOOKAHEAD_TILES * NUMBER_OF_TILE_CODES,
+    "deck": len(ACTION_NAMES),
+    "next_card": len(ACTION_NAMES),
+}
+
+
+def _build_layout() -> dict[str, slice]:
+    """
+    Computes the column range of every feature group.
+
+    Returns:
+        dict[str, slice]: Column slice of each feature group.
+    """
+    layout = {}
+    offset = 0
+
+    for name, size in OBSERVATION_FEATURES.items():
+        layout[name] = slice(offset, offset + size)
+        offset += size
+
+    return layout
+
+
+OBSERVATION_LAYOUT: dict[str, slice] = _build_layout()
+OBSERVATION_SIZE: int = sum(OBSERVATION_FEATURES.values())
+
+# Lookup tables turning masks and tile codes into flag rows
+_MASK_BITS = (
+    (np.arange(1 << NUMBER_OF_INGREDIENTS)[:, None] >> np.arange(NUMBER_OF_INGREDIENTS))
+    & 1
+).astype(OBSERVATION_DTYPE)
+_TILE_ONE_HOT = np.eye(NUMBER_OF_TILE_CODES, dtype=OBSERVATION_DTYPE)
+_LOOKAHEAD_OFFSETS = np.arange(1, LOOKAHEAD_TILES + 1)
+
+
+def allocate_observations(count: int) -> np.ndarray:
+    """
+    Allocates a buffer able to hold a batch of observations.
+
+    Args:
+        count (int): Number of observations.
+
+    Returns:
+        np.ndarray: Zeroed (count, OBSERVATION_SIZE) float32 buffer.
+    """
+    return np.zeros((count, OBSERVATION_SIZE), dtype=OBSERVATION_DTYPE)
+
+
+def encode_observations(
+    engines: Sequence[GameEngine],
+    out: np.ndarray,
+    seats: Sequence[int] | None = None,
+) -> np.ndarray:
+    """
+    Writes the observation of every engine into a preallocated buffer.
+
+    Row i of the buffer receives the observation of engines[i]. Rows past the number of
+    engines are left untouched. Every feature is written in place, so the buffer can be
+    handed to an inference runtime without copying.
+
+    Args:
+        engines (Sequence[GameEngine]): Engines to observe.
+        out (np.ndarray): C-contiguous float32 buffer with OBSERVATION_SIZE columns and at least one row per engine.
+        seats (Sequence[int] | None): Observing seat of each engine. If None, the agent whose turn it is.
+
+    Returns:
+        np.ndarray: The filled rows of the buffer.
+    """
+    if out.dtype != OBSERVATION_DTYPE or not out.flags.c_contiguous:
+        raise ValueError("Observation buffer must be a C-contiguous float32 array")
+
+    if out.ndim != 2 or out.shape[1] != OBSERVATION_SIZE:
+        raise ValueError(
+            f"Expected an observation buffer with {OBSERVATION_SIZE} columns, but got shape {out.shape}"
+        )
+
+    if out.shape[0] < len(engines):
+        raise ValueError(
+            f"Observation buffer has {out.shape[0]} rows for {len(engines)} engines"
+        )
+
+    if seats is not None and len(seats) != len(engines):
+        raise ValueError(f"Expected {len(engines)} seats, but got {len(seats)}")
+
+    for engine in engines:
+        if len(engine.board) != TOTAL_BOARD_SIZE:
+            raise ValueError(
+                f"Expected a board of {TOTAL_BOARD_SIZE} tiles, but got {len(engine.board)}"
+            )
+
+    needed = OBSERVATION_LAYOUT["needed"]
+    held = OBSERVATION_LAYOUT["held"]
+    opponent_held = OBSERVATION_LAYOUT["opponent_held"]
+    opponent_needed = OBSERVATION_LAYOUT["opponent_needed"]
+    position = OBSERVATION_LAYOUT["position"]
+    lookahead = OBSERVATION_LAYOUT["lookahead"]
+    deck = OBSERVATION_LAYOUT["deck"]
+    next_card = OBSERVATION_LAYOUT["next_card"]
+
+    for row, engine in enumerate(engines):
+        seat = engine.current_agent_index if seats is None else seats[row]
+        features = out[row]
+
+        table = engine.table
+        states = table.states
+        needed_masks = table.needed()
+
+        # Observer's own ingredients
+        np.take(_MASK_BITS, needed_masks[seat], axis=0, out=features[needed])
+        np.take(_MASK_BITS, states[seat], axis=0, out=features[held])
+
+        # Opponents in turn order after the observer
+        opponents = (seat + 1 + np.arange(NUMBER_OF_OPPONENTS)) % len(table)
+
+        np.take(
+            _MASK_BITS,
+            states[opponents],
+            axis=0,
+            out=features[opponent_held].reshape(NUMBER_OF_OPPONENTS, -1),
+        )
+        np.take(
+            _MASK_BITS,
+            needed_masks[opponents],
+            axis=0,
+            out=features[opponent_needed].reshape(NUMBER_OF_OPPONENTS, -1),
+        )
+
+        # Shared piece position and the tiles reachable with the next roll
+        features[position] = 0.0
+        features[position.start + engine.board_position] = 1.0
+
+        upcoming = engine.board_codes[
+            (engine.board_position + _LOOKAHEAD_OFFSETS) % len(engine.board_codes)
+        ]
+
+        np.take(
+            _TILE_ONE_HOT,
+            upcoming,
+            axis=0,
+            out=features[lookahead].reshape(LOOKAHEAD_TILES, -1),
+        )
+
+        # Deck belief, maintained by the engine on every draw
+        features[deck] = engine.deck_counts
+        engine.next_card_probabilities(out=features[next_card])
+
+    return out[: len(engines)]
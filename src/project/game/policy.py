@@ -0,0 +1,63 @@
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from project.game.agent import Agent
+    from project.game.engine import GameEngine
+
+# Kinds of decisions an agent can be asked to make
+CHOOSE = "choose"
+LOSE = "lose"
+STEAL = "steal"
+
+DECISION_KINDS: tuple[str, ...] = (CHOOSE, LOSE, STEAL)
+
+
+class Policy(Protocol):
+    """
+    Decides which ingredients an agent picks when the engine offers a real choice.
+
+    The engine only asks for a decision when more ingredients are valid than can be picked,
+    so the selection must contain exactly `amount` bits of `mask`.
+    """
+
+    def select(
+        self, engine: GameEngine, agent: Agent, kind: str, mask: int, amount: int
+    ) -> int:
+        """
+        Selects ingredients for a chef tile or a card.
+
+        Args:
+            engine (GameEngine): Engine in the middle of resolving the agent's turn.
+            agent (Agent): Deciding agent.
+            kind (str): Kind of decision, one of CHOOSE, LOSE or STEAL.
+            mask (int): Valid ingredients to select from.
+            amount (int): Number of ingredients to select.
+
+        Returns:
+            int: Bitmask of the selected ingredients.
+        """
+        ...
+
+
+class RandomPolicy:
+    """
+    Selects ingredients uniformly at random. This is the engine's default resolution.
+    """
+
+    def select(
+        self, engine: GameEngine, agent: Agent, kind: str, mask: int, amount: int
+    ) -> int:
+        """
+        Selects random ingredients using the engine's decision RNG.
+
+        Args:
+            engine (GameEngine): Engine in the middle of resolving the agent's turn.
+            agent (Agent): Deciding agent.
+            kind (str): Kind of decision, one of CHOOSE, LOSE or STEAL.
+            mask (int): Valid ingredients to select from.
+            amount (int): Number of ingredients to select.
+
+        Returns:
+            int: Bitmask of the selected ingredients.
+        """
+        return engine.select_random_bits(mask, amount)
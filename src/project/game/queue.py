@@ -1,30 +1,48 @@
 from random import Random
 
+import numpy as np
 import structlog
 
-from project.game.constants import (
-    ACTION_QUEUE_CHOOSE_ONE_AMOUNT,
-    ACTION_QUEUE_CHOOSE_TWO_AMOUNT,
-    ACTION_QUEUE_CHOOSE_PREFIX,
-    ACTION_QUEUE_LOSE_ALL_AMOUNT,
-    ACTION_QUEUE_LOSE_ONE_AMOUNT,
-    ACTION_QUEUE_LOSE_PREFIX,
-    ACTION_QUEUE_LOSE_TWO_AMOUNT,
-    ACTION_QUEUE_STEAL_ONE_AMOUNT,
-    ACTION_QUEUE_STEAL_PREFIX,
-    ACTION_QUEUE_STEAL_TWO_AMOUNT,
-    TOTAL_ACTION_QUEUE_SIZE,
-)
+from project.game.rules import DEFAULT_RULES, Rules
 
 logger = structlog.get_logger(__name__)
 
 
-def generate_action_queue(random_number_generator_seed: int | None) -> list[str]:
+# Action names in deck order, with the number of copies of each in a full deck
+ACTION_QUEUE_COMPOSITION: dict[str, int] = DEFAULT_RULES.action_queue_composition()
+
+# Fixed ordering of the distinct actions, used to index count vectors
+ACTION_NAMES: tuple[str, ...] = tuple(ACTION_QUEUE_COMPOSITION)
+
+# Index of each action in ACTION_NAMES
+ACTION_INDEX: dict[str, int] = {name: index for index, name in enumerate(ACTION_NAMES)}
+
+# Element type of card count vectors
+DECK_DTYPE = np.int16
+
+
+def count_actions(action_queue: list[str] | tuple[str, ...]) -> tuple[int, ...]:
+    """
+    Counts the remaining copies of each action in a queue.
+
+    Args:
+        action_queue (list[str] | tuple[str, ...]): The action queue to count.
+
+    Returns:
+        tuple[int, ...]: Number of copies of each action, indexed like ACTION_NAMES.
     """
-    Generates a shuffled action queue based on constants.
+    return tuple(action_queue.count(name) for name in ACTION_NAMES)
+
+
+def generate_action_queue(
+    random_number_generator_seed: int | None, rules: Rules = DEFAULT_RULES
+) -> list[str]:
+    """
+    Generates a shuffled action queue based on the rules.
 
     Args:
         random_number_generator_seed (int | None): The seed to use for the random number generator. If None, a random seed is used.
+        rules (Rules): Card counts of the deck. Defaults to the constants.
 
     Returns:
         list[str]: A shuffled list of action queue tiles.
@@ -32,46 +50,27 @@ def generate_action_queue(random_number_generator_seed: int | None) -> list[str]
     logger.debug(
         "Generating action queue",
         seed=random_number_generator_seed,
-        total_size=TOTAL_ACTION_QUEUE_SIZE,
+        total_size=rules.action_queue_size,
     )
     rng = Random(random_number_generator_seed)
 
-    lose_1 = f"{ACTION_QUEUE_LOSE_PREFIX}1"
-    lose_2 = f"{ACTION_QUEUE_LOSE_PREFIX}2"
-    lose_all = f"{ACTION_QUEUE_LOSE_PREFIX}all"
-
-    choose_1 = f"{ACTION_QUEUE_CHOOSE_PREFIX}1"
-    choose_2 = f"{ACTION_QUEUE_CHOOSE_PREFIX}2"
-
-    steal_1 = f"{ACTION_QUEUE_STEAL_PREFIX}1"
-    steal_2 = f"{ACTION_QUEUE_STEAL_PREFIX}2"
-
     action_queue = []
 
-    action_queue.extend([lose_1] * ACTION_QUEUE_LOSE_ONE_AMOUNT)
-    action_queue.extend([lose_2] * ACTION_QUEUE_LOSE_TWO_AMOUNT)
-    action_queue.extend([lose_all] * ACTION_QUEUE_LOSE_ALL_AMOUNT)
-
-    action_queue.extend([choose_1] * ACTION_QUEUE_CHOOSE_ONE_AMOUNT)
-    action_queue.extend([choose_2] * ACTION_QUEUE_CHOOSE_TWO_AMOUNT)
-
-    action_queue.extend([steal_1] * ACTION_QUEUE_STEAL_ONE_AMOUNT)
-    action_queue.extend([steal_2] * ACTION_QUEUE_STEAL_TWO_AMOUNT)
+    for name, amount in rules.action_queue_composition().items():
+        action_queue.extend([name] * amount)
 
     assert (
-        len(action_queue) == TOTAL_ACTION_QUEUE_SIZE
-    ), f"Expected action queue size {TOTAL_ACTION_QUEUE_SIZE}, but got {len(action_queue)}"
+        len(action_queue) == rules.action_queue_size
+    ), f"Expected action queue size {rules.action_queue_size}, but got {len(action_queue)}"
 
     rng.shuffle(action_queue)
 
     logger.debug(
         "Action queue generated successfully",
         queue_size=len(action_queue),
-        lose_actions=ACTION_QUEUE_LOSE_ONE_AMOUNT
-        + ACTION_QUEUE_LOSE_TWO_AMOUNT
-        + ACTION_QUEUE_LOSE_ALL_AMOUNT,
-        choose_actions=ACTION_QUEUE_CHOOSE_ONE_AMOUNT + ACTION_QUEUE_CHOOSE_TWO_AMOUNT,
-        steal_actions=ACTION_QUEUE_STEAL_ONE_AMOUNT + ACTION_QUEUE_STEAL_TWO_AMOUNT,
+        lose_actions=rules.lose_one + rules.lose_two + rules.lose_all,
+        choose_actions=rules.choose_one + rules.choose_two,
+        steal_actions=rules.steal_one + rules.steal_two,
     )
 
     return action_queue
@@ -0,0 +1,120 @@
+from typing import NamedTuple
+
+from project.game.constants import (
+    ACTION_QUEUE_CHOOSE_ONE_AMOUNT,
+    ACTION_QUEUE_CHOOSE_PREFIX,
+    ACTION_QUEUE_CHOOSE_TWO_AMOUNT,
+    ACTION_QUEUE_LOSE_ALL_AMOUNT,
+    ACTION_QUEUE_LOSE_ONE_AMOUNT,
+    ACTION_QUEUE_LOSE_PREFIX,
+    ACTION_QUEUE_LOSE_TWO_AMOUNT,
+    ACTION_QUEUE_STEAL_ONE_AMOUNT,
+    ACTION_QUEUE_STEAL_PREFIX,
+    ACTION_QUEUE_STEAL_TWO_AMOUNT,
+    CHOOSE_ANY_INGREDIENT_TILES,
+    LOSE_ALL_INGREDIENTS_TILES,
+    MOVEMENT_DICE_COUNT,
+    MOVEMENT_DICE_SIDES,
+    NUMBER_OF_INGREDIENTS,
+    QUEUED_RANDOM_ACTION_TILES,
+    TILES_PER_INGREDIENT,
+)
+
+
+class Rules(NamedTuple):
+    """
+    Board and deck composition of a game, defaulting to the constants.
+
+    Players, ingredients and dice are fixed by the constants, since they shape every
+    state and observation; only tile and card counts can vary between games.
+
+    Attributes:
+        tiles_per_ingredient: int - Number of tiles of each ingredient.
+        choose_any_ingredient_tiles: int - Number of chef tiles.
+        queued_random_action_tiles: int - Number of card tiles.
+        lose_all_ingredients_tiles: int - Number of loseall tiles.
+        lose_one: int - Number of lose 1 cards.
+        lose_two: int - Number of lose 2 cards.
+        lose_all: int - Number of lose all cards.
+        choose_one: int - Number of choose 1 cards.
+        choose_two: int - Number of choose 2 cards.
+        steal_one: int - Number of steal 1 cards.
+        steal_two: int - Number of steal 2 cards.
+    """
+
+    tiles_per_ingredient: int = TILES_PER_INGREDIENT
+    choose_any_ingredient_tiles: int = CHOOSE_ANY_INGREDIENT_TILES
+    queued_random_action_tiles: int = QUEUED_RANDOM_ACTION_TILES
+    lose_all_ingredients_tiles: int = LOSE_ALL_INGREDIENTS_TILES
+
+    lose_one: int = ACTION_QUEUE_LOSE_ONE_AMOUNT
+    lose_two: int = ACTION_QUEUE_LOSE_TWO_AMOUNT
+    lose_all: int = ACTION_QUEUE_LOSE_ALL_AMOUNT
+    choose_one: int = ACTION_QUEUE_CHOOSE_ONE_AMOUNT
+    choose_two: int = ACTION_QUEUE_CHOOSE_TWO_AMOUNT
+    steal_one: int = ACTION_QUEUE_STEAL_ONE_AMOUNT
+    steal_two: int = ACTION_QUEUE_STEAL_TWO_AMOUNT
+
+    @property
+    def board_size(self) -> int:
+        """
+        Returns the total number of board tiles.
+
+        Returns:
+            int: Board size.
+        """
+        return (
+            NUMBER_OF_INGREDIENTS * self.tiles_per_ingredient
+            + self.choose_any_ingredient_tiles
+            + self.queued_random_action_tiles
+            + self.lose_all_ingredients_tiles
+        )
+
+    @property
+    def action_queue_size(self) -> int:
+        """
+        Returns the total number of cards in a full deck.
+
+        Returns:
+            int: Deck size.
+        """
+        return sum(self.action_queue_composition().values())
+
+    def action_queue_composition(self) -> dict[str, int]:
+        """
+        Returns the number of copies of each action in a full deck.
+
+        Returns:
+            dict[str, int]: Copies of each action name, in deck order.
+        """
+        return {
+            f"{ACTION_QUEUE_LOSE_PREFIX}1": self.lose_one,
+            f"{ACTION_QUEUE_LOSE_PREFIX}2": self.lose_two,
+            f"{ACTION_QUEUE_LOSE_PREFIX}all": self.lose_all,
+            f"{ACTION_QUEUE_CHOOSE_PREFIX}1": self.choose_one,
+            f"{ACTION_QUEUE_CHOOSE_PREFIX}2": self.choose_two,
+            f"{ACTION_QUEUE_STEAL_PREFIX}1": self.steal_one,
+            f"{ACTION_QUEUE_STEAL_PREFIX}2": self.steal_two,
+        }
+
+    def validate(self) -> None:
+        """
+        Checks that the rules describe a playable game.
+
+        Raises:
+            ValueError: If a count is negative, the board is smaller than one roll, or the card tiles have no deck to draw from.
+        """
+        for name, value in self._asdict().items():
+            if value < 0:
+                raise ValueError(f"Rule {name} must not be negative, but got {value}")
+
+        if self.board_size < MOVEMENT_DICE_COUNT * MOVEMENT_DICE_SIDES:
+            raise ValueError(
+                f"Board size {self.board_size} is smaller than the largest roll"
+            )
+
+        if self.queued_random_action_tiles > 0 and self.action_queue_size == 0:
+            raise ValueError("Card tiles require at least one card in the deck")
+
+
+DEFAULT_RULES = Rules()
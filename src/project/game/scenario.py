@@ -0,0 +1,165 @@
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from project.game.board import encode_board
+from project.game.constants import (
+    CHOOSE_ANY_INGREDIENT_TILE_NAME,
+    INGREDIENT_PREFIX,
+    INGREDIENTS_PER_PLAYER,
+    LOSE_ALL_INGREDIENTS_TILE_NAME,
+    NUMBER_OF_INGREDIENTS,
+    NUMBER_OF_PLAYERS,
+    QUEUED_RANDOM_ACTION_TILE_NAME,
+)
+from project.game.queue import ACTION_INDEX
+from project.game.rules import DEFAULT_RULES, Rules
+
+# Maximum number of distinct boards whose validation and tile codes are kept in memory
+SCENARIO_BOARD_CACHE_SIZE: int = 4096
+
+
+@lru_cache(maxsize=SCENARIO_BOARD_CACHE_SIZE)
+def _board_codes(board: tuple[str, ...], rules: Rules) -> np.ndarray:
+    """
+    Checks a board against the rules and encodes it, once per distinct board.
+
+    Args:
+        board (tuple[str, ...]): Board tiles.
+        rules (Rules): Tile counts the board must have.
+
+    Returns:
+        np.ndarray: Read-only tile codes, see project.game.board.encode_board.
+    """
+    expected = Counter(
+        {
+            f"{INGREDIENT_PREFIX}{i}": rules.tiles_per_ingredient
+            for i in range(NUMBER_OF_INGREDIENTS)
+        }
+    )
+    expected[CHOOSE_ANY_INGREDIENT_TILE_NAME] = rules.choose_any_ingredient_tiles
+    expected[QUEUED_RANDOM_ACTION_TILE_NAME] = rules.queued_random_action_tiles
+    expected[LOSE_ALL_INGREDIENTS_TILE_NAME] = rules.lose_all_ingredients_tiles
+
+    if Counter(board) != +expected:
+        raise ValueError("Board tiles do not match the tile counts of the rules")
+
+    codes = encode_board(list(board))
+    codes.setflags(write=False)
+
+    return codes
+
+
+class Scenario(NamedTuple):
+    """
+    Complete description of a game position, to start engines from anywhere in a game.
+
+    Unlike a GameSnapshot, a scenario also holds the board and the agents' conditions and no RNG
+    state: engines built from it draw their dice, cards and decisions from their own seed.
+
+    Attributes:
+        board: tuple[str, ...] - Board tiles, in board order.
+        conditions: tuple[int, ...] - Bitmask of the ingredients each agent needs to win.
+        states: tuple[int, ...] - Bitmask of the ingredients each agent holds.
+        action_queue: tuple[str, ...] - Remaining action cards, next card first. If empty, a full deck is shuffled on the next draw.
+        board_position: int - Shared board pointer.
+        current_agent_index: int - Index of the agent whose turn it is.
+        turn_count: int - Number of completed turns.
+    """
+
+    board: tuple[str, ...]
+    conditions: tuple[int, ...]
+    states: tuple[int, ...]
+    action_queue: tuple[str, ...]
+    board_position: int = 0
+    current_agent_index: int = 0
+    turn_count: int = 0
+
+    def board_codes(self, rules: Rules = DEFAULT_RULES) -> np.ndarray:
+        """
+        Returns the tile codes of the board, checking it against the rules.
+
+        Boards are checked and encoded once, then served from a cache, so engines built from
+        the same board share one read-only array.
+
+        Args:
+            rules (Rules): Tile counts the board must have.
+
+        Returns:
+            np.ndarray: Read-only tile codes, one per board position.
+
+        Raises:
+            ValueError: If the board does not have the tiles of the rules.
+        """
+        return _board_codes(self.board, rules)
+
+    def validate(self, rules: Rules = DEFAULT_RULES) -> None:
+        """
+        Checks that the scenario is a position the engine can play from.
+
+        Args:
+            rules (Rules): Board and deck composition of the game.
+
+        Raises:
+            ValueError: If the board, an agent's condition or state, the deck or a counter is invalid, an agent holds an ingredient it does not need, or an agent has already won.
+        """
+        self.board_codes(rules)
+
+        if len(self.conditions) != NUMBER_OF_PLAYERS:
+            raise ValueError(
+                f"Expected {NUMBER_OF_PLAYERS} conditions, but got {len(self.conditions)}"
+            )
+
+        if len(self.states) != NUMBER_OF_PLAYERS:
+            raise ValueError(
+                f"Expected {NUMBER_OF_PLAYERS} states, but got {len(self.states)}"
+            )
+
+        ingredients = 1 << NUMBER_OF_INGREDIENTS
+
+        for index, (condition, state) in enumerate(zip(self.conditions, self.states)):
+            if not 0 <= condition < ingredients:
+                raise ValueError(
+                    f"Condition {condition} of agent {index} is not a mask"
+                )
+
+            if condition.bit_count() != INGREDIENTS_PER_PLAYER:
+                raise ValueError(
+                    f"Condition of agent {index} needs {condition.bit_count()} ingredients,"
+                    f" but every agent needs {INGREDIENTS_PER_PLAYER}"
+                )
+
+            if not 0 <= state < ingredients:
+                raise ValueError(f"State {state} of agent {index} is not a mask")
+
+            if state & ~condition:
+                raise ValueError(
+                    f"State {state} of agent {index} holds ingredients outside its condition {condition}"
+                )
+
+            if state == condition:
+                raise ValueError(f"Agent {index} has already won")
+
+        composition = rules.action_queue_composition()
+
+        for action, copies in Counter(self.action_queue).items():
+            if action not in ACTION_INDEX:
+                raise ValueError(f"Unknown action: {action}")
+
+            if copies > composition[action]:
+                raise ValueError(
+                    f"Deck holds {copies} copies of {action}, but the rules have {composition[action]}"
+                )
+
+        if not 0 <= self.board_position < len(self.board):
+            raise ValueError(f"Board position {self.board_position} is off the board")
+
+        if not 0 <= self.current_agent_index < NUMBER_OF_PLAYERS:
+            raise ValueError(f"Agent index {self.current_agent_index} does not exist")
+
+        if self.turn_count < 0:
+            raise ValueError(
+                f"Turn count must not be negative, but got {self.turn_count}"
+            )
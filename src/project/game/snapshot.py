@@ -0,0 +1,30 @@
+from typing import Any, NamedTuple
+
+
+class GameSnapshot(NamedTuple):
+    """
+    Immutable copy of the dynamic state of a game engine.
+
+    The board and the agents' conditions never change during a game, so they are not part of
+    the snapshot. Restoring a snapshot into an engine of the same game puts it back in the exact
+    state it had when the snapshot was taken, including its random number generators.
+
+    Attributes:
+        board_position: int - Shared board pointer.
+        current_agent_index: int - Index of the agent whose turn it is.
+        turn_count: int - Number of completed turns.
+        states: tuple[int, ...] - Bitmask of the ingredients held by each agent.
+        action_queue: tuple[str, ...] - Remaining action cards, next card first.
+        deck_counts: tuple[int, ...] - Remaining copies of each action, indexed like ACTION_NAMES.
+        rng_state: tuple[Any, ...] - Internal state of the engine's dice and deck RNG.
+        decision_rng_state: tuple[Any, ...] - Internal state of the engine's decision RNG.
+    """
+
+    board_position: int
+    current_agent_index: int
+    turn_count: int
+    states: tuple[int, ...]
+    action_queue: tuple[str, ...]
+    deck_counts: tuple[int, ...]
+    rng_state: tuple[Any, ...]
+    decision_rng_state: tuple[Any, ...]
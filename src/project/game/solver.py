@@ -0,0 +1,593 @@
+from itertools import combinations
+
+import structlog
+
+from project.game.agent import Agent
+from project.game.constants import (
+    ACTION_QUEUE_CHOOSE_PREFIX,
+    ACTION_QUEUE_LOSE_PREFIX,
+    ACTION_QUEUE_STEAL_PREFIX,
+    CHOOSE_ANY_INGREDIENT_TILE_NAME,
+    INGREDIENT_PREFIX,
+    LOSE_ALL_INGREDIENTS_TILE_NAME,
+    NUMBER_OF_INGREDIENTS,
+    NUMBER_OF_PLAYERS,
+    QUEUED_RANDOM_ACTION_TILE_NAME,
+)
+from project.game.dice import movement_distribution
+from project.game.engine import GameEngine
+from project.game.policy import (
+    CHOOSE,
+    DECISION_KINDS,
+    LOSE,
+    STEAL,
+    Policy,
+    RandomPolicy,
+)
+from project.game.queue import ACTION_NAMES
+from project.game.snapshot import GameSnapshot
+
+logger = structlog.get_logger(__name__)
+
+# Effects a tile or card can have on the current agent, besides the decision kinds
+NOTHING = "nothing"
+GAIN = "gain"
+LOSE_ALL = "loseall"
+DRAW = "draw"
+
+# Amount of ingredients picked on a chef tile
+CHEF_AMOUNT: int = 2
+
+
+def parse_tile(tile: str) -> tuple[str, int]:
+    """
+    Converts a tile name into an effect.
+
+    Args:
+        tile (str): Tile name.
+
+    Returns:
+        tuple[str, int]: Effect kind and its argument (ingredient mask for gains, amount for choices).
+    """
+    if tile.startswith(INGREDIENT_PREFIX):
+        return GAIN, 1 << int(tile[len(INGREDIENT_PREFIX) :])
+
+    if tile == CHOOSE_ANY_INGREDIENT_TILE_NAME:
+        return CHOOSE, CHEF_AMOUNT
+
+    if tile == QUEUED_RANDOM_ACTION_TILE_NAME:
+        return DRAW, 0
+
+    if tile == LOSE_ALL_INGREDIENTS_TILE_NAME:
+        return LOSE_ALL, 0
+
+    return NOTHING, 0
+
+
+def parse_action(action: str) -> tuple[str, int]:
+    """
+    Converts an action card name into an effect.
+
+    Args:
+        action (str): Action string.
+
+    Returns:
+        tuple[str, int]: Effect kind and the amount of ingredients involved.
+    """
+    if action == f"{ACTION_QUEUE_LOSE_PREFIX}all":
+        return LOSE_ALL, 0
+
+    for prefix, kind in (
+        (ACTION_QUEUE_CHOOSE_PREFIX, CHOOSE),
+        (ACTION_QUEUE_LOSE_PREFIX, LOSE),
+        (ACTION_QUEUE_STEAL_PREFIX, STEAL),
+    ):
+        if action.startswith(prefix):
+            return kind, int(action[len(prefix) :])
+
+    return NOTHING, 0
+
+
+class EndgameSolver:
+    """
+    Exact expectimax solver for the win probability of every seat.
+
+    Chance nodes enumerate every movement dice total and every card that can be drawn given the
+    remaining deck composition (the order of the remaining cards is treated as unknown).
+    Decision nodes enumerate every legal chef/choose/lose/steal selection, and the deciding agent
+    picks the one that maximizes its own win probability.
+
+    The search looks at most `horizon` turns ahead, so the computed values are the probabilities
+    of each seat winning within the horizon. Results are memoized by a compact key of board position,
+    current agent, agent states, remaining deck counts and turns left.
+
+    A solver is bound to the board, deck composition and conditions of the game it was created from.
+    """
+
+    def __init__(self, engine: GameEngine, horizon: int) -> None:
+        """
+        Initializes the solver for the game played by an engine.
+
+        Args:
+            engine (GameEngine): Engine whose board and conditions are used.
+            horizon (int): Maximum number of turns to look ahead.
+        """
+        if horizon < 1:
+            raise ValueError(f"Horizon must be at least 1, but got {horizon}")
+
+        self.horizon = horizon
+        self.conditions = tuple(int(condition) for condition in engine.table.conditions)
+        self.tiles = tuple(parse_tile(tile) for tile in engine.board)
+        self.cards = tuple(parse_action(action) for action in ACTION_NAMES)
+        self.full_deck = tuple(engine.rules.action_queue_composition().values())
+        self.movement = movement_distribution()
+
+        self.num_agents = len(self.conditions)
+        self.zero = (0.0,) * self.num_agents
+        self.units = tuple(
+            tuple(1.0 if i == j else 0.0 for j in range(self.num_agents))
+            for i in range(self.num_agents)
+        )
+
+        self.memo: dict[
+            tuple[int, int, tuple[int, ...], tuple[int, ...], int], tuple[float, ...]
+        ] = {}
+
+    # =============================================================================
+    # Public API
+    # =============================================================================
+
+    def solve(self, snapshot: GameSnapshot) -> tuple[float, ...]:
+        """
+        Computes the win probability of every seat from the start of the current agent's turn.
+
+        Args:
+            snapshot (GameSnapshot): State of the game before the current agent rolls.
+
+        Returns:
+            tuple[float, ...]: Probability of each seat winning within the horizon.
+        """
+        value = self.turn_value(
+            snapshot.board_position,
+            snapshot.current_agent_index,
+            tuple(snapshot.states),
+            snapshot.deck_counts,
+            self.horizon,
+        )
+
+        logger.debug(
+            "Endgame solved",
+            turn=snapshot.turn_count,
+            horizon=self.horizon,
+            win_probabilities=value,
+            memo_size=len(self.memo),
+        )
+
+        return value
+
+    def best_selection(self, snapshot: GameSnapshot, kind: str, amount: int) -> int:
+        """
+        Computes the optimal ingredient selection for the current agent in the middle of a turn.
+
+        The snapshot must be taken after the board has advanced and, for cards, after the card has
+        been drawn, so that the remaining deck matches the one the rest of the game will use.
+        For chef tiles, use the CHOOSE kind with CHEF_AMOUNT.
+
+        Args:
+            snapshot (GameSnapshot): State of the game at the moment of the decision.
+            kind (str): Kind of decision, one of CHOOSE, LOSE or STEAL.
+            amount (int): Number of ingredients to select.
+
+        Returns:
+            int: Bitmask of the selected ingredients.
+        """
+        if kind not in DECISION_KINDS:
+            raise ValueError(f"Unsupported decision kind: {kind}")
+
+        _, selected = self.select(
+            kind,
+            amount,
+            snapshot.board_position,
+            snapshot.current_agent_index,
+            tuple(snapshot.states),
+            snapshot.deck_counts,
+            self.horizon,
+        )
+
+        return selected
+
+    def clear(self) -> None:
+        """
+        Drops every memoized value.
+        """
+        self.memo.clear()
+
+    # =============================================================================
+    # Chance nodes
+    # =============================================================================
+
+    def turn_value(
+        self,
+        position: int,
+        agent: int,
+        states: tuple[int, ...],
+        counts: tuple[int, ...],
+        turns_left: int,
+    ) -> tuple[float, ...]:
+        """
+        Computes the value of a state at the start of an agent's turn.
+
+        Args:
+            position (int): Board position before the roll.
+            agent (int): Index of the agent about to roll.
+            states (tuple[int, ...]): State of every agent.
+            counts (tuple[int, ...]): Remaining copies of each action in the deck.
+            turns_left (int): Number of turns still inside the horizon.
+
+        Returns:
+            tuple[float, ...]: Win probability of every seat.
+        """
+        if turns_left == 0:
+            return self.zero
+
+        key = (position, agent, states, counts, turns_left)
+        cached = self.memo.get(key)
+
+        if cached is not None:
+            return cached
+
+        value = [0.0] * self.num_agents
+        board_size = len(self.tiles)
+
+        for steps, probability in self.movement:
+            landed = (position + steps) % board_size
+            kind, argument = self.tiles[landed]
+
+            outcome = self.resolve(
+                kind, argument, landed, agent, states, counts, turns_left
+            )
+
+            for i in range(self.num_agents):
+                value[i] += probability * outcome[i]
+
+        result = tuple(value)
+        self.memo[key] = result
+
+        return result
+
+    def draw_value(
+        self,
+        position: int,
+        agent: int,
+        states: tuple[int, ...],
+        counts: tuple[int, ...],
+        turns_left: int,
+    ) -> tuple[float, ...]:
+        """
+        Computes the value of drawing a card, averaged over the remaining deck.
+
+        Args:
+            position (int): Board position of the card tile.
+            agent (int): Index of the drawing agent.
+            states (tuple[int, ...]): State of every agent.
+            counts (tuple[int, ...]): Remaining copies of each action in the deck.
+            turns_left (int): Number of turns still inside the horizon.
+
+        Returns:
+            tuple[float, ...]: Win probability of every seat.
+        """
+        # An empty deck is replenished before drawing
+        if not any(counts):
+            counts = self.full_deck
+
+        total = sum(counts)
+        value = [0.0] * self.num_agents
+
+        for index, count in enumerate(counts):
+            if count == 0:
+                continue
+
+            remaining = counts[:index] + (count - 1,) + counts[index + 1 :]
+            kind, amount = self.cards[index]
+
+            outcome = self.resolve(
+                kind, amount, position, agent, states, remaining, turns_left
+            )
+
+            for i in range(self.num_agents):
+                value[i] += count / total * outcome[i]
+
+        return tuple(value)
+
+    # =============================================================================
+    # Effect resolution
+    # =============================================================================
+
+    def resolve(
+        self,
+        kind: str,
+        argument: int,
+        position: int,
+        agent: int,
+        states: tuple[int, ...],
+        counts: tuple[int, ...],
+        turns_left: int,
+    ) -> tuple[float, ...]:
+        """
+        Computes the value of applying an effect to the current agent.
+
+        Args:
+            kind (str): Effect kind.
+            argument (int): Ingredient mask for gains, amount for choices.
+            position (int): Board position where the agent landed.
+            agent (int): Index of the affected agent.
+            states (tuple[int, ...]): State of every agent.
+            counts (tuple[int, ...]): Remaining copies of each action in the deck.
+            turns_left (int): Number of turns still inside the horizon.
+
+        Returns:
+            tuple[float, ...]: Win probability of every seat.
+        """
+        if kind == DRAW:
+            return self.draw_value(position, agent, states, counts, turns_left)
+
+        if kind in DECISION_KINDS:
+            value, _ = self.select(
+                kind, argument, position, agent, states, counts, turns_left
+            )
+            return value
+
+        if kind == GAIN:
+            needed = self.conditions[agent] ^ states[agent]
+
+            if argument & needed:
+                states = self.replace(states, agent, states[agent] | argument)
+
+        elif kind == LOSE_ALL:
+            states = self.replace(states, agent, 0)
+
+        return self.after_turn(position, agent, states, counts, turns_left)
+
+    def select(
+        self,
+        kind: str,
+        amount: int,
+        position: int,
+        agent: int,
+        states: tuple[int, ...],
+        counts: tuple[int, ...],
+        turns_left: int,
+    ) -> tuple[tuple[float, ...], int]:
+        """
+        Finds the selection that maximizes the deciding agent's win probability.
+
+        Legal masks follow GameEngine.compute_choose_mask, compute_lose_mask and compute_steal_mask.
+
+        Args:
+            kind (str): Kind of decision, one of CHOOSE, LOSE or STEAL.
+            amount (int): Number of ingredients to select.
+            position (int): Board position where the agent landed.
+            agent (int): Index of the deciding agent.
+            states (tuple[int, ...]): State of every agent.
+            counts (tuple[int, ...]): Remaining copies of each action in the deck.
+            turns_left (int): Number of turns still inside the horizon.
+
+        Returns:
+            tuple[tuple[float, ...], int]: Value of the best selection and its bitmask.
+        """
+        mask = self.legal_mask(kind, agent, states, self.conditions[agent])
+
+        best_value = None
+        best_selected = 0
+
+        for selected in self.candidates(mask, amount):
+            outcome = self.after_turn(
+                position,
+                agent,
+                self.apply(kind, agent, states, selected),
+                counts,
+                turns_left,
+            )
+
+            if best_value is None or outcome[agent] > best_value[agent]:
+                best_value = outcome
+                best_selected = selected
+
+        return best_value, best_selected
+
+    def after_turn(
+        self,
+        position: int,
+        agent: int,
+        states: tuple[int, ...],
+        counts: tuple[int, ...],
+        turns_left: int,
+    ) -> tuple[float, ...]:
+        """
+        Computes the value of a state once the current agent's tile is resolved.
+
+        Args:
+            position (int): Board position at the end of the turn.
+            agent (int): Index of the agent whose turn ends.
+            states (tuple[int, ...]): State of every agent.
+            counts (tuple[int, ...]): Remaining copies of each action in the deck.
+            turns_left (int): Number of turns still inside the horizon, including this one.
+
+        Returns:
+            tuple[float, ...]: Win probability of every seat.
+        """
+        if states[agent] == self.conditions[agent]:
+            return self.units[agent]
+
+        return self.turn_value(
+            position, (agent + 1) % self.num_agents, states, counts, turns_left - 1
+        )
+
+    # =============================================================================
+    # State helpers
+    # =============================================================================
+
+    @staticmethod
+    def legal_mask(
+        kind: str, agent: int, states: tuple[int, ...], condition: int
+    ) -> int:
+        """
+        Computes the ingredients a decision can select from.
+
+        Follows GameEngine.compute_choose_mask, compute_lose_mask and compute_steal_mask.
+
+        Args:
+            kind (str): Kind of decision, one of CHOOSE, LOSE or STEAL.
+            agent (int): Index of the deciding agent.
+            states (tuple[int, ...]): State of every agent.
+            condition (int): Winning condition of the deciding agent.
+
+        Returns:
+            int: Valid bitmask.
+        """
+        needed = condition ^ states[agent]
+
+        if kind == CHOOSE:
+            return needed
+
+        if kind == LOSE:
+            return states[agent] & needed
+
+        other_owned = 0
+
+        for other, state in enumerate(states):
+            if other != agent:
+                other_owned |= state
+
+        return other_owned & needed
+
+    @staticmethod
+    def candidates(mask: int, amount: int) -> list[int]:
+        """
+        Lists every selection the engine allows for a mask and amount.
+
+        Args:
+            mask (int): Valid bitmask.
+            amount (int): Number of ingredients to select.
+
+        Returns:
+            list[int]: Possible selected masks.
+        """
+        if mask.bit_count() <= amount:
+            return [mask]
+
+        available = [
+            1 << bit for bit in range(NUMBER_OF_INGREDIENTS) if mask & (1 << bit)
+        ]
+
+        return [sum(bits) for bits in combinations(available, amount)]
+
+    @staticmethod
+    def replace(states: tuple[int, ...], index: int, state: int) -> tuple[int, ...]:
+        """
+        Returns a copy of the states with one agent's state replaced.
+
+        Args:
+            states (tuple[int, ...]): State of every agent.
+            index (int): Index of the agent to update.
+            state (int): New state of the agent.
+
+        Returns:
+            tuple[int, ...]: Updated states.
+        """
+        return states[:index] + (state,) + states[index + 1 :]
+
+    @staticmethod
+    def apply(
+        kind: str, agent: int, states: tuple[int, ...], selected: int
+    ) -> tuple[int, ...]:
+        """
+        Applies a resolved selection to the agents' states.
+
+        Args:
+            kind (str): Kind of decision, one of CHOOSE, LOSE or STEAL.
+            agent (int): Index of the deciding agent.
+            states (tuple[int, ...]): State of every agent.
+            selected (int): Bitmask of the selected ingredients.
+
+        Returns:
+            tuple[int, ...]: Updated states.
+        """
+        if selected == 0:
+            return states
+
+        if kind == CHOOSE:
+            return EndgameSolver.replace(states, agent, states[agent] | selected)
+
+        if kind == LOSE:
+            return EndgameSolver.replace(states, agent, states[agent] & ~selected)
+
+        # Steal every selected ingredient from every other agent holding it
+        stolen = 0
+        updated = []
+
+        for other, state in enumerate(states):
+            if other != agent:
+                stolen |= state & selected
+                state &= ~selected
+            updated.append(state)
+
+        updated[agent] |= stolen
+
+        return tuple(updated)
+
+
+class EndgamePolicy:
+    """
+    Policy that plays optimally close to the end of the game.
+
+    Decisions of an agent that needs at most `threshold` ingredients are delegated to an
+    EndgameSolver bound to the current game; every other decision goes to a fallback policy.
+    """
+
+    def __init__(
+        self,
+        horizon: int = NUMBER_OF_PLAYERS,
+        threshold: int = 2,
+        fallback: Policy | None = None,
+    ) -> None:
+        """
+        Initializes the policy.
+
+        Args:
+            horizon (int): Maximum number of turns the solver looks ahead.
+            threshold (int): Maximum number of needed ingredients for the solver to take over.
+            fallback (Policy | None): Policy used outside the endgame. If None, decisions are random.
+        """
+        self.horizon = horizon
+        self.threshold = threshold
+        self.fallback = fallback if fallback is not None else RandomPolicy()
+
+        self.engine: GameEngine | None = None
+        self.solver: EndgameSolver | None = None
+
+    def select(
+        self, engine: GameEngine, agent: Agent, kind: str, mask: int, amount: int
+    ) -> int:
+        """
+        Selects ingredients, optimally if the agent is close to winning.
+
+        Args:
+            engine (GameEngine): Engine in the middle of resolving the agent's turn.
+            agent (Agent): Deciding agent.
+            kind (str): Kind of decision, one of CHOOSE, LOSE or STEAL.
+            mask (int): Valid ingredients to select from.
+            amount (int): Number of ingredients to select.
+
+        Returns:
+            int: Bitmask of the selected ingredients.
+        """
+        if agent.needed_count > self.threshold:
+            return self.fallback.select(engine, agent, kind, mask, amount)
+
+        # The solver's memo is only valid for the board and conditions of one game
+        if self.solver is None or self.engine is not engine:
+            self.engine = engine
+            self.solver = EndgameSolver(engine, self.horizon)
+
+        return self.solver.best_selection(engine.snapshot(), kind, amount)
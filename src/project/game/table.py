@@ -0,0 +1,130 @@
+import numpy as np
+import structlog
+
+from project.game.events import EventBus
+
+# Row layout of the table data array
+CONDITION_ROW: int = 0
+STATE_ROW: int = 1
+
+# Ingredient bitmasks fit in 16 bits (NUMBER_OF_INGREDIENTS <= 16)
+MASK_DTYPE = np.uint16
+
+
+class AgentTable:
+    """
+    Struct-of-arrays storage for the conditions and states of every player in a game.
+
+    All agents share one contiguous (2, num_agents) integer array: the first row holds the
+    winning conditions and the second row holds the current states, both as ingredient bitmasks.
+    Queries over all agents (needed ingredients, win checks, counts) are single array operations.
+    Individual agents are exposed through `Agent` views, see `Agent.view`, which publish
+    their ingredient changes to the table's event bus.
+    """
+
+    __slots__ = ("conditions", "data", "events", "logger", "states")
+
+    def __init__(
+        self,
+        conditions: list[int],
+        states: list[int] | None = None,
+        events: EventBus | None = None,
+        bound_logger: structlog.typing.BindableLogger | None = None,
+    ) -> None:
+        """
+        Initializes the table from per-agent conditions and states.
+
+        Args:
+            conditions (list[int]): Bitmask of the ingredients needed to win, one per agent.
+            states (list[int] | None): Bitmask of the ingredients currently held, one per agent. If None, every agent starts empty.
+            events (EventBus | None): Bus receiving the agents' events. If None, a bus without subscribers is used.
+            bound_logger (structlog.typing.BindableLogger | None): Logger used by the agents' views. If None, they use their module logger.
+        """
+        if states is not None and len(states) != len(conditions):
+            raise ValueError(
+                f"Expected {len(conditions)} states, but got {len(states)}"
+            )
+
+        self.data = np.zeros((2, len(conditions)), dtype=MASK_DTYPE)
+        self.data[CONDITION_ROW] = conditions
+
+        if states is not None:
+            self.data[STATE_ROW] = states
+
+        # Row views into the shared array (no copies)
+        self.conditions = self.data[CONDITION_ROW]
+        self.states = self.data[STATE_ROW]
+
+        self.events = events if events is not None else EventBus()
+        self.logger = bound_logger
+
+    def __len__(self) -> int:
+        """
+        Returns the number of agents stored in the table.
+
+        Returns:
+            int: Number of agents.
+        """
+        return self.data.shape[1]
+
+    def needed(self) -> np.ndarray:
+        """
+        Returns the bitmask of ingredients still needed by every agent.
+
+        Returns:
+            np.ndarray: Array of bitmasks, one per agent.
+        """
+        return self.conditions ^ self.states
+
+    def needed_counts(self) -> np.ndarray:
+        """
+        Returns the number of ingredients still needed by every agent.
+
+        Returns:
+            np.ndarray: Array of counts, one per agent.
+        """
+        return np.bitwise_count(self.needed())
+
+    def won(self) -> np.ndarray:
+        """
+        Checks which agents have collected all required ingredients.
+
+        Returns:
+            np.ndarray: Boolean array, True for every agent that has won.
+        """
+        return self.conditions == self.states
+
+    def winner(self) -> int | None:
+        """
+        Returns the index of the first agent that has won, if any.
+
+        Returns:
+            int | None: Index of the winning agent, or None if no agent has won.
+        """
+        won = self.won()
+
+        if not won.any():
+            return None
+
+        return int(won.argmax())
+
+    def owned_by_others(self, index: int) -> int:
+        """
+        Returns the union of the ingredients held by every agent except one.
+
+        Args:
+            index (int): Index of the agent to exclude.
+
+        Returns:
+            int: Bitmask of the ingredients held by the other agents.
+        """
+        # Plain integers: numpy calls cost more than the loop on a handful of agents
+        states = self.states.tolist()
+        states[index] = 0
+
+        owned = 0
+
+        for state in states:
+            owned |= state
+
+        return owned
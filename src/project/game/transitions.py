@@ -0,0 +1,323 @@
+from random import Random
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.dice import movement_distribution
+from project.game.engine import GameEngine
+from project.game.policy import DECISION_KINDS
+from project.game.queue import ACTION_NAMES, DECK_DTYPE, generate_action_queue
+from project.game.snapshot import GameSnapshot
+from project.game.solver import (
+    DRAW,
+    GAIN,
+    LOSE_ALL,
+    EndgameSolver,
+    parse_action,
+    parse_tile,
+)
+from project.game.table import MASK_DTYPE
+
+# Card value of outcomes that drew no card
+NO_CARD: int = -1
+
+# Decision value of outcomes that asked no decision
+NO_DECISION: int = -1
+
+# Winner value of outcomes that do not end the game
+NO_WINNER: int = -1
+
+
+class Transitions(NamedTuple):
+    """
+    Exact distribution of the outcomes of the current agent's turn.
+
+    Each row is one outcome. Chance (dice total, then card) is resolved first: rows of the same
+    chance branch share `branch` and `probability`. A branch asking the agent to decide has one
+    row per legal selection, the agent's action, so P(outcome | state, action) is `probability`
+    and the probabilities of one row per branch sum to 1. policy_probabilities weighs the rows
+    by the random policy instead.
+
+    Attributes:
+        branch: np.ndarray - Chance branch of each row, numbered from 0.
+        probability: np.ndarray - Probability of the chance branch of each row.
+        movement: np.ndarray - Dice total.
+        position: np.ndarray - Board position landed on.
+        tile: np.ndarray - Tile code landed on, see project.game.board.
+        card: np.ndarray - Card drawn, indexed like ACTION_NAMES, or NO_CARD.
+        decision: np.ndarray - Kind of decision asked, indexed like DECISION_KINDS, or NO_DECISION.
+        selected: np.ndarray - Selected ingredients, 0 without decision.
+        states: np.ndarray - (rows, NUMBER_OF_PLAYERS) state of every agent after the turn.
+        deck: np.ndarray - (rows, len(ACTION_NAMES)) remaining copies of each action after the turn.
+        winner: np.ndarray - Agent winning with this outcome, or NO_WINNER.
+        snapshots: tuple[GameSnapshot, ...] - State of the game after each outcome.
+    """
+
+    branch: np.ndarray
+    probability: np.ndarray
+    movement: np.ndarray
+    position: np.ndarray
+    tile: np.ndarray
+    card: np.ndarray
+    decision: np.ndarray
+    selected: np.ndarray
+    states: np.ndarray
+    deck: np.ndarray
+    winner: np.ndarray
+    snapshots: tuple[GameSnapshot, ...]
+
+    def __len__(self) -> int:
+        """
+        Number of outcomes.
+
+        Returns:
+            int: Number of rows.
+        """
+        return len(self.branch)
+
+    def policy_probabilities(self) -> np.ndarray:
+        """
+        Probability of every row when each decision is taken uniformly at random, like RandomPolicy.
+
+        Returns:
+            np.ndarray: Probability of each row, summing to 1.
+        """
+        counts = np.bincount(self.branch)
+
+        return self.probability / counts[self.branch]
+
+
+class _Branch(NamedTuple):
+    """
+    Chance outcome of a turn, before the agent's decision if any.
+
+    Attributes:
+        probability: float - Probability of the dice total and card.
+        movement: int - Dice total.
+        position: int - Board position landed on.
+        card: int - Card drawn, or NO_CARD.
+        kind: str | None - Kind of decision asked, or None.
+        amount: int - Number of ingredients to select.
+        states: tuple[int, ...] - State of every agent before the decision.
+        queue: tuple[str, ...] - Remaining action queue.
+        deck: tuple[int, ...] - Remaining copies of each action.
+        rng_state: tuple[Any, ...] - State of the dice and deck RNG after replenishing the deck, if it was.
+    """
+
+    probability: float
+    movement: int
+    position: int
+    card: int
+    kind: str | None
+    amount: int
+    states: tuple[int, ...]
+    queue: tuple[str, ...]
+    deck: tuple[int, ...]
+    rng_state: tuple[Any, ...]
+
+
+def _remove_card(queue: tuple[str, ...], action: str) -> tuple[str, ...]:
+    """
+    Removes the first copy of a card from a queue, keeping the order of the other cards.
+
+    Args:
+        queue (tuple[str, ...]): Action queue.
+        action (str): Card to remove.
+
+    Returns:
+        tuple[str, ...]: Queue without the card.
+    """
+    index = queue.index(action)
+
+    return queue[:index] + queue[index + 1 :]
+
+
+def _chance_branches(engine: GameEngine, snapshot: GameSnapshot) -> list[_Branch]:
+    """
+    Enumerates the dice totals and cards of the current agent's turn.
+
+    Args:
+        engine (GameEngine): Engine providing the board, conditions and rules.
+        snapshot (GameSnapshot): State at the start of the turn.
+
+    Returns:
+        list[_Branch]: Chance outcomes, with effects that need no decision already applied.
+    """
+    agent = snapshot.current_agent_index
+    condition = int(engine.table.conditions[agent])
+    states = snapshot.states
+    board_size = len(engine.board)
+
+    queue = snapshot.action_queue
+    counts = snapshot.deck_counts
+    drawn_rng_state = snapshot.rng_state
+
+    # An empty deck is replenished before drawing like pop_action does, shuffled from a seed
+    # drawn from the RNG, so that card successors continue with a shuffled deck
+    if not queue:
+        rng = Random()
+        rng.setstate(snapshot.rng_state)
+        queue = tuple(generate_action_queue(rng.randint(0, 2**31 - 1), engine.rules))
+        counts = tuple(int(count) for count in engine.full_deck)
+        drawn_rng_state = rng.getstate()
+
+    total = sum(counts)
+
+    branches = []
+
+    for movement, movement_probability in movement_distribution():
+        position = (snapshot.board_position + movement) % board_size
+        kind, argument = parse_tile(engine.board[position])
+
+        if kind == DRAW:
+            for card, copies in enumerate(counts):
+                if copies == 0:
+                    continue
+
+                action = ACTION_NAMES[card]
+                card_kind, amount = parse_action(action)
+                after = states
+
+                if card_kind == LOSE_ALL:
+                    after = EndgameSolver.replace(states, agent, 0)
+
+                branches.append(
+                    _Branch(
+                        probability=movement_probability * copies / total,
+                        movement=movement,
+                        position=position,
+                        card=card,
+                        kind=card_kind if card_kind in DECISION_KINDS else None,
+                        amount=amount,
+                        states=after,
+                        queue=_remove_card(queue, action),
+                        deck=counts[:card] + (copies - 1,) + counts[card + 1 :],
+                        rng_state=drawn_rng_state,
+                    )
+                )
+
+            continue
+
+        after = states
+
+        if kind == GAIN and argument & (condition ^ states[agent]):
+            after = EndgameSolver.replace(states, agent, states[agent] | argument)
+        elif kind == LOSE_ALL:
+            after = EndgameSolver.replace(states, agent, 0)
+
+        branches.append(
+            _Branch(
+                probability=movement_probability,
+                movement=movement,
+                position=position,
+                card=NO_CARD,
+                kind=kind if kind in DECISION_KINDS else None,
+                amount=argument,
+                states=after,
+                queue=snapshot.action_queue,
+                deck=snapshot.deck_counts,
+                rng_state=snapshot.rng_state,
+            )
+        )
+
+    return branches
+
+
+def transitions(engine: GameEngine) -> Transitions:
+    """
+    Enumerates every outcome of the current agent's turn, without stepping the engine.
+
+    Dice totals follow movement_distribution. Cards are drawn from the remaining deck
+    composition, treating the order of the remaining cards as unknown, like EndgameSolver.
+    Every legal selection of a decision is an outcome, following GameEngine's masks. The
+    successor snapshots keep the order of the cards left and the RNG states of the current
+    state: restoring one into the engine continues the game from that outcome. An empty deck
+    is replenished first like pop_action does, so successors drawing a card from it hold the
+    rest of one shuffled deck and an RNG advanced by the shuffle seed.
+
+    Args:
+        engine (GameEngine): Engine at the start of a turn.
+
+    Returns:
+        Transitions: One row per outcome, in dice total, then card, then selection order.
+    """
+    snapshot = engine.snapshot()
+    agent = snapshot.current_agent_index
+    condition = int(engine.table.conditions[agent])
+
+    rows: list[tuple[int, ...]] = []
+    probabilities: list[float] = []
+    states: list[tuple[int, ...]] = []
+    decks: list[tuple[int, ...]] = []
+    snapshots: list[GameSnapshot] = []
+
+    for branch_id, branch in enumerate(_chance_branches(engine, snapshot)):
+        if branch.kind is None:
+            selections = [(NO_DECISION, 0, branch.states)]
+        else:
+            mask = EndgameSolver.legal_mask(
+                branch.kind, agent, branch.states, condition
+            )
+            decision = DECISION_KINDS.index(branch.kind)
+            selections = [
+                (
+                    decision,
+                    selected,
+                    EndgameSolver.apply(branch.kind, agent, branch.states, selected),
+                )
+                for selected in EndgameSolver.candidates(mask, branch.amount)
+            ]
+
+        for decision, selected, after in selections:
+            won = after[agent] == condition
+
+            rows.append(
+                (
+                    branch_id,
+                    branch.movement,
+                    branch.position,
+                    int(engine.board_codes[branch.position]),
+                    branch.card,
+                    decision,
+                    selected,
+                    agent if won else NO_WINNER,
+                )
+            )
+            probabilities.append(branch.probability)
+            states.append(after)
+            decks.append(branch.deck)
+
+            # The engine does not pass the turn once someone has won
+            snapshots.append(
+                snapshot._replace(
+                    board_position=branch.position,
+                    current_agent_index=(
+                        agent if won else (agent + 1) % NUMBER_OF_PLAYERS
+                    ),
+                    turn_count=snapshot.turn_count + (not won),
+                    states=after,
+                    action_queue=branch.queue,
+                    deck_counts=branch.deck,
+                    rng_state=branch.rng_state,
+                )
+            )
+
+    branch, movement, position, tile, card, decision, selected, winner = (
+        np.array(column) for column in zip(*rows)
+    )
+
+    return Transitions(
+        branch=branch.astype(np.int32),
+        probability=np.array(probabilities, dtype=np.float64),
+        movement=movement.astype(np.int8),
+        position=position.astype(np.int16),
+        tile=tile.astype(np.int8),
+        card=card.astype(np.int8),
+        decision=decision.astype(np.int8),
+        selected=selected.astype(MASK_DTYPE),
+        states=np.array(states, dtype=MASK_DTYPE),
+        deck=np.array(decks, dtype=DECK_DTYPE),
+        winner=winner.astype(np.int8),
+        snapshots=tuple(snapshots),
+    )
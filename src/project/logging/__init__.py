@@ -1,3 +1,13 @@
-from project.logging.logger import configure_logging
+from project.logging.logger import configure_logging, configure_logging_from_settings
+from project.logging.sampling import configure_tracing, game_logger, is_traced
+from project.logging.sink import SinkConnection, active_sink
 
-__all__ = ["configure_logging"]
+__all__ = [
+    "SinkConnection",
+    "active_sink",
+    "configure_logging",
+    "configure_logging_from_settings",
+    "configure_tracing",
+    "game_logger",
+    "is_traced",
+]
@@ -1,45 +1,64 @@
 import logging
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
 import structlog
 
+from project.logging.processors import SelectiveCallsiteAdder
 from project.logging.renderer import get_renderer
-from project.logging.types import LogFormat, LogLevel
+from project.logging.sampling import configure_tracing
+from project.logging.sink import BufferedFileSink, SinkConnection, SinkRelay
+from project.logging.types import LogFormat, LogLevel, LogSink
+
+if TYPE_CHECKING:
+    from project.settings.model.log import LogSettings
 
 
-def configure_logging(level: LogLevel, format: LogFormat) -> None:
+def configure_logging(
+    level: LogLevel,
+    format: LogFormat,
+    handler: logging.Handler | None = None,
+    callsite_exclude: Iterable[str] = (),
+) -> None:
     """
     Configure structlog for the application. Should be called once at startup.
 
+    Calling it again replaces the handlers, as worker processes do to stop writing through
+    the handlers inherited from their parent.
+
     Args:
         level (LogLevel): The log level to use. Supported values are "CRITICAL", "ERROR", "WARNING", "INFO", and "DEBUG".
         format (LogFormat): The log format to use. Supported values are "json" and "console".
+        handler (logging.Handler | None): Handler receiving the rendered log lines. If None, lines are written to stderr.
+        callsite_exclude (Iterable[str]): Logger names (and their children) for which file, line, and function information is not collected.
     """
 
     renderer = get_renderer(format)
 
-    # Convert the log level string to a logging constant
-    log_level = getattr(logging, level.value.upper())
+    # Convert the log level (enum or its string value, as stored by the settings) to a logging constant
+    log_level = getattr(logging, LogLevel(level).value)
 
     logging.basicConfig(
         level=log_level,
         format="%(message)s",
+        handlers=[handler] if handler is not None else None,
+        force=True,
     )
 
     structlog.configure(
         processors=[
+            # Drop events below the log level before doing any work on them
+            structlog.stdlib.filter_by_level,
+            # Add the context bound by the current thread (e.g. its worker name)
+            structlog.contextvars.merge_contextvars,
             # Add log level to the event dict
             structlog.stdlib.add_log_level,
             # Add logger name to the event dict
             structlog.stdlib.add_logger_name,
             # Add timestamp to the event dict
             structlog.processors.TimeStamper(fmt="iso"),
-            # Add file, line, and function information to the event dict
-            structlog.processors.CallsiteParameterAdder(
-                {
-                    structlog.processors.CallsiteParameter.FILENAME,
-                    structlog.processors.CallsiteParameter.LINENO,
-                    structlog.processors.CallsiteParameter.FUNC_NAME,
-                }
-            ),
+            # Add file, line, and function information to the event dict, except for excluded loggers
+            SelectiveCallsiteAdder(callsite_exclude),
             # Extract stack information and add it to the event dict if the log level is ERROR or higher
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
@@ -50,3 +69,49 @@ def configure_logging(level: LogLevel, format: LogFormat) -> None:
         wrapper_class=structlog.stdlib.BoundLogger,
         cache_logger_on_first_use=True,
     )
+
+
+def configure_logging_from_settings(
+    settings: LogSettings, sink: SinkConnection | None = None
+) -> None:
+    """
+    Configure structlog from the logging settings. Should be called once at startup.
+
+    With the file sink, log lines are always rendered as JSON and written by a background thread.
+    Per-game trace sampling is configured as well, see project.logging.sampling.
+
+    Args:
+        settings (LogSettings): The logging settings.
+        sink (SinkConnection | None): File sink of the parent process, for worker processes. If None, the file sink is opened here.
+    """
+
+    if settings.sink == LogSink.FILE and sink is not None:
+        handler = SinkRelay(sink)
+        format = LogFormat.JSON
+    elif settings.sink == LogSink.FILE:
+        handler = BufferedFileSink(
+            path=settings.file_path,
+            max_bytes=settings.file_max_bytes,
+            backup_count=settings.file_backup_count,
+            buffer_size=settings.buffer_size,
+            batch_size=settings.batch_size,
+        )
+        format = LogFormat.JSON
+    else:
+        handler = None
+        format = settings.format
+
+    configure_logging(
+        level=settings.level,
+        format=format,
+        handler=handler,
+        callsite_exclude=settings.callsite_exclude,
+    )
+
+    configure_tracing(
+        rate=settings.trace_sample_rate,
+        seeds=settings.trace_seeds,
+        max_games_per_second=settings.trace_max_games_per_second,
+        burst=settings.trace_burst,
+        format=format,
+    )
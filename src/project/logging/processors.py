@@ -0,0 +1,74 @@
+from collections.abc import Iterable
+
+import structlog
+from structlog.typing import EventDict, WrappedLogger
+
+
+class SelectiveCallsiteAdder:
+    """
+    Adds file, line, and function information to the event dict, except for excluded loggers.
+
+    Finding the callsite walks the stack on every event, which is expensive for hot modules
+    such as the game engine. Events from excluded loggers skip it entirely.
+    Must run after structlog.stdlib.add_logger_name.
+    """
+
+    def __init__(self, excluded: Iterable[str]) -> None:
+        """
+        Initializes the processor.
+
+        Args:
+            excluded (Iterable[str]): Logger names to skip. A name also excludes its children (e.g. "project.game" excludes "project.game.engine").
+        """
+        self.excluded = tuple(excluded)
+        self.decisions: dict[str, bool] = {}
+
+        self.adder = structlog.processors.CallsiteParameterAdder(
+            {
+                structlog.processors.CallsiteParameter.FILENAME,
+                structlog.processors.CallsiteParameter.LINENO,
+                structlog.processors.CallsiteParameter.FUNC_NAME,
+            },
+            # This wrapper is not the callsite
+            additional_ignores=[__name__],
+        )
+
+    def is_excluded(self, name: str) -> bool:
+        """
+        Checks whether a logger is excluded, caching the answer.
+
+        Args:
+            name (str): Logger name.
+
+        Returns:
+            bool: True if callsite information must not be collected.
+        """
+        decision = self.decisions.get(name)
+
+        if decision is None:
+            decision = any(
+                name == excluded or name.startswith(f"{excluded}.")
+                for excluded in self.excluded
+            )
+            self.decisions[name] = decision
+
+        return decision
+
+    def __call__(
+        self, logger: WrappedLogger, method_name: str, event_dict: EventDict
+    ) -> EventDict:
+        """
+        Adds the callsite parameters unless the event comes from an excluded logger.
+
+        Args:
+            logger (WrappedLogger): Wrapped logger.
+            method_name (str): Name of the called log method.
+            event_dict (EventDict): Event being processed.
+
+        Returns:
+            EventDict: The processed event.
+        """
+        if self.excluded and self.is_excluded(event_dict.get("logger", "")):
+            return event_dict
+
+        return self.adder(logger, method_name, event_dict)
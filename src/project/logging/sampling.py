@@ -0,0 +1,237 @@
+import hashlib
+import logging
+import random
+import threading
+import time
+from collections.abc import Iterable
+
+import structlog
+from structlog.typing import BindableLogger
+
+from project.logging.renderer import get_renderer
+from project.logging.types import LogFormat
+
+# Standard library logger receiving the traces of sampled games
+TRACE_LOGGER_NAME: str = "project.trace"
+
+
+class RateLimiter:
+    """
+    Admits sampled games to tracing at a bounded rate.
+
+    A token bucket holds up to `burst` tokens, refilled at `rate` tokens per second; a game
+    consumes one token when it starts or is not traced at all. Deciding per game rather than
+    per line keeps every trace whole, so traces can be replayed and ingested, while the trace
+    volume of a process stays bounded whatever the simulation speed.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """
+        Initializes the limiter with a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            burst (int): Capacity of the bucket.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.lock = threading.Lock()
+
+        self.tokens = float(burst)
+        self.last = time.monotonic()
+
+        # Games refused since the last admitted one
+        self.refused = 0
+
+    def admit(self) -> int | None:
+        """
+        Takes a token for a starting game, if one is left.
+
+        Returns:
+            int | None: Number of games refused since the last admitted one, or None if this game is refused.
+        """
+        now = time.monotonic()
+
+        with self.lock:
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+
+            if self.tokens < 1:
+                self.refused += 1
+                return None
+
+            self.tokens -= 1
+            refused, self.refused = self.refused, 0
+
+        return refused
+
+
+class TraceSampler:
+    """
+    Chooses, per game, between a verbose trace logger and a silent one.
+
+    A game is traced if its seed is listed, or if the hash of its seed falls under the sample
+    rate, so the same seeds are traced on every run and in every worker. Games without a seed
+    are sampled at random with the same rate. Sampled games are then admitted by a per-process
+    RateLimiter, and games over budget are silent from start to end; listed seeds are always
+    traced.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        seeds: Iterable[int],
+        max_games_per_second: float,
+        burst: int,
+        format: LogFormat,
+    ) -> None:
+        """
+        Initializes the sampler.
+
+        Args:
+            rate (float): Fraction of games to trace, between 0 and 1.
+            seeds (Iterable[int]): Seeds always traced.
+            max_games_per_second (float): Sustained rate at which sampled games are traced.
+            burst (int): Number of sampled games traced at once before rate limiting.
+            format (LogFormat): Format of the trace lines.
+        """
+        self.rate = rate
+        self.seeds = frozenset(seeds)
+        self.limiter = RateLimiter(max_games_per_second, burst)
+
+        # Trace events are written whatever the configured level
+        logging.getLogger(TRACE_LOGGER_NAME).setLevel(logging.DEBUG)
+
+        self.processors = [
+            structlog.contextvars.merge_contextvars,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.add_logger_name,
+            structlog.processors.TimeStamper(fmt="iso"),
+            get_renderer(format),
+        ]
+
+        # Every log method below CRITICAL is a no-op, and nothing is ever written
+        self.silent = structlog.make_filtering_bound_logger(logging.CRITICAL)(
+            structlog.ReturnLogger(), [], {}
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether any game can be traced.
+
+        Returns:
+            bool: True if the rate is positive or seeds are listed.
+        """
+        return self.rate > 0 or bool(self.seeds)
+
+    def is_sampled(self, seed: int | None) -> bool:
+        """
+        Decides whether a game is sampled, before the rate limit.
+
+        Args:
+            seed (int | None): Seed of the game.
+
+        Returns:
+            bool: True if the game is listed or falls under the sample rate.
+        """
+        if seed is None:
+            return random.random() < self.rate
+
+        if seed in self.seeds:
+            return True
+
+        digest = hashlib.blake2b(str(seed).encode(), digest_size=8).digest()
+
+        return int.from_bytes(digest) / 2**64 < self.rate
+
+    def logger_for(self, seed: int | None) -> BindableLogger:
+        """
+        Returns the logger of a game.
+
+        Args:
+            seed (int | None): Seed of the game.
+
+        Returns:
+            BindableLogger: A DEBUG logger bound to the seed if the game is traced, a silent logger otherwise.
+        """
+        if not self.is_sampled(seed):
+            return self.silent
+
+        refused = 0
+
+        if seed not in self.seeds:
+            refused = self.limiter.admit()
+
+            if refused is None:
+                return self.silent
+
+        trace_logger = structlog.wrap_logger(
+            logging.getLogger(TRACE_LOGGER_NAME),
+            processors=self.processors,
+            wrapper_class=structlog.stdlib.BoundLogger,
+        ).bind(seed=seed)
+
+        if refused:
+            trace_logger.warning("Sampled games not traced", games=refused)
+
+        return trace_logger
+
+
+# Sampler of the current process, set by configure_tracing
+_sampler: TraceSampler | None = None
+
+
+def configure_tracing(
+    rate: float,
+    seeds: Iterable[int] = (),
+    max_games_per_second: float = 1.0,
+    burst: int = 10,
+    format: LogFormat = LogFormat.JSON,
+) -> None:
+    """
+    Configure per-game trace sampling. Should be called once at startup, after configure_logging.
+
+    Args:
+        rate (float): Fraction of games to trace, between 0 and 1.
+        seeds (Iterable[int]): Seeds always traced.
+        max_games_per_second (float): Sustained rate at which sampled games are traced.
+        burst (int): Number of sampled games traced at once before rate limiting.
+        format (LogFormat): Format of the trace lines.
+    """
+    global _sampler
+
+    _sampler = TraceSampler(rate, seeds, max_games_per_second, burst, format)
+
+
+def game_logger(seed: int | None) -> BindableLogger | None:
+    """
+    Returns the logger a game engine should use.
+
+    Args:
+        seed (int | None): Seed of the game.
+
+    Returns:
+        BindableLogger | None: The sampled trace or silent logger, or None (the engine's module loggers) when tracing is not configured.
+    """
+    if _sampler is None or not _sampler.enabled:
+        return None
+
+    return _sampler.logger_for(seed)
+
+
+def is_traced(bound_logger: BindableLogger | None) -> bool:
+    """
+    Checks whether a logger returned by game_logger writes the trace of its game.
+
+    Args:
+        bound_logger (BindableLogger | None): Logger returned by game_logger.
+
+    Returns:
+        bool: True if the game is sampled, False if it is silent or tracing is not configured.
+    """
+    return (
+        _sampler is not None
+        and bound_logger is not None
+        and bound_logger is not _sampler.silent
+    )
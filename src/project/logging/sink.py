@@ -0,0 +1,270 @@
+import logging
+import logging.handlers
+import multiprocessing
+import queue
+import threading
+from multiprocessing.sharedctypes import Synchronized
+from pathlib import Path
+from typing import NamedTuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Marks the end of the stream for the writer thread (log lines are never None)
+_STOP = None
+
+
+class SinkConnection(NamedTuple):
+    """
+    Handles other processes need to send their log lines to a file sink.
+
+    Both handles can be inherited by forked processes and passed to spawned ones, e.g. as the
+    `initargs` of a process pool.
+
+    Attributes:
+        queue: multiprocessing.Queue - Pending log lines, drained by the sink's writer thread.
+        dropped: Synchronized - Shared count of the log lines dropped because the queue was full.
+    """
+
+    queue: multiprocessing.Queue
+    dropped: Synchronized
+
+
+class SinkRelay(logging.handlers.QueueHandler):
+    """
+    Non-blocking logging handler sending log lines to a file sink, possibly in another process.
+
+    Records are rendered in the calling thread and put on the sink's bounded queue without
+    waiting. When the queue is full the line is dropped and counted instead of blocking the caller.
+    Worker processes use a relay so that every process writes through the one sink of the parent,
+    which alone owns and rotates the file.
+    """
+
+    def __init__(self, connection: SinkConnection) -> None:
+        """
+        Initializes the relay.
+
+        Args:
+            connection (SinkConnection): Queue and drop counter of the sink.
+        """
+        super().__init__(connection.queue)
+
+        self.dropped = connection.dropped
+
+        # Set while the sink closes, so that its last lines wait for room instead of being dropped
+        self.blocking = False
+
+    @property
+    def connection(self) -> SinkConnection:
+        """
+        Returns the handles to give to other processes.
+
+        Returns:
+            SinkConnection: Queue and drop counter of the sink.
+        """
+        return SinkConnection(self.queue, self.dropped)
+
+    def prepare(self, record: logging.LogRecord) -> str:
+        """
+        Renders a record into the line to write.
+
+        Args:
+            record (logging.LogRecord): Record to render.
+
+        Returns:
+            str: Formatted log line.
+        """
+        return self.format(record)
+
+    def enqueue(self, record: str) -> None:
+        """
+        Queues a log line without blocking, dropping it if the buffer is full.
+
+        Args:
+            record (str): Formatted log line.
+        """
+        if self.blocking:
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.dropped.get_lock():
+                self.dropped.value += 1
+
+
+class BufferedFileSink(SinkRelay):
+    """
+    Non-blocking logging handler writing log lines to rotating files from a background thread.
+
+    A writer thread drains the queue in batches and appends them to the file, rotating it
+    when it grows past `max_bytes` like a RotatingFileHandler: without backups, it is never
+    rotated. Lines logged once the sink is closed are dropped. The queue is shared between processes: worker processes
+    attach a SinkRelay to `connection` (see project.simulation.worker) instead of opening the
+    file themselves. Lines dropped by any process are reported by one warning when the sink
+    closes, rendered like every other log line.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int,
+        backup_count: int,
+        buffer_size: int,
+        batch_size: int,
+    ) -> None:
+        """
+        Initializes the sink and starts its writer thread.
+
+        Args:
+            path (Path): File to write to. Parent directories are created if needed.
+            max_bytes (int): Size in bytes after which the file is rotated. If 0, the file is never rotated.
+            backup_count (int): Number of rotated files to keep. If 0, the file is never rotated.
+            buffer_size (int): Maximum number of pending log lines.
+            batch_size (int): Maximum number of log lines written at once.
+        """
+        super().__init__(
+            SinkConnection(
+                multiprocessing.Queue(maxsize=buffer_size), multiprocessing.Value("q")
+            )
+        )
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # The file is only ever touched by the writer thread (and by close, once it stopped)
+        self.path = path
+        self.stream = path.open("ab")
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+
+        # Dropped lines already reported
+        self.reported = 0
+
+        # Set once closed, when nothing drains the queue anymore
+        self.stopped = False
+
+        self.writer = threading.Thread(
+            target=self.write_loop, name="log-sink-writer", daemon=True
+        )
+        self.writer.start()
+
+    def write_loop(self) -> None:
+        """
+        Writes queued log lines in batches until the sink is closed.
+        """
+        while True:
+            batch = [self.queue.get()]
+
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            lines = [line for line in batch if line is not _STOP]
+
+            if lines:
+                self.write(lines)
+
+            if len(lines) != len(batch):
+                return
+
+    def enqueue(self, record: str) -> None:
+        """
+        Queues a log line, or drops it if the sink is closed.
+
+        Args:
+            record (str): Formatted log line.
+        """
+        if not self.stopped:
+            super().enqueue(record)
+
+    def report_dropped(self) -> None:
+        """
+        Logs a warning with the number of lines dropped since the last report, if any.
+
+        Only called while closing: the warning goes through this handler, whose lock the
+        writer thread must never wait for.
+        """
+        dropped = self.dropped.value - self.reported
+
+        if dropped:
+            self.reported += dropped
+
+            logger.warning("Log records dropped", dropped=dropped)
+
+    def write(self, lines: list[str]) -> None:
+        """
+        Appends log lines to the file, rotating it first if they do not fit in a non-empty file.
+
+        Args:
+            lines (list[str]): Log lines to write.
+        """
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+
+        position = self.stream.tell()
+
+        if (
+            self.max_bytes > 0
+            and self.backup_count > 0
+            and position > 0
+            and position + len(data) > self.max_bytes
+        ):
+            self.rotate()
+
+        self.stream.write(data)
+        self.stream.flush()
+
+    def rotate(self) -> None:
+        """
+        Shifts the rotated files (path.1 becomes path.2, and so on) and starts a new file.
+        """
+        self.stream.close()
+
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+
+        self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        self.stream = self.path.open("ab")
+
+    def close(self) -> None:
+        """
+        Reports dropped lines, flushes every pending log line, stops the writer thread and closes the file.
+
+        In a forked process, where the writer thread does not exist, only the handler is closed.
+        Either way, later log lines are dropped.
+        """
+        if self.writer.is_alive():
+            # The writer keeps draining, so blocking puts cannot deadlock
+            self.blocking = True
+            self.report_dropped()
+
+            self.queue.put(_STOP)
+            self.writer.join()
+
+            self.stream.close()
+            self.blocking = False
+
+        self.stopped = True
+
+        super().close()
+
+
+def active_sink() -> SinkConnection | None:
+    """
+    Finds the file sink the root logger writes to, to connect worker processes to it.
+
+    Returns:
+        SinkConnection | None: Handles of the sink, or None if logging does not use a file sink.
+    """
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, SinkRelay):
+            return handler.connection
+
+    return None
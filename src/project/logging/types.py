@@ -20,3 +20,12 @@ class LogFormat(str, Enum):
 
     JSON = "json"
     CONSOLE = "console"
+
+
+class LogSink(str, Enum):
+    """
+    Enum for log destinations.
+    """
+
+    STDERR = "stderr"
+    FILE = "file"
@@ -1,6 +1,8 @@
+from pathlib import Path
+
 from pydantic import Field
 
-from project.logging.types import LogFormat, LogLevel
+from project.logging.types import LogFormat, LogLevel, LogSink
 from project.settings.base import BaseModel
 
 
@@ -11,6 +13,17 @@ class LogSettings(BaseModel):
     Attributes:
         level: LogLevel - The log level to use for the project.
         format: LogFormat - The format of logging output (json or console).
+        sink: LogSink - Where log lines are written (stderr or file).
+        file_path: Path - The file written by the file sink.
+        file_max_bytes: int - The size after which the log file is rotated (0 disables rotation).
+        file_backup_count: int - The number of rotated log files to keep (0 disables rotation).
+        buffer_size: int - The maximum number of log lines waiting to be written by the file sink.
+        batch_size: int - The maximum number of log lines written at once by the file sink.
+        callsite_exclude: list[str] - Loggers for which file, line, and function information is not collected.
+        trace_sample_rate: float - The fraction of games logged at DEBUG level, the others being silent (0 disables sampling).
+        trace_seeds: list[int] - The seeds of games always logged at DEBUG level.
+        trace_max_games_per_second: float - The sustained rate at which sampled games are traced, in each process.
+        trace_burst: int - The number of sampled games traced at once before rate limiting.
     """
 
     level: LogLevel = Field(
@@ -22,3 +35,66 @@ class LogSettings(BaseModel):
         default=LogFormat.CONSOLE,
         description="The format of logging output (json or console).",
     )
+
+    sink: LogSink = Field(
+        default=LogSink.STDERR,
+        description="Where log lines are written (stderr or file).",
+    )
+
+    file_path: Path = Field(
+        default=Path("logs/crazy-pizza.jsonl"),
+        description="The file written by the file sink.",
+    )
+
+    file_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="The size after which the log file is rotated (0 disables rotation).",
+    )
+
+    file_backup_count: int = Field(
+        default=5,
+        ge=0,
+        description="The number of rotated log files to keep (0 disables rotation).",
+    )
+
+    buffer_size: int = Field(
+        default=100_000,
+        gt=0,
+        description="The maximum number of log lines waiting to be written by the file sink.",
+    )
+
+    batch_size: int = Field(
+        default=1024,
+        gt=0,
+        description="The maximum number of log lines written at once by the file sink.",
+    )
+
+    callsite_exclude: list[str] = Field(
+        default_factory=list,
+        description="Loggers for which file, line, and function information is not collected.",
+    )
+
+    trace_sample_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="The fraction of games logged at DEBUG level, the others being silent (0 disables sampling).",
+    )
+
+    trace_seeds: list[int] = Field(
+        default_factory=list,
+        description="The seeds of games always logged at DEBUG level.",
+    )
+
+    trace_max_games_per_second: float = Field(
+        default=1.0,
+        gt=0.0,
+        description="The sustained rate at which sampled games are traced, in each process.",
+    )
+
+    trace_burst: int = Field(
+        default=10,
+        gt=0,
+        description="The number of sampled games traced at once before rate limiting.",
+    )
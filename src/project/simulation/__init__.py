@@ -0,0 +1,36 @@
+from project.simulation.batcher import BatchedPolicy, DecisionBatcher
+from project.simulation.cache import OutcomeCache
+from project.simulation.experience import PrioritizedReplayBuffer
+from project.simulation.golden import (
+    Divergence,
+    GoldenTraces,
+    check_engine,
+    record_traces,
+)
+from project.simulation.ingest import Trajectory, ingest_logs, load_trajectories
+from project.simulation.results import GameResult, ResultsStore, simulate
+from project.simulation.shards import ShardQueue
+from project.simulation.sweep import VariantSummary, run_sweep
+from project.simulation.tournament import TournamentResult, run_tournament
+
+__all__ = [
+    "BatchedPolicy",
+    "DecisionBatcher",
+    "Divergence",
+    "GameResult",
+    "GoldenTraces",
+    "OutcomeCache",
+    "PrioritizedReplayBuffer",
+    "ResultsStore",
+    "ShardQueue",
+    "TournamentResult",
+    "Trajectory",
+    "VariantSummary",
+    "check_engine",
+    "ingest_logs",
+    "load_trajectories",
+    "record_traces",
+    "run_sweep",
+    "run_tournament",
+    "simulate",
+]
@@ -0,0 +1,150 @@
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache
+
+import structlog
+
+from project.logging import active_sink
+from project.simulation.worker import initialize_worker
+
+logger = structlog.get_logger(__name__)
+
+# Execution backends of the parallel runners
+PROCESS = "process"
+THREAD = "thread"
+INTERPRETER = "interpreter"
+
+BACKENDS: tuple[str, ...] = (PROCESS, THREAD, INTERPRETER)
+
+
+def gil_enabled() -> bool:
+    """
+    Checks whether the running interpreter has a global interpreter lock.
+
+    Returns:
+        bool: False on free-threaded builds running without the GIL.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+@cache
+def interpreter_support_error() -> str | None:
+    """
+    Checks once whether sub-interpreters can run games, by importing NumPy in a new one.
+
+    NumPy does not yet support being loaded in isolated interpreters, so the interpreter backend
+    only works with a build that does.
+
+    Returns:
+        str | None: Why the interpreter backend cannot run, or None if it can.
+    """
+    try:
+        from concurrent import interpreters
+    except ImportError:
+        return "The interpreter backend requires Python 3.14 or later"
+
+    interpreter = interpreters.create()
+
+    try:
+        interpreter.exec("import numpy")
+    except interpreters.ExecutionFailed as error:
+        return f"NumPy cannot be imported in a sub-interpreter: {error.excinfo.msg}"
+    finally:
+        interpreter.close()
+
+    return None
+
+
+def available_backends() -> tuple[str, ...]:
+    """
+    Lists the backends able to run in this interpreter.
+
+    Returns:
+        tuple[str, ...]: Available entries of BACKENDS.
+    """
+    if interpreter_support_error() is None:
+        return BACKENDS
+
+    return tuple(backend for backend in BACKENDS if backend != INTERPRETER)
+
+
+def initialize_thread() -> None:
+    """
+    Prepares a worker thread to run simulations.
+
+    Logging is configured once per process, so threads only bind their own name to the
+    logging context. Context variables are per thread, so nothing mutable is shared.
+    """
+    structlog.contextvars.bind_contextvars(worker=threading.current_thread().name)
+
+
+def initialize_interpreter() -> None:
+    """
+    Prepares a worker sub-interpreter to run simulations.
+
+    Every interpreter has its own modules, so logging is configured again from the settings.
+    """
+    initialize_worker()
+
+    structlog.contextvars.bind_contextvars(worker=threading.current_thread().name)
+
+
+def create_executor(backend: str, workers: int | None = None) -> Executor:
+    """
+    Creates a pool of workers able to play games.
+
+    Engines own their random number generators and the logging configuration is read-only once
+    set, so games can run concurrently in any backend:
+
+    - process: one process per worker, the default and the most portable.
+    - thread: one thread per worker, only scaling on free-threaded (no GIL) builds.
+    - interpreter: one sub-interpreter per worker (Python 3.14+), only available when every
+      extension module used by the game, NumPy included, supports isolated interpreters.
+
+    Args:
+        backend (str): One of BACKENDS.
+        workers (int | None): Number of workers. If None, uses every CPU.
+
+    Returns:
+        Executor: The pool, to be shut down by the caller.
+
+    Raises:
+        RuntimeError: If the backend cannot run in this interpreter, see available_backends.
+    """
+    match backend:
+        case "process":
+            return ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=initialize_worker,
+                initargs=(active_sink(),),
+            )
+
+        case "thread":
+            if gil_enabled():
+                logger.warning(
+                    "Thread backend running with the GIL enabled, games will not run in parallel"
+                )
+
+            return ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix="simulation",
+                initializer=initialize_thread,
+            )
+
+        case "interpreter":
+            error = interpreter_support_error()
+
+            if error is not None:
+                raise RuntimeError(error)
+
+            from concurrent.futures import InterpreterPoolExecutor
+
+            return InterpreterPoolExecutor(
+                max_workers=workers, initializer=initialize_interpreter
+            )
+
+        case _:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
@@ -0,0 +1,628 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Lock
+from typing import NamedTuple, Self
+
+import numpy as np
+import structlog
+
+from project.game.agent import Agent
+from project.game.engine import GameEngine
+from project.game.observation import (
+    OBSERVATION_DTYPE,
+    OBSERVATION_SIZE,
+    encode_observations,
+)
+from project.game.policy import DECISION_KINDS
+from project.game.table import MASK_DTYPE
+from project.logging import SinkConnection, active_sink
+from project.simulation.worker import initialize_worker
+
+logger = structlog.get_logger(__name__)
+
+# Default number of slots of the ring buffer (at least one per worker process)
+BATCHER_CAPACITY: int = 1024
+
+# Default time the oldest pending decision may wait for a fuller batch
+BATCHER_MAX_WAIT: float = 0.001
+
+# Default time a worker waits for the answer to one decision before giving up
+BATCHER_TIMEOUT: float = 60.0
+
+# Longest sleep between two polls of the ring buffer, reached by doubling from 1 microsecond
+BATCHER_MAX_BACKOFF: float = 0.0001
+
+# Number of latency histogram buckets: bucket b counts waits in [2^(b-1), 2^b) microseconds
+LATENCY_BUCKETS: int = 32
+
+# Slot status values
+EMPTY: int = 0
+CLAIMED: int = 1
+PENDING: int = 2
+DONE: int = 3
+FAILED: int = 4
+ABANDONED: int = 5
+
+# Evaluates a batch: (observations, masks, kinds, amounts) -> selected masks, one row per decision
+BatchModel = Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+
+def _ring_layout(capacity: int) -> tuple[dict[str, tuple[int, type, tuple]], int]:
+    """
+    Computes where each array of a ring buffer lives in its shared memory block.
+
+    Args:
+        capacity (int): Number of slots.
+
+    Returns:
+        tuple[dict[str, tuple[int, type, tuple]], int]: Offset, dtype and shape of each array, and the block size.
+    """
+    arrays = {
+        "head": (np.int64, (1,)),
+        "enqueued": (np.int64, (capacity,)),
+        "observations": (OBSERVATION_DTYPE, (capacity, OBSERVATION_SIZE)),
+        "masks": (MASK_DTYPE, (capacity,)),
+        "selected": (MASK_DTYPE, (capacity,)),
+        "status": (np.int8, (capacity,)),
+        "kinds": (np.int8, (capacity,)),
+        "amounts": (np.int8, (capacity,)),
+        "serving": (np.int8, (1,)),
+    }
+
+    layout = {}
+    offset = 0
+
+    for name, (dtype, shape) in arrays.items():
+        layout[name] = (offset, dtype, shape)
+        size = np.dtype(dtype).itemsize * int(np.prod(shape))
+        # Keep every array 8-byte aligned
+        offset += -(-size // 8) * 8
+
+    return layout, offset
+
+
+class DecisionRing:
+    """
+    Ring buffer of pending decisions in shared memory.
+
+    Each slot holds one decision: the observation of the deciding seat, the legal mask, the
+    decision kind and amount, the time it was queued and the selected mask written back. Slots
+    go through EMPTY -> CLAIMED (by a worker, under the lock) -> PENDING (ready to evaluate)
+    -> DONE (answered) or FAILED (the model raised) -> EMPTY (answer read by the worker).
+    A worker giving up on a pending decision marks it ABANDONED instead, and the batcher frees
+    the slot (-> EMPTY) once it is no longer evaluating it. The serving flag is set while the evaluation thread runs, so that workers never wait for
+    a batcher that stopped.
+    """
+
+    def __init__(
+        self, capacity: int, name: str | None = None, lock: Lock | None = None
+    ) -> None:
+        """
+        Creates a ring buffer, or attaches to an existing one.
+
+        Args:
+            capacity (int): Number of slots.
+            name (str | None): Shared memory block to attach to. If None, a new block is created.
+            lock (Lock | None): Lock guarding slot claims. If None, a new one is created.
+        """
+        layout, size = _ring_layout(capacity)
+
+        self.capacity = capacity
+        self.owner = name is None
+        self.memory = (
+            SharedMemory(create=True, size=size)
+            if self.owner
+            else SharedMemory(name=name, track=False)
+        )
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+
+        self.array_names = tuple(layout)
+
+        for array_name, (offset, dtype, shape) in layout.items():
+            setattr(
+                self,
+                array_name,
+                np.ndarray(shape, dtype=dtype, buffer=self.memory.buf, offset=offset),
+            )
+
+        if self.owner:
+            self.head[0] = 0
+            self.status[:] = EMPTY
+            self.serving[0] = 0
+
+    def close(self) -> None:
+        """
+        Detaches from the shared memory, destroying it if this ring created it.
+        """
+        # Views must be released before the block can be closed
+        for array_name in self.array_names:
+            setattr(self, array_name, None)
+
+        self.memory.close()
+
+        if self.owner:
+            self.memory.unlink()
+
+
+class Backoff:
+    """
+    Sleeps of a polling loop, doubling from a bare yield up to BATCHER_MAX_BACKOFF.
+
+    Polls right after some activity stay cheap in latency, while idle loops stop burning a core.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the backoff at a bare yield.
+        """
+        self.delay = 0.0
+
+    def wait(self) -> None:
+        """
+        Sleeps the current delay, then doubles it.
+        """
+        time.sleep(self.delay)
+
+        self.delay = min(max(2 * self.delay, 1e-6), BATCHER_MAX_BACKOFF)
+
+    def reset(self) -> None:
+        """
+        Goes back to a bare yield, after some activity.
+        """
+        self.delay = 0.0
+
+
+class DecisionClient:
+    """
+    Worker side of a decision batcher: queues decisions and waits for their answers.
+    """
+
+    def __init__(
+        self, ring: DecisionRing, timeout: float | None = BATCHER_TIMEOUT
+    ) -> None:
+        """
+        Initializes the client.
+
+        Args:
+            ring (DecisionRing): Ring buffer shared with the evaluating process.
+            timeout (float | None): Seconds to wait for a free slot, then for the answer. If None, waits as long as the batcher serves.
+        """
+        self.ring = ring
+        self.timeout = timeout
+
+    def wait(self, backoff: Backoff, deadline: float | None) -> None:
+        """
+        Sleeps before polling the ring again, unless waiting is pointless.
+
+        Args:
+            backoff (Backoff): Sleeps of the current wait.
+            deadline (float | None): Monotonic time after which the wait fails. If None, no limit.
+
+        Raises:
+            RuntimeError: If the batcher is not serving.
+            TimeoutError: If the deadline passed.
+        """
+        if not self.ring.serving[0]:
+            raise RuntimeError("The decision batcher is not serving")
+
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(
+                f"No answer from the decision batcher within {self.timeout} seconds"
+            )
+
+        backoff.wait()
+
+    def claim(self) -> int:
+        """
+        Claims the next free slot, waiting if the ring is full.
+
+        Returns:
+            int: Index of the claimed slot.
+
+        Raises:
+            RuntimeError: If the batcher is not serving.
+            TimeoutError: If no slot was freed within the timeout.
+        """
+        ring = self.ring
+        backoff = Backoff()
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        while True:
+            with ring.lock:
+                slot = int(ring.head[0] % ring.capacity)
+
+                if ring.status[slot] == EMPTY:
+                    ring.status[slot] = CLAIMED
+                    ring.head[0] += 1
+
+                    return slot
+
+            self.wait(backoff, deadline)
+
+    def request(
+        self, engine: GameEngine, agent: Agent, kind: str, mask: int, amount: int
+    ) -> int:
+        """
+        Queues one decision and waits for the evaluated answer.
+
+        Args:
+            engine (GameEngine): Engine in the middle of resolving the agent's turn.
+            agent (Agent): Deciding agent, whose point of view is encoded.
+            kind (str): Kind of decision, one of DECISION_KINDS.
+            mask (int): Valid ingredients to select from.
+            amount (int): Number of ingredients to select.
+
+        Returns:
+            int: Bitmask of the selected ingredients.
+
+        Raises:
+            RuntimeError: If the batcher is not serving or its model failed on this decision.
+            TimeoutError: If the decision was not answered within the timeout.
+            ValueError: If the model selected an invalid answer.
+        """
+        ring = self.ring
+        slot = self.claim()
+
+        encode_observations(
+            [engine], ring.observations[slot : slot + 1], seats=[agent.index]
+        )
+        ring.masks[slot] = mask
+        ring.kinds[slot] = DECISION_KINDS.index(kind)
+        ring.amounts[slot] = amount
+        ring.enqueued[slot] = time.monotonic_ns()
+
+        # Published last, once the decision is complete
+        ring.status[slot] = PENDING
+
+        backoff = Backoff()
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        try:
+            while (status := ring.status[slot]) != DONE and status != FAILED:
+                self.wait(backoff, deadline)
+        except (RuntimeError, TimeoutError):
+            # The batcher may still be evaluating the slot: it frees it once answered
+            with ring.lock:
+                if ring.status[slot] == PENDING:
+                    ring.status[slot] = ABANDONED
+                else:
+                    ring.status[slot] = EMPTY
+
+            raise
+
+        selected = int(ring.selected[slot])
+        ring.status[slot] = EMPTY
+
+        if status == FAILED:
+            raise RuntimeError("The batched model failed to evaluate the decision")
+
+        if selected & ~mask or selected.bit_count() != amount:
+            raise ValueError(
+                f"Batched model selected {selected:#x} for {amount} of mask {mask:#x}"
+            )
+
+        return selected
+
+
+# Client of the current worker process, set by initialize_batched_worker
+_client: DecisionClient | None = None
+
+
+def initialize_batched_worker(
+    name: str,
+    capacity: int,
+    lock: Lock,
+    timeout: float | None = BATCHER_TIMEOUT,
+    sink: SinkConnection | None = None,
+) -> None:
+    """
+    Prepares a worker process to send its decisions to a batcher.
+
+    Args:
+        name (str): Shared memory block of the batcher's ring.
+        capacity (int): Number of slots of the ring.
+        lock (Lock): Lock guarding slot claims.
+        timeout (float | None): Seconds to wait for each answer, see DecisionClient.
+        sink (SinkConnection | None): File sink of the parent process, see project.logging.active_sink.
+    """
+    global _client
+
+    initialize_worker(sink)
+
+    _client = DecisionClient(DecisionRing(capacity, name=name, lock=lock), timeout)
+
+
+class BatchedPolicy:
+    """
+    Policy forwarding every decision to the batcher the worker process is attached to.
+
+    Only usable in processes started by DecisionBatcher.executor.
+    """
+
+    def select(
+        self, engine: GameEngine, agent: Agent, kind: str, mask: int, amount: int
+    ) -> int:
+        """
+        Selects ingredients through the central batched model.
+
+        Args:
+            engine (GameEngine): Engine in the middle of resolving the agent's turn.
+            agent (Agent): Deciding agent.
+            kind (str): Kind of decision, one of CHOOSE, LOSE or STEAL.
+            mask (int): Valid ingredients to select from.
+            amount (int): Number of ingredients to select.
+
+        Returns:
+            int: Bitmask of the selected ingredients.
+        """
+        if _client is None:
+            raise RuntimeError("This process is not attached to a decision batcher")
+
+        return _client.request(engine, agent, kind, mask, amount)
+
+
+class BatcherStats(NamedTuple):
+    """
+    Activity of a decision batcher.
+
+    Attributes:
+        decisions: int - Number of decisions evaluated.
+        batches: int - Number of model calls.
+        batch_sizes: np.ndarray - Entry n counts the batches of n decisions.
+        latencies: np.ndarray - Entry b counts the decisions that waited [2^(b-1), 2^b) microseconds before evaluation (entry 0: under 1 microsecond).
+    """
+
+    decisions: int
+    batches: int
+    batch_sizes: np.ndarray
+    latencies: np.ndarray
+
+
+class DecisionBatcher:
+    """
+    Central evaluator of the decisions of many worker processes.
+
+    Workers started by `executor` play with BatchedPolicy, which writes each decision into a
+    shared-memory ring buffer. A thread of the owning process collects the pending decisions,
+    evaluates them with one model call per batch and writes the selections back. A batch is
+    evaluated once it reaches `min_batch` decisions or its oldest decision waited `max_wait`
+    seconds. If the model raises, the decisions of that batch fail in their workers and the
+    batcher keeps serving. Use as a context manager to start and stop the evaluation thread.
+    """
+
+    def __init__(
+        self,
+        model: BatchModel,
+        capacity: int = BATCHER_CAPACITY,
+        min_batch: int = 1,
+        max_batch: int | None = None,
+        max_wait: float = BATCHER_MAX_WAIT,
+        timeout: float | None = BATCHER_TIMEOUT,
+    ) -> None:
+        """
+        Initializes the batcher and its ring buffer.
+
+        Args:
+            model (BatchModel): Evaluates a batch of decisions.
+            capacity (int): Number of ring slots, at least the number of worker processes.
+            min_batch (int): Number of pending decisions evaluated without waiting.
+            max_batch (int | None): Maximum decisions per model call. If None, the capacity.
+            max_wait (float): Seconds the oldest pending decision may wait for a fuller batch.
+            timeout (float | None): Seconds a worker waits for each answer. If None, waits as long as the batcher serves.
+        """
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, but got {capacity}")
+
+        self.model = model
+        self.ring = DecisionRing(capacity)
+        self.min_batch = min_batch
+        self.max_batch = capacity if max_batch is None else max_batch
+        self.max_wait_ns = int(max_wait * 1e9)
+        self.timeout = timeout
+
+        self.batches = 0
+        self.batch_sizes = np.zeros(capacity + 1, dtype=np.int64)
+        self.latencies = np.zeros(LATENCY_BUCKETS, dtype=np.int64)
+
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(
+            target=self.serve, name="decision-batcher", daemon=True
+        )
+
+    def __enter__(self) -> Self:
+        # Set before the thread starts, so that early requests do not see a stopped batcher
+        self.ring.serving[0] = 1
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def executor(self, max_workers: int | None = None) -> ProcessPoolExecutor:
+        """
+        Creates a process pool whose workers can play with BatchedPolicy.
+
+        Args:
+            max_workers (int | None): Number of worker processes, at most the ring capacity. If None, uses every CPU.
+
+        Returns:
+            ProcessPoolExecutor: The pool, to be shut down by the caller.
+        """
+        if max_workers is None:
+            max_workers = os.process_cpu_count() or 1
+
+        # Each worker has at most one decision in flight
+        if max_workers > self.ring.capacity:
+            raise ValueError(
+                f"{max_workers} workers do not fit in {self.ring.capacity} slots"
+            )
+
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=initialize_batched_worker,
+            initargs=(
+                self.ring.memory.name,
+                self.ring.capacity,
+                self.ring.lock,
+                self.timeout,
+                active_sink(),
+            ),
+        )
+
+    def serve(self) -> None:
+        """
+        Evaluates pending decisions in batches until the batcher is closed.
+        """
+        ring = self.ring
+        backoff = Backoff()
+
+        try:
+            while not self.stopping.is_set():
+                self.release_abandoned()
+
+                pending = np.flatnonzero(ring.status == PENDING)
+
+                if len(pending) == 0:
+                    backoff.wait()
+                    continue
+
+                now = time.monotonic_ns()
+                waits = now - ring.enqueued[pending]
+
+                if len(pending) < self.min_batch and waits.max() < self.max_wait_ns:
+                    backoff.wait()
+                    continue
+
+                backoff.reset()
+
+                # Oldest decisions first
+                batch = pending[np.argsort(-waits, kind="stable")[: self.max_batch]]
+
+                if self.evaluate(batch):
+                    self.record(batch, now)
+        finally:
+            ring.serving[0] = 0
+
+    def release_abandoned(self) -> None:
+        """
+        Frees the slots of the decisions given up on before being collected.
+
+        Only called between batches, when no abandoned slot can still be evaluated.
+        """
+        ring = self.ring
+
+        with ring.lock:
+            ring.status[ring.status == ABANDONED] = EMPTY
+
+    def answer(self, batch: np.ndarray, status: int) -> None:
+        """
+        Publishes the outcome of a batch, freeing the slots whose worker gave up meanwhile.
+
+        Args:
+            batch (np.ndarray): Slots of the decisions.
+            status (int): DONE or FAILED.
+        """
+        ring = self.ring
+
+        # Under the lock, so that no worker abandons a slot between the check and the write
+        with ring.lock:
+            abandoned = ring.status[batch] == ABANDONED
+            ring.status[batch] = np.where(abandoned, EMPTY, status)
+
+    def evaluate(self, batch: np.ndarray) -> bool:
+        """
+        Answers a batch of pending decisions with one model call.
+
+        Args:
+            batch (np.ndarray): Slots of the decisions.
+
+        Returns:
+            bool: Whether the model answered. If not, the decisions are marked FAILED.
+        """
+        ring = self.ring
+
+        try:
+            ring.selected[batch] = self.model(
+                ring.observations[batch],
+                ring.masks[batch],
+                ring.kinds[batch],
+                ring.amounts[batch],
+            )
+        except Exception:
+            logger.exception("Batched model failed", decisions=len(batch))
+            self.answer(batch, FAILED)
+
+            return False
+
+        self.answer(batch, DONE)
+
+        return True
+
+    def record(self, batch: np.ndarray, now: int) -> None:
+        """
+        Adds an evaluated batch to the statistics.
+
+        Args:
+            batch (np.ndarray): Slots of the decisions.
+            now (int): Monotonic time in nanoseconds at which the batch was collected.
+        """
+        ring = self.ring
+
+        # Bit length of the wait in microseconds
+        microseconds = np.maximum(now - ring.enqueued[batch], 0) // 1000
+        buckets = np.minimum(
+            np.ceil(np.log2(microseconds + 1)).astype(np.int64),
+            LATENCY_BUCKETS - 1,
+        )
+        np.add.at(self.latencies, buckets, 1)
+
+        self.batch_sizes[len(batch)] += 1
+        self.batches += 1
+
+    def stats(self) -> BatcherStats:
+        """
+        Returns the activity so far.
+
+        Returns:
+            BatcherStats: Decision and batch counts and histograms.
+        """
+        return BatcherStats(
+            decisions=int(self.latencies.sum()),
+            batches=self.batches,
+            batch_sizes=self.batch_sizes.copy(),
+            latencies=self.latencies.copy(),
+        )
+
+    def close(self) -> None:
+        """
+        Stops the evaluation thread, logs the activity and destroys the ring buffer.
+        """
+        if self.thread.is_alive():
+            self.stopping.set()
+            self.thread.join()
+
+        stats = self.stats()
+
+        logger.info(
+            "Decision batcher stopped",
+            decisions=stats.decisions,
+            batches=stats.batches,
+            mean_batch_size=stats.decisions / stats.batches if stats.batches else 0.0,
+            batch_sizes={
+                int(size): int(count)
+                for size, count in enumerate(stats.batch_sizes)
+                if count
+            },
+            latency_us={
+                f"<{1 << bucket}": int(count)
+                for bucket, count in enumerate(stats.latencies)
+                if count
+            },
+        )
+
+        self.ring.close()
@@ -0,0 +1,131 @@
+import time
+from collections.abc import Iterable
+from functools import partial
+from typing import NamedTuple
+
+import structlog
+
+from project.game.rules import DEFAULT_RULES
+from project.simulation.backends import available_backends, create_executor
+from project.simulation.sweep import play_variant
+from project.simulation.tournament import MAX_TURNS
+
+logger = structlog.get_logger(__name__)
+
+
+class BenchmarkResult(NamedTuple):
+    """
+    Throughput of one backend with one number of workers.
+
+    Attributes:
+        backend: str - Execution backend.
+        workers: int - Number of workers.
+        games: int - Number of games played.
+        seconds: float - Wall-clock time, excluding pool startup.
+        games_per_second: float - Throughput.
+        speedup: float - Throughput relative to the first number of workers tried with the same backend.
+    """
+
+    backend: str
+    workers: int
+    games: int
+    seconds: float
+    games_per_second: float
+    speedup: float
+
+
+def benchmark_backend(
+    backend: str,
+    workers: int,
+    games: int,
+    chunksize: int = 16,
+    max_turns: int = MAX_TURNS,
+) -> float:
+    """
+    Times random-policy games played by a pool of workers.
+
+    The pool is started and warmed up with one chunk per worker before timing, so startup and
+    imports are not counted.
+
+    Args:
+        backend (str): Execution backend, one of BACKENDS.
+        workers (int): Number of workers.
+        games (int): Number of games to time.
+        chunksize (int): Number of games sent to a worker at once.
+        max_turns (int): Turn limit after which a game ends without a winner.
+
+    Returns:
+        float: Elapsed seconds.
+    """
+    play = partial(play_variant, DEFAULT_RULES, max_turns=max_turns)
+    chunks = [
+        tuple(range(start, min(start + chunksize, games)))
+        for start in range(0, games, chunksize)
+    ]
+
+    with create_executor(backend, workers) as executor:
+        warmup = [tuple(range(-chunksize, 0))] * workers
+        list(executor.map(play, warmup))
+
+        start = time.perf_counter()
+        list(executor.map(play, chunks))
+
+        return time.perf_counter() - start
+
+
+def benchmark_backends(
+    worker_counts: Iterable[int],
+    games: int,
+    backends: Iterable[str] | None = None,
+    chunksize: int = 16,
+) -> list[BenchmarkResult]:
+    """
+    Measures how the throughput of each backend scales with the number of workers.
+
+    Backends that cannot run in this interpreter, or whose workers fail to start, are logged
+    and skipped.
+
+    Args:
+        worker_counts (Iterable[int]): Numbers of workers to try, the first one being the speedup reference.
+        games (int): Number of games played per measurement.
+        backends (Iterable[str] | None): Backends to compare. If None, every available backend.
+        chunksize (int): Number of games sent to a worker at once.
+
+    Returns:
+        list[BenchmarkResult]: One result per backend and number of workers.
+    """
+    worker_counts = list(worker_counts)
+    results = []
+
+    if backends is None:
+        backends = available_backends()
+
+    for backend in backends:
+        reference = None
+
+        for workers in worker_counts:
+            try:
+                seconds = benchmark_backend(backend, workers, games, chunksize)
+            # Unavailable backends, and pools whose workers failed to start (BrokenExecutor)
+            except RuntimeError as error:
+                logger.warning("Skipping backend", backend=backend, error=str(error))
+                break
+
+            games_per_second = games / seconds
+
+            if reference is None:
+                reference = games_per_second
+
+            result = BenchmarkResult(
+                backend=backend,
+                workers=workers,
+                games=games,
+                seconds=seconds,
+                games_per_second=games_per_second,
+                speedup=games_per_second / reference,
+            )
+            results.append(result)
+
+            logger.info("Backend benchmarked", **result._asdict())
+
+    return results
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import shutil
+from collections.abc import Iterable
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import structlog
+
+import project.game.constants
+from project.game.rules import DEFAULT_RULES, Rules
+from project.simulation.backends import PROCESS, create_executor
+from project.simulation.results import (
+    RESULT_COLUMNS,
+    Chunk,
+    ResultsStore,
+    play_result,
+)
+from project.simulation.tournament import MAX_TURNS
+
+logger = structlog.get_logger(__name__)
+
+# Bumped whenever the engine changes outcomes without changing the constants
+CACHE_VERSION: int = 1
+
+_METADATA = "outcomes.json"
+
+
+def _digest(payload: object) -> str:
+    """
+    Hashes a JSON-serializable value.
+
+    Args:
+        payload (object): Value to hash.
+
+    Returns:
+        str: First 16 hexadecimal digits of its SHA-256.
+    """
+    text = json.dumps(payload, sort_keys=True)
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def constants_fingerprint() -> str:
+    """
+    Fingerprints the game constants and the cache version.
+
+    Returns:
+        str: Hash of every constant of project.game.constants.
+    """
+    constants = {
+        name: value
+        for name, value in vars(project.game.constants).items()
+        if name.isupper()
+    }
+
+    return _digest({"version": CACHE_VERSION, "constants": constants})
+
+
+def outcome_fingerprint(
+    rules: Rules = DEFAULT_RULES, max_turns: int = MAX_TURNS
+) -> str:
+    """
+    Fingerprints the settings of a game besides the constants and its seed.
+
+    Args:
+        rules (Rules): Board and deck composition.
+        max_turns (int): Turn limit after which a game ends without a winner.
+
+    Returns:
+        str: Hash of the rules and the turn limit.
+    """
+    return _digest({"rules": rules._asdict(), "max_turns": max_turns})
+
+
+class OutcomeCache:
+    """
+    On-disk memo of the outcomes of random-policy games, keyed by seed.
+
+    With the default random resolution, a game depends only on its seed, the constants, the
+    rules and the turn limit. Outcomes live in a ResultsStore at
+    `<root>/<constants fingerprint>/<rules and turn limit fingerprint>`, so changing any
+    constant or bumping CACHE_VERSION makes every stored outcome unreachable; prune deletes
+    them. Games of other policies are not deterministic per seed and cannot be cached.
+
+    Only one process should fill a cache at a time, like a ResultsStore.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        rules: Rules = DEFAULT_RULES,
+        max_turns: int = MAX_TURNS,
+    ) -> None:
+        """
+        Opens the cache of one game setting, creating it if needed.
+
+        Args:
+            root (Path): Directory shared by the caches of every setting.
+            rules (Rules): Board and deck composition.
+            max_turns (int): Turn limit after which a game ends without a winner.
+        """
+        self.root = root
+        self.rules = rules
+        self.max_turns = max_turns
+
+        self.constants = constants_fingerprint()
+        self.path = root / self.constants / outcome_fingerprint(rules, max_turns)
+        self.store = ResultsStore(self.path)
+
+        metadata = self.path / _METADATA
+
+        if not metadata.exists():
+            description = {
+                "version": CACHE_VERSION,
+                "rules": rules._asdict(),
+                "max_turns": max_turns,
+            }
+            metadata.write_text(json.dumps(description), encoding="utf-8")
+
+    def __len__(self) -> int:
+        """
+        Returns the number of cached games.
+
+        Returns:
+            int: Number of games.
+        """
+        return len(self.store)
+
+    def outcomes(
+        self,
+        seeds: Iterable[int],
+        workers: int | None = None,
+        backend: str = PROCESS,
+        chunksize: int = 64,
+    ) -> Chunk:
+        """
+        Returns the outcomes of some seeds, playing and caching only the missing ones.
+
+        Cached seeds are found with one sorted search per stored chunk, memory-mapped, so known
+        seed ranges come back without playing a single turn.
+
+        Args:
+            seeds (Iterable[int]): Seeds of the games. A seed may repeat.
+            workers (int | None): Number of workers playing the missing games. If 1, plays them in the current thread. If None, uses every CPU.
+            backend (str): Kind of workers, see project.simulation.backends.
+            chunksize (int): Number of missing seeds sent to a worker at once.
+
+        Returns:
+            Chunk: Every column of RESULT_COLUMNS, one row per seed in the given order.
+        """
+        seeds = np.fromiter(seeds, dtype=np.int64)
+        found = np.zeros(len(seeds), dtype=np.bool_)
+
+        columns = {
+            name: np.empty((len(seeds), *shape), dtype=dtype)
+            for name, (dtype, shape) in RESULT_COLUMNS.items()
+        }
+
+        for chunk in self.store.chunks():
+            stored = np.asarray(chunk["seed"])
+            order = np.argsort(stored, kind="stable")
+            positions = np.searchsorted(stored, seeds, sorter=order)
+            rows = order[np.minimum(positions, len(stored) - 1)]
+            hits = ~found & (stored[rows] == seeds)
+
+            for name, column in columns.items():
+                column[hits] = chunk[name][rows[hits]]
+
+            found |= hits
+
+        missing = np.unique(seeds[~found])
+
+        if len(missing):
+            play = partial(play_result, max_turns=self.max_turns, rules=self.rules)
+
+            if workers == 1:
+                results = list(map(play, missing.tolist()))
+            else:
+                with create_executor(backend, workers) as executor:
+                    results = list(
+                        executor.map(play, missing.tolist(), chunksize=chunksize)
+                    )
+
+            self.store.extend(results)
+            self.store.flush()
+
+            rows = np.searchsorted(missing, seeds[~found])
+
+            for name, column in columns.items():
+                dtype, _ = RESULT_COLUMNS[name]
+                played = np.array([getattr(result, name) for result in results], dtype)
+                column[~found] = played[rows]
+
+        logger.info(
+            "Outcomes looked up",
+            seeds=len(seeds),
+            cached=int(found.sum()),
+            played=len(missing),
+        )
+
+        return columns
+
+    def prune(self) -> int:
+        """
+        Deletes the outcomes cached under other constants or cache versions.
+
+        Returns:
+            int: Number of deleted settings directories.
+        """
+        removed = 0
+
+        for directory in self.root.iterdir():
+            if directory.name == self.constants or not directory.is_dir():
+                continue
+
+            removed += sum(1 for path in directory.iterdir() if path.is_dir())
+            shutil.rmtree(directory)
+
+            logger.info("Stale outcome cache deleted", path=str(directory))
+
+        return removed
@@ -0,0 +1,379 @@
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import NamedTuple, Self
+
+import numpy as np
+import structlog
+from numpy.typing import ArrayLike
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.queue import ACTION_NAMES
+from project.game.table import MASK_DTYPE
+
+logger = structlog.get_logger(__name__)
+
+# Column name, dtype and per-transition shape of every stored column
+TRANSITION_COLUMNS: dict[str, tuple[type, tuple[int, ...]]] = {
+    "conditions": (MASK_DTYPE, (NUMBER_OF_PLAYERS,)),
+    "states": (MASK_DTYPE, (NUMBER_OF_PLAYERS,)),
+    "position": (np.uint8, ()),
+    "deck": (np.uint8, (len(ACTION_NAMES),)),
+    "seat": (np.uint8, ()),
+    "kind": (np.int8, ()),
+    "legal": (MASK_DTYPE, ()),
+    "action": (MASK_DTYPE, ()),
+    "reward": (np.float32, ()),
+    "next_states": (MASK_DTYPE, (NUMBER_OF_PLAYERS,)),
+    "next_position": (np.uint8, ()),
+    "done": (np.bool_, ()),
+}
+
+# Default priority exponent: 0 samples uniformly, 1 fully proportionally
+PRIORITY_ALPHA: float = 0.6
+
+# Added to every priority so that no transition becomes impossible to sample
+PRIORITY_EPSILON: float = 1e-6
+
+_METADATA = "buffer.json"
+_TREE = "priorities.npy"
+
+
+class SumTree:
+    """
+    Binary tree of priorities in one flat array, every node holding the sum of its children.
+
+    Node 1 is the root and the children of node i are 2i and 2i + 1; leaf j sits at node
+    `leaves + j`. Updates and searches are vectorized over batches and walk the tree level by
+    level, so both cost O(batch * log(capacity)) with one NumPy call per level. Parents are
+    recomputed from their children rather than adjusted by deltas, so sums never drift.
+    """
+
+    def __init__(self, capacity: int, nodes: np.ndarray | None = None) -> None:
+        """
+        Initializes a tree with zero priorities, or over existing nodes.
+
+        Args:
+            capacity (int): Number of leaves in use.
+            nodes (np.ndarray | None): Float64 array of tree_size(capacity) nodes to use as storage, e.g. a memory map. If None, one is allocated.
+        """
+        self.capacity = capacity
+        self.leaves = 1 << max(capacity - 1, 0).bit_length()
+        self.depth = self.leaves.bit_length() - 1
+
+        if nodes is None:
+            nodes = np.zeros(self.tree_size(capacity), dtype=np.float64)
+
+        self.nodes = nodes
+
+    @staticmethod
+    def tree_size(capacity: int) -> int:
+        """
+        Number of nodes of the tree of a capacity.
+
+        Args:
+            capacity (int): Number of leaves in use.
+
+        Returns:
+            int: Length of the node array.
+        """
+        return 2 << max(capacity - 1, 0).bit_length()
+
+    @property
+    def total(self) -> float:
+        """
+        Sum of every priority.
+
+        Returns:
+            float: Value of the root.
+        """
+        return float(self.nodes[1])
+
+    def __getitem__(self, indices: ArrayLike) -> np.ndarray:
+        """
+        Reads priorities.
+
+        Args:
+            indices (ArrayLike): Leaf indices.
+
+        Returns:
+            np.ndarray: Priority of each leaf.
+        """
+        return self.nodes[self.leaves + np.asarray(indices)]
+
+    def update(self, indices: ArrayLike, priorities: ArrayLike) -> None:
+        """
+        Sets priorities and recomputes the sums above them.
+
+        Args:
+            indices (ArrayLike): Leaf indices. If an index repeats, its last priority is kept.
+            priorities (ArrayLike): New priority of each leaf.
+        """
+        nodes = self.leaves + np.asarray(indices, dtype=np.int64)
+        self.nodes[nodes] = priorities
+
+        for _ in range(self.depth):
+            nodes = np.unique(nodes >> 1)
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """
+        Finds the leaves whose cumulative priority range contains each value.
+
+        Args:
+            values (np.ndarray): Values between 0 and the total priority.
+
+        Returns:
+            np.ndarray: Leaf index of each value.
+        """
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+
+        for _ in range(self.depth):
+            left = self.nodes[2 * nodes]
+            right = values >= left
+            values -= left * right
+            nodes = 2 * nodes + right
+
+        # Rounding can walk past the last leaf in use
+        return np.minimum(nodes - self.leaves, self.capacity - 1)
+
+
+class ReplaySample(NamedTuple):
+    """
+    Batch of transitions drawn from a replay buffer.
+
+    Attributes:
+        indices: np.ndarray - Slot of each transition, to update its priority after learning.
+        weights: np.ndarray - Importance-sampling weight of each transition, at most 1.
+        columns: dict[str, np.ndarray] - Values of every column for each transition.
+    """
+
+    indices: np.ndarray
+    weights: np.ndarray
+    columns: dict[str, np.ndarray]
+
+
+class PrioritizedReplayBuffer:
+    """
+    Fixed-capacity buffer of transitions sampled proportionally to their priority.
+
+    Transitions are stored column by column in preallocated arrays, written as a ring: once
+    full, new transitions overwrite the oldest ones. A SumTree over the priorities (raised to
+    `alpha`) gives proportional sampling in O(log capacity) per transition. New transitions
+    get the highest priority seen so far unless given one, so each is sampled at least once
+    with high probability.
+
+    With a path, every column and the tree are .npy memory maps in that directory, so the
+    buffer can exceed RAM and be reopened later; call flush to persist the write position.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        columns: Mapping[str, tuple[type, tuple[int, ...]]] = TRANSITION_COLUMNS,
+        alpha: float = PRIORITY_ALPHA,
+        epsilon: float = PRIORITY_EPSILON,
+        path: Path | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Allocates the buffer, or reopens the one stored at a path.
+
+        Args:
+            capacity (int): Maximum number of transitions.
+            columns (Mapping[str, tuple[type, tuple[int, ...]]]): Dtype and per-transition shape of every column.
+            alpha (float): Priority exponent.
+            epsilon (float): Added to every priority before the exponent.
+            path (Path | None): Directory of the memory maps. If None, the buffer lives in RAM.
+            seed (int | None): Seed of the sampling RNG.
+        """
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, but got {capacity}")
+
+        self.capacity = capacity
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.path = path
+        self.rng = np.random.default_rng(seed)
+
+        self.cursor = 0
+        self.size = 0
+        self.max_priority = 1.0
+
+        if path is None:
+            self.columns = {
+                name: np.zeros((capacity, *shape), dtype=dtype)
+                for name, (dtype, shape) in columns.items()
+            }
+            self.tree = SumTree(capacity)
+            return
+
+        path.mkdir(parents=True, exist_ok=True)
+        reopen = (path / _METADATA).exists()
+        mode = "r+" if reopen else "w+"
+
+        self.columns = {
+            name: np.lib.format.open_memmap(
+                path / f"{name}.npy", mode=mode, dtype=dtype, shape=(capacity, *shape)
+            )
+            for name, (dtype, shape) in columns.items()
+        }
+        self.tree = SumTree(
+            capacity,
+            np.lib.format.open_memmap(
+                path / _TREE,
+                mode=mode,
+                dtype=np.float64,
+                shape=(SumTree.tree_size(capacity),),
+            ),
+        )
+
+        if reopen:
+            metadata = json.loads((path / _METADATA).read_text(encoding="utf-8"))
+            self.cursor = metadata["cursor"]
+            self.size = metadata["size"]
+            self.max_priority = metadata["max_priority"]
+        else:
+            self.flush()
+
+        logger.info(
+            "Replay buffer opened", path=str(path), capacity=capacity, size=self.size
+        )
+
+    def __len__(self) -> int:
+        """
+        Number of stored transitions.
+
+        Returns:
+            int: Number of transitions.
+        """
+        return self.size
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.flush()
+
+    def add(
+        self,
+        transitions: Mapping[str, ArrayLike],
+        priorities: ArrayLike | None = None,
+    ) -> np.ndarray:
+        """
+        Appends a batch of transitions, overwriting the oldest ones once full.
+
+        Args:
+            transitions (Mapping[str, ArrayLike]): Values of every column, with the batch along the first axis.
+            priorities (ArrayLike | None): Raw priority of each transition. If None, the highest priority seen so far.
+
+        Returns:
+            np.ndarray: Slot of each transition kept.
+        """
+        count = len(next(iter(transitions.values())))
+
+        if transitions.keys() != self.columns.keys():
+            raise ValueError(
+                f"Expected columns {sorted(self.columns)}, but got {sorted(transitions)}"
+            )
+
+        # Only the last `capacity` transitions of an oversized batch survive
+        keep = slice(max(count - self.capacity, 0), count)
+        kept = keep.stop - keep.start
+
+        slots = (self.cursor + np.arange(kept)) % self.capacity
+
+        for name, values in transitions.items():
+            self.columns[name][slots] = np.asarray(values)[keep]
+
+        if priorities is None:
+            leaf_priorities = np.full(kept, self.max_priority**self.alpha)
+        else:
+            raw = np.asarray(priorities, dtype=np.float64)[keep]
+            leaf_priorities = self.scale(raw)
+
+        self.tree.update(slots, leaf_priorities)
+
+        self.cursor = (self.cursor + kept) % self.capacity
+        self.size = min(self.size + kept, self.capacity)
+
+        return slots
+
+    def scale(self, priorities: np.ndarray) -> np.ndarray:
+        """
+        Turns raw priorities into leaf priorities, tracking the highest one.
+
+        Args:
+            priorities (np.ndarray): Raw priorities, e.g. absolute TD errors.
+
+        Returns:
+            np.ndarray: (priority + epsilon) ** alpha.
+        """
+        if len(priorities):
+            self.max_priority = max(self.max_priority, float(priorities.max()))
+
+        return (priorities + self.epsilon) ** self.alpha
+
+    def sample(self, batch_size: int, beta: float = 0.4) -> ReplaySample:
+        """
+        Draws transitions proportionally to their priority.
+
+        The total priority is split into `batch_size` equal segments with one draw in each,
+        which lowers the variance of the batch compared to independent draws.
+
+        Args:
+            batch_size (int): Number of transitions to draw.
+            beta (float): Importance-sampling exponent, 1 fully corrects the sampling bias.
+
+        Returns:
+            ReplaySample: Slots, importance weights and values of the drawn transitions.
+        """
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+
+        total = self.tree.total
+        segment = total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        indices = self.tree.find(values)
+
+        probabilities = self.tree[indices] / total
+        weights = (self.size * probabilities) ** -beta
+        weights /= weights.max()
+
+        return ReplaySample(
+            indices=indices,
+            weights=weights.astype(np.float32),
+            columns={name: column[indices] for name, column in self.columns.items()},
+        )
+
+    def update_priorities(self, indices: ArrayLike, priorities: ArrayLike) -> None:
+        """
+        Sets new raw priorities, typically the absolute TD errors of a learning step.
+
+        Args:
+            indices (ArrayLike): Slots returned by sample.
+            priorities (ArrayLike): New raw priority of each slot.
+        """
+        self.tree.update(indices, self.scale(np.asarray(priorities, dtype=np.float64)))
+
+    def flush(self) -> None:
+        """
+        Writes the memory maps and the write position to disk. Does nothing in RAM.
+        """
+        if self.path is None:
+            return
+
+        for column in self.columns.values():
+            column.flush()
+
+        self.tree.nodes.flush()
+
+        metadata = {
+            "cursor": self.cursor,
+            "size": self.size,
+            "max_priority": self.max_priority,
+        }
+        temporary = self.path / f".{_METADATA}.tmp"
+        temporary.write_text(json.dumps(metadata), encoding="utf-8")
+        temporary.replace(self.path / _METADATA)
@@ -0,0 +1,534 @@
+from collections.abc import Callable, Iterable
+from contextlib import ExitStack
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import structlog
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.engine import GameEngine
+from project.game.events import CardDrawn, EventBus, TileLanded
+from project.game.policy import RandomPolicy
+from project.game.queue import ACTION_INDEX
+from project.game.rules import DEFAULT_RULES, Rules
+from project.simulation.backends import PROCESS, create_executor
+from project.simulation.results import NO_WINNER
+from project.simulation.tournament import MAX_TURNS, PolicyFactory
+from project.simulation.worker import create_engine
+
+logger = structlog.get_logger(__name__)
+
+# Columns of a trace row, one row per turn
+TRACE_FIELDS: tuple[str, ...] = (
+    "movement",
+    "position",
+    "tile",
+    "card",
+    *(f"state{index}" for index in range(NUMBER_OF_PLAYERS)),
+)
+
+# Card value of turns that drew no card
+NO_CARD: int = -1
+
+# Value of every field of the turns a candidate engine skipped without events
+SKIPPED: int = -2
+
+# Every field fits in 16 bits: dice totals, board positions, codes and ingredient masks
+TRACE_DTYPE = np.int16
+
+# Number of turns shown before and after a divergence
+CONTEXT_TURNS: int = 3
+
+# Builds an engine from the GameEngine keyword arguments
+EngineFactory = Callable[..., GameEngine]
+
+
+class GoldenTrace(NamedTuple):
+    """
+    Compact turn-by-turn record of one game.
+
+    Attributes:
+        seed: int - Seed of the game.
+        turns: np.ndarray - One row per turn, with the columns of TRACE_FIELDS. Turns skipped by the engine hold SKIPPED.
+        winner: int - Winning agent ID, or NO_WINNER if the game hit the turn limit.
+    """
+
+    seed: int
+    turns: np.ndarray
+    winner: int
+
+
+class GoldenTraces(NamedTuple):
+    """
+    Golden traces of many games played with the same settings.
+
+    Attributes:
+        rules: Rules - Board and deck composition of the games.
+        max_turns: int - Turn limit of the games.
+        traces: list[GoldenTrace] - One trace per game.
+    """
+
+    rules: Rules
+    max_turns: int
+    traces: list[GoldenTrace]
+
+
+class Divergence(NamedTuple):
+    """
+    First difference between the trace of a candidate engine and the golden trace.
+
+    Attributes:
+        seed: int - Seed of the game.
+        turn: int - Turn at which the traces differ.
+        field: str - First differing field of TRACE_FIELDS, or "turns" or "winner".
+        expected: int - Value in the golden trace.
+        actual: int - Value in the candidate trace.
+        first_turn: int - Turn of the first context row.
+        expected_context: np.ndarray - Golden rows around the divergence.
+        actual_context: np.ndarray - Candidate rows around the divergence.
+    """
+
+    seed: int
+    turn: int
+    field: str
+    expected: int
+    actual: int
+    first_turn: int
+    expected_context: np.ndarray
+    actual_context: np.ndarray
+
+
+class TraceRecorder:
+    """
+    Event handler collecting the dice, tile and card of every played turn.
+
+    Turns an engine skips publish no event, so they are recorded as SKIPPED rows.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty trace.
+        """
+        self.rows: list[tuple[int, ...]] = []
+        self.landing: TileLanded | None = None
+        self.card = NO_CARD
+
+    def __call__(self, event: TileLanded | CardDrawn) -> None:
+        """
+        Remembers the landing or the card of the current turn.
+
+        Args:
+            event (TileLanded | CardDrawn): Event of the current turn.
+        """
+        if isinstance(event, TileLanded):
+            self.landing = event
+        else:
+            self.card = ACTION_INDEX[event.action]
+
+    def end_turn(self, engine: GameEngine) -> None:
+        """
+        Appends the rows of the turns just skipped and of the turn just played, if any.
+
+        Args:
+            engine (GameEngine): Engine right after `advance`.
+        """
+        landing = self.landing
+
+        if landing is not None:
+            self.skip_to(landing.turn)
+
+            self.rows.append(
+                (
+                    landing.movement,
+                    landing.position,
+                    int(engine.board_codes[landing.position]),
+                    self.card,
+                    *(int(state) for state in engine.table.states),
+                )
+            )
+
+        # Turns skipped up to the turn limit, without a turn played after them
+        self.skip_to(engine.turn_count)
+
+        self.landing = None
+        self.card = NO_CARD
+
+    def skip_to(self, turn: int) -> None:
+        """
+        Appends SKIPPED rows until the trace reaches a turn.
+
+        Args:
+            turn (int): Number of rows the trace must have.
+        """
+        skipped = (SKIPPED,) * len(TRACE_FIELDS)
+
+        while len(self.rows) < turn:
+            self.rows.append(skipped)
+
+
+def record_trace(
+    seed: int,
+    engine: EngineFactory = GameEngine,
+    policy: PolicyFactory = RandomPolicy,
+    max_turns: int = MAX_TURNS,
+    rules: Rules = DEFAULT_RULES,
+) -> GoldenTrace:
+    """
+    Plays one game and records its trace.
+
+    The game is played through `advance`, so candidate engines are checked on the code path
+    they are used with, and observed only through their events and state after each call.
+    Turns an engine skips are recorded as SKIPPED rows.
+
+    Args:
+        seed (int): Seed of the game.
+        engine (EngineFactory): Builds the engine, the reference GameEngine by default.
+        policy (PolicyFactory): Builds the policy of every seat.
+        max_turns (int): Turn limit after which the game ends without a winner.
+        rules (Rules): Board and deck composition.
+
+    Returns:
+        GoldenTrace: Trace of the game.
+    """
+    recorder = TraceRecorder()
+    events = EventBus()
+    events.subscribe(recorder, TileLanded, CardDrawn)
+
+    game = create_engine(
+        seed,
+        [policy() for _ in range(NUMBER_OF_PLAYERS)],
+        engine=engine,
+        events=events,
+        rules=rules,
+    )
+
+    winner_id = None
+
+    while winner_id is None and game.turn_count < max_turns:
+        winner_id = game.advance(max_turns)
+        recorder.end_turn(game)
+
+    turns = np.array(recorder.rows, dtype=TRACE_DTYPE).reshape(-1, len(TRACE_FIELDS))
+
+    return GoldenTrace(
+        seed=seed,
+        turns=turns,
+        winner=NO_WINNER if winner_id is None else winner_id,
+    )
+
+
+def compare_traces(
+    expected: GoldenTrace, actual: GoldenTrace, context: int = CONTEXT_TURNS
+) -> Divergence | None:
+    """
+    Finds the first difference between two traces of the same game.
+
+    Rows the candidate skipped only need to exist: the state of a skipped turn is checked by
+    the next played turn, whose position and states follow from it.
+
+    Args:
+        expected (GoldenTrace): Golden trace.
+        actual (GoldenTrace): Trace of the candidate engine.
+        context (int): Number of turns kept before and after the divergence.
+
+    Returns:
+        Divergence | None: The first difference, or None if the traces are identical.
+    """
+    common = min(len(expected.turns), len(actual.turns))
+    different = expected.turns[:common] != actual.turns[:common]
+    different[(actual.turns[:common] == SKIPPED).all(axis=1)] = False
+    rows = np.flatnonzero(different.any(axis=1))
+
+    if len(rows):
+        turn = int(rows[0])
+        column = int(np.argmax(different[turn]))
+        field = TRACE_FIELDS[column]
+        expected_value = int(expected.turns[turn, column])
+        actual_value = int(actual.turns[turn, column])
+    elif len(expected.turns) != len(actual.turns):
+        turn = common
+        field = "turns"
+        expected_value = len(expected.turns)
+        actual_value = len(actual.turns)
+    elif expected.winner != actual.winner:
+        turn = common - 1
+        field = "winner"
+        expected_value = expected.winner
+        actual_value = actual.winner
+    else:
+        return None
+
+    first_turn = max(turn - context, 0)
+    last_turn = turn + context + 1
+
+    return Divergence(
+        seed=expected.seed,
+        turn=turn,
+        field=field,
+        expected=expected_value,
+        actual=actual_value,
+        first_turn=first_turn,
+        expected_context=expected.turns[first_turn:last_turn],
+        actual_context=actual.turns[first_turn:last_turn],
+    )
+
+
+def describe_divergence(divergence: Divergence) -> str:
+    """
+    Formats a divergence with the golden and candidate rows around it.
+
+    Args:
+        divergence (Divergence): Divergence to describe.
+
+    Returns:
+        str: Multi-line human-readable description.
+    """
+    lines = [
+        (
+            f"Seed {divergence.seed} diverged at turn {divergence.turn}:"
+            f" {divergence.field} expected {divergence.expected}, got {divergence.actual}"
+        ),
+        f"{'':>10} {'turn':>5} " + " ".join(f"{name:>8}" for name in TRACE_FIELDS),
+    ]
+
+    for label, rows in (
+        ("expected", divergence.expected_context),
+        ("actual", divergence.actual_context),
+    ):
+        for offset, row in enumerate(rows):
+            turn = divergence.first_turn + offset
+            marker = ">" if turn == divergence.turn else " "
+            values = " ".join(f"{value:>8}" for value in row)
+            lines.append(f"{label:>9}{marker} {turn:>5} {values}")
+
+    return "\n".join(lines)
+
+
+def check_trace(
+    trace: GoldenTrace,
+    engine: EngineFactory,
+    policy: PolicyFactory = RandomPolicy,
+    max_turns: int = MAX_TURNS,
+    rules: Rules = DEFAULT_RULES,
+    context: int = CONTEXT_TURNS,
+) -> Divergence | None:
+    """
+    Replays the seed of a golden trace through a candidate engine.
+
+    Args:
+        trace (GoldenTrace): Golden trace.
+        engine (EngineFactory): Builds the candidate engine.
+        policy (PolicyFactory): Builds the policy of every seat, the one used for the golden trace.
+        max_turns (int): Turn limit of the golden trace.
+        rules (Rules): Board and deck composition of the golden trace.
+        context (int): Number of turns kept before and after a divergence.
+
+    Returns:
+        Divergence | None: The first difference, or None if the candidate played the same game.
+    """
+    actual = record_trace(trace.seed, engine, policy, max_turns, rules)
+
+    return compare_traces(trace, actual, context)
+
+
+def check_seed(
+    seed: int,
+    engine: EngineFactory,
+    policy: PolicyFactory = RandomPolicy,
+    max_turns: int = MAX_TURNS,
+    rules: Rules = DEFAULT_RULES,
+    context: int = CONTEXT_TURNS,
+) -> Divergence | None:
+    """
+    Plays a seed through the reference and the candidate engine and compares the traces.
+
+    Args:
+        seed (int): Seed of the game.
+        engine (EngineFactory): Builds the candidate engine.
+        policy (PolicyFactory): Builds the policy of every seat.
+        max_turns (int): Turn limit after which a game ends without a winner.
+        rules (Rules): Board and deck composition.
+        context (int): Number of turns kept before and after a divergence.
+
+    Returns:
+        Divergence | None: The first difference, or None if both engines played the same game.
+    """
+    expected = record_trace(seed, GameEngine, policy, max_turns, rules)
+
+    return check_trace(expected, engine, policy, max_turns, rules, context)
+
+
+def check_engine(
+    engine: EngineFactory,
+    games: Iterable[int] | GoldenTraces,
+    policy: PolicyFactory = RandomPolicy,
+    max_turns: int = MAX_TURNS,
+    rules: Rules = DEFAULT_RULES,
+    workers: int | None = None,
+    backend: str = PROCESS,
+    chunksize: int = 256,
+    max_divergences: int = 10,
+) -> list[Divergence]:
+    """
+    Checks that a candidate engine plays exactly like the reference engine over many games.
+
+    Games are either seeds, played through both engines, or stored golden traces, in which case
+    their rules and turn limit replace the given ones.
+
+    Args:
+        engine (EngineFactory): Builds the candidate engine.
+        games (Iterable[int] | GoldenTraces): Seeds to check, or golden traces to check against.
+        policy (PolicyFactory): Builds the policy of every seat.
+        max_turns (int): Turn limit after which a game ends without a winner.
+        rules (Rules): Board and deck composition.
+        workers (int | None): Number of workers. If 1, runs in the current thread. If None, uses every CPU.
+        backend (str): Kind of workers, see project.simulation.backends.
+        chunksize (int): Number of games sent to a worker at once.
+        max_divergences (int): Number of divergences after which checking stops.
+
+    Returns:
+        list[Divergence]: Divergent games, in game order.
+    """
+    if isinstance(games, GoldenTraces):
+        rules, max_turns, games = games
+        check = check_trace
+    else:
+        check = check_seed
+
+    check = partial(
+        check, engine=engine, policy=policy, max_turns=max_turns, rules=rules
+    )
+
+    logger.info("Starting differential check", workers=workers, max_turns=max_turns)
+
+    with ExitStack() as stack:
+        if workers == 1:
+            results = map(check, games)
+        else:
+            executor = stack.enter_context(create_executor(backend, workers))
+            results = executor.map(check, games, chunksize=chunksize)
+
+        divergences = []
+        checked = 0
+
+        for divergence in results:
+            checked += 1
+
+            if divergence is None:
+                continue
+
+            divergences.append(divergence)
+
+            logger.warning(
+                "Engine diverged",
+                seed=divergence.seed,
+                turn=divergence.turn,
+                field=divergence.field,
+                expected=divergence.expected,
+                actual=divergence.actual,
+            )
+
+            if len(divergences) >= max_divergences:
+                if workers != 1:
+                    executor.shutdown(cancel_futures=True)
+                break
+
+    logger.info(
+        "Differential check completed", games=checked, divergences=len(divergences)
+    )
+
+    return divergences
+
+
+def save_traces(traces: GoldenTraces, path: Path) -> None:
+    """
+    Writes golden traces as one compressed .npz file.
+
+    The rows of every game are concatenated, with the offset of each game's first row.
+
+    Args:
+        traces (GoldenTraces): Traces to write.
+        path (Path): Destination file.
+    """
+    lengths = [len(trace.turns) for trace in traces.traces]
+
+    np.savez_compressed(
+        path,
+        rules=np.array(traces.rules, dtype=np.int64),
+        max_turns=np.array(traces.max_turns, dtype=np.int64),
+        seeds=np.array([trace.seed for trace in traces.traces], dtype=np.int64),
+        winners=np.array([trace.winner for trace in traces.traces], dtype=np.int8),
+        offsets=np.cumsum([0, *lengths], dtype=np.int64),
+        turns=(
+            np.concatenate([trace.turns for trace in traces.traces])
+            if traces.traces
+            else np.empty((0, len(TRACE_FIELDS)), dtype=TRACE_DTYPE)
+        ),
+    )
+
+
+def load_traces(path: Path) -> GoldenTraces:
+    """
+    Reads golden traces written by save_traces.
+
+    Args:
+        path (Path): File to read.
+
+    Returns:
+        GoldenTraces: The stored traces.
+    """
+    with np.load(path) as data:
+        offsets = data["offsets"]
+        turns = data["turns"]
+
+        traces = [
+            GoldenTrace(int(seed), turns[start:end], int(winner))
+            for seed, winner, start, end in zip(
+                data["seeds"], data["winners"], offsets[:-1], offsets[1:]
+            )
+        ]
+
+        return GoldenTraces(
+            rules=Rules(*(int(value) for value in data["rules"])),
+            max_turns=int(data["max_turns"]),
+            traces=traces,
+        )
+
+
+def record_traces(
+    seeds: Iterable[int],
+    policy: PolicyFactory = RandomPolicy,
+    max_turns: int = MAX_TURNS,
+    rules: Rules = DEFAULT_RULES,
+    workers: int | None = None,
+    backend: str = PROCESS,
+    chunksize: int = 256,
+) -> GoldenTraces:
+    """
+    Records the golden traces of many games with the reference engine.
+
+    Args:
+        seeds (Iterable[int]): Seeds to record.
+        policy (PolicyFactory): Builds the policy of every seat.
+        max_turns (int): Turn limit after which a game ends without a winner.
+        rules (Rules): Board and deck composition.
+        workers (int | None): Number of workers. If 1, runs in the current thread. If None, uses every CPU.
+        backend (str): Kind of workers, see project.simulation.backends.
+        chunksize (int): Number of games sent to a worker at once.
+
+    Returns:
+        GoldenTraces: One trace per seed, in seed order.
+    """
+    record = partial(record_trace, policy=policy, max_turns=max_turns, rules=rules)
+
+    if workers == 1:
+        traces = list(map(record, seeds))
+    else:
+        with create_executor(backend, workers) as executor:
+            traces = list(executor.map(record, seeds, chunksize=chunksize))
+
+    logger.info("Golden traces recorded", games=len(traces))
+
+    return GoldenTraces(rules, max_turns, traces)
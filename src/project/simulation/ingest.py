@@ -0,0 +1,661 @@
+import gzip
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any, NamedTuple, Self
+
+import numpy as np
+import structlog
+
+from project.game.board import encode_board
+from project.game.constants import (
+    CHOOSE_ANY_INGREDIENT_TILE_NAME,
+    INGREDIENT_PREFIX,
+    LOSE_ALL_INGREDIENTS_TILE_NAME,
+    NUMBER_OF_INGREDIENTS,
+    NUMBER_OF_PLAYERS,
+    QUEUED_RANDOM_ACTION_TILE_NAME,
+)
+from project.game.policy import DECISION_KINDS
+from project.game.queue import ACTION_INDEX, ACTION_NAMES
+from project.game.solver import (
+    DRAW,
+    GAIN,
+    LOSE_ALL,
+    EndgameSolver,
+    parse_action,
+    parse_tile,
+)
+from project.game.table import MASK_DTYPE
+from project.simulation.results import NO_WINNER
+
+logger = structlog.get_logger(__name__)
+
+# Columns of a trajectory row, one row per turn
+TRAJECTORY_FIELDS: tuple[str, ...] = (
+    "agent",
+    "movement",
+    "position",
+    "tile",
+    "card",
+    *(f"state{index}" for index in range(NUMBER_OF_PLAYERS)),
+)
+
+# Card value of turns that drew no card
+NO_CARD: int = -1
+
+# Seed value of games logged without a bound seed
+NO_SEED: int = -1
+
+# Every field fits in 16 bits: seats, dice totals, board positions, codes and ingredient masks
+TRAJECTORY_DTYPE = np.int16
+
+# Default number of games per chunk
+CHUNK_SIZE: int = 4096
+
+# Default number of lines without news after which a game in progress is considered over
+STALE_LINES: int = 100_000
+
+# First bytes of a gzip stream
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Log line fields identifying the game stream a line belongs to
+_STREAM_KEYS: tuple[str, ...] = ("seed", "worker", "node")
+
+# Every tile name, in the order of their codes, see project.game.board.encode_board
+_TILE_NAMES: list[str] = [
+    *(f"{INGREDIENT_PREFIX}{i}" for i in range(NUMBER_OF_INGREDIENTS)),
+    CHOOSE_ANY_INGREDIENT_TILE_NAME,
+    QUEUED_RANDOM_ACTION_TILE_NAME,
+    LOSE_ALL_INGREDIENTS_TILE_NAME,
+]
+
+# Tile code of every tile name
+_TILE_CODES: dict[str, int] = dict(zip(_TILE_NAMES, encode_board(_TILE_NAMES).tolist()))
+
+
+class Trajectory(NamedTuple):
+    """
+    Turn-by-turn record of one game rebuilt from its log lines.
+
+    Attributes:
+        seed: int - Seed of the game, or NO_SEED if the log lines were not bound to one.
+        winner: int - Winning agent ID, or NO_WINNER if the log ended before a win.
+        conditions: tuple[int, ...] - Winning condition of each agent.
+        turns: np.ndarray - One row per turn, with the columns of TRAJECTORY_FIELDS. States are after the turn.
+    """
+
+    seed: int
+    winner: int
+    conditions: tuple[int, ...]
+    turns: np.ndarray
+
+
+class IngestStats(NamedTuple):
+    """
+    Counts of a log ingestion.
+
+    Attributes:
+        lines: int - Lines read.
+        skipped: int - Lines that were not JSON objects, e.g. console-format lines.
+        games: int - Complete games written.
+        incomplete: int - Games dropped because lines were missing, e.g. rate-limited or rotated away.
+    """
+
+    lines: int
+    skipped: int
+    games: int
+    incomplete: int
+
+
+def _mask(ingredients: list[int]) -> int:
+    """
+    Converts the ingredient list of a log line back to a bitmask.
+
+    Args:
+        ingredients (list[int]): Ingredient indices.
+
+    Returns:
+        int: Bitmask of the ingredients.
+    """
+    mask = 0
+
+    for ingredient in ingredients:
+        mask |= 1 << ingredient
+
+    return mask
+
+
+def open_log(path: Path) -> IO[str]:
+    """
+    Opens a log file for reading, decompressing it on the fly if it is gzip-compressed.
+
+    Compression is detected from the content, so rotated files keep working whatever their name.
+
+    Args:
+        path (Path): Log file.
+
+    Returns:
+        IO[str]: Text stream of the log lines.
+    """
+    with path.open("rb") as file:
+        compressed = file.read(len(_GZIP_MAGIC)) == _GZIP_MAGIC
+
+    if compressed:
+        return gzip.open(path, "rt", encoding="utf-8")
+
+    return path.open("r", encoding="utf-8")
+
+
+class _GameBuilder:
+    """
+    Rebuilds the trajectory of one game from its log lines, in order.
+    """
+
+    def __init__(self, seed: int) -> None:
+        """
+        Starts an empty game, before its agents are created.
+
+        Args:
+            seed (int): Seed of the game, or NO_SEED.
+        """
+        self.seed = seed
+        self.conditions = [0] * NUMBER_OF_PLAYERS
+        self.states = [0] * NUMBER_OF_PLAYERS
+        self.rows: list[tuple[int, ...]] = []
+        self.winner = NO_WINNER
+
+        # Current turn, before it is appended to the rows
+        self.turn: int | None = None
+        self.agent = 0
+        self.start_states: tuple[int, ...] = ()
+        self.tile: str | None = None
+        self.landing: tuple[int, int, int] | None = None
+        self.card = NO_CARD
+        self.changed = 0
+        self.stolen = 0
+
+        self.complete = True
+
+        # Number of the last line of the game, to end games that stopped logging
+        self.last_line = 0
+
+    def expected_change(self) -> int:
+        """
+        Computes how many ingredients the current turn must have moved, following GameEngine.
+
+        Returns:
+            int: Number of ingredients gained, lost or stolen, or -1 if the card line is missing or unexpected.
+        """
+        agent = self.agent
+        states = self.start_states
+        condition = self.conditions[agent]
+
+        kind, argument = parse_tile(self.tile)
+
+        if kind == DRAW:
+            if self.card == NO_CARD:
+                return -1
+
+            kind, argument = parse_action(ACTION_NAMES[self.card])
+        elif self.card != NO_CARD:
+            return -1
+
+        if kind == GAIN:
+            return int(argument & (condition ^ states[agent]) != 0)
+
+        if kind == LOSE_ALL:
+            return states[agent].bit_count()
+
+        if kind in DECISION_KINDS:
+            mask = EndgameSolver.legal_mask(kind, agent, states, condition)
+
+            return min(mask.bit_count(), argument)
+
+        return 0
+
+    def end_turn(self) -> None:
+        """
+        Appends the row of the current turn, if it was fully logged.
+
+        Every state change carries the full state of the agents involved, so a dropped line
+        only shows as a turn moving fewer ingredients than its tile or card must.
+        """
+        if self.turn is None:
+            return
+
+        changed = self.changed + self.stolen.bit_count()
+
+        if self.landing is None or changed != self.expected_change():
+            self.complete = False
+        else:
+            self.rows.append((self.agent, *self.landing, self.card, *self.states))
+
+        self.turn = None
+
+    def add(self, event: str, record: dict[str, Any]) -> bool:
+        """
+        Applies one log line.
+
+        Args:
+            event (str): Event name of the line.
+            record (dict[str, Any]): Parsed log line.
+
+        Returns:
+            bool: True once the game is won.
+        """
+        match event:
+            case "Agent created":
+                self.conditions[record["agent_id"]] = _mask(record["needs"])
+
+            case "Turn started":
+                expected = len(self.rows) + (self.turn is not None)
+
+                self.end_turn()
+
+                # Turns are numbered from 0: a gap means dropped lines
+                if record["turn"] != expected:
+                    self.complete = False
+
+                self.turn = record["turn"]
+                self.agent = record["agent_id"]
+                self.start_states = tuple(self.states)
+                self.tile = None
+                self.landing = None
+                self.card = NO_CARD
+                self.changed = 0
+                self.stolen = 0
+
+            case "Agent landed on tile":
+                self.tile = record["tile"]
+                self.landing = (
+                    record["movement"],
+                    record["position"],
+                    _TILE_CODES[record["tile"]],
+                )
+
+            case "Resolving action from card":
+                self.card = ACTION_INDEX[record["action"]]
+
+            case "Agent gained ingredients":
+                self.states[record["agent_id"]] = _mask(record["state"])
+                self.changed += len(record["gained"])
+
+            # Agents log a debug line of the same name, with bit strings and no ingredient lists
+            case "Agent lost ingredients" if "lost" in record:
+                self.states[record["agent_id"]] = _mask(record["state"])
+                self.changed += len(record["lost"])
+
+            case "Agent stole ingredients":
+                # The same ingredient can be taken from several agents at once
+                self.stolen |= _mask(record["stolen"])
+                self.states[record["thief_id"]] = _mask(record["thief_state"])
+                self.states[record["target_id"]] = _mask(record["target_state"])
+
+            case "Agent won":
+                self.end_turn()
+                self.winner = record["agent_id"]
+
+                return True
+
+        return False
+
+    def build(self) -> Trajectory | None:
+        """
+        Finishes the game.
+
+        Returns:
+            Trajectory | None: The trajectory, or None if lines of the game are missing.
+        """
+        self.end_turn()
+
+        if not self.complete or not self.rows or 0 in self.conditions:
+            return None
+
+        return Trajectory(
+            seed=self.seed,
+            winner=self.winner,
+            conditions=tuple(self.conditions),
+            turns=np.array(self.rows, dtype=TRAJECTORY_DTYPE),
+        )
+
+
+# Names of the log lines used to rebuild games
+_GAME_EVENTS: frozenset[str] = frozenset(
+    (
+        "Agent created",
+        "Turn started",
+        "Agent landed on tile",
+        "Resolving action from card",
+        "Agent gained ingredients",
+        "Agent lost ingredients",
+        "Agent stole ingredients",
+        "Agent won",
+    )
+)
+
+
+class TrajectoryParser:
+    """
+    Streaming converter of JSON log lines into game trajectories.
+
+    Lines are matched to games by their bound seed, worker and node, so the interleaved logs of
+    many workers sharing one file are separated. A game starts with its "Agent created" lines and
+    ends with "Agent won", when the next game of the same stream starts, or once it has logged
+    nothing for `stale_lines` lines (turn limit). Only the games in progress are held in memory,
+    whatever the size of the logs.
+
+    Games whose lines are not all present (rate-limited traces, sink overflows, logs starting or
+    rotated mid-game) cannot be rebuilt exactly and are counted as incomplete instead. Games
+    played with `play` log their narrative at INFO; simulated games (simulate, tournaments,
+    sweeps) only narrate the seeds sampled by the trace settings, see project.logging.sampling.
+    """
+
+    def __init__(self, stale_lines: int = STALE_LINES) -> None:
+        """
+        Initializes a parser without games in progress.
+
+        Args:
+            stale_lines (int): Number of lines without news after which a game is considered over.
+        """
+        if stale_lines < 1:
+            raise ValueError(f"Stale lines must be at least 1, but got {stale_lines}")
+
+        self.stale_lines = stale_lines
+        self.games: dict[tuple[Any, ...], _GameBuilder] = {}
+        self.lines = 0
+        self.skipped = 0
+        self.built = 0
+        self.incomplete = 0
+
+    def finish(self, key: tuple[Any, ...]) -> Trajectory | None:
+        """
+        Ends the game in progress of a stream.
+
+        Args:
+            key (tuple[Any, ...]): Stream of the game.
+
+        Returns:
+            Trajectory | None: Trajectory of the game, or None if it is incomplete.
+        """
+        trajectory = self.games.pop(key).build()
+
+        if trajectory is None:
+            self.incomplete += 1
+        else:
+            self.built += 1
+
+        return trajectory
+
+    def parse(self, lines: Iterable[str]) -> Iterator[Trajectory]:
+        """
+        Rebuilds games from log lines.
+
+        Games still in progress at the end of the lines are kept for the next call; close ends them.
+
+        Args:
+            lines (Iterable[str]): Log lines, in the order they were written.
+
+        Yields:
+            Trajectory: Every complete game, as soon as it ends.
+        """
+        for line in lines:
+            self.lines += 1
+
+            if self.lines % self.stale_lines == 0:
+                yield from self.evict()
+
+            try:
+                record = json.loads(line)
+            except ValueError:
+                self.skipped += 1
+                continue
+
+            if not isinstance(record, dict):
+                self.skipped += 1
+                continue
+
+            event = record.get("event")
+
+            if event not in _GAME_EVENTS:
+                continue
+
+            key = tuple(record.get(name) for name in _STREAM_KEYS)
+            game = self.games.get(key)
+
+            if event == "Agent created" and record.get("agent_id") == 0:
+                if game is not None:
+                    trajectory = self.finish(key)
+
+                    if trajectory is not None:
+                        yield trajectory
+
+                seed = record.get("seed")
+                game = self.games[key] = _GameBuilder(
+                    seed if seed is not None else NO_SEED
+                )
+
+            if game is None:
+                # Game started before the logs: its initial states are unknown
+                game = self.games[key] = _GameBuilder(NO_SEED)
+                game.complete = False
+
+            game.last_line = self.lines
+
+            try:
+                won = game.add(event, record)
+            except (KeyError, IndexError, TypeError, ValueError):
+                game.complete = False
+                continue
+
+            if won:
+                trajectory = self.finish(key)
+
+                if trajectory is not None:
+                    yield trajectory
+
+    def evict(self) -> Iterator[Trajectory]:
+        """
+        Ends the games that logged nothing for at least `stale_lines` lines.
+
+        Yields:
+            Trajectory: Every complete game ended.
+        """
+        deadline = self.lines - self.stale_lines
+
+        for key in [
+            key for key, game in self.games.items() if game.last_line <= deadline
+        ]:
+            trajectory = self.finish(key)
+
+            if trajectory is not None:
+                yield trajectory
+
+    def close(self) -> Iterator[Trajectory]:
+        """
+        Ends every game in progress, as games that hit the turn limit.
+
+        Yields:
+            Trajectory: Every complete game still in progress.
+        """
+        for key in list(self.games):
+            trajectory = self.finish(key)
+
+            if trajectory is not None:
+                yield trajectory
+
+    def stats(self) -> IngestStats:
+        """
+        Returns the counts of the lines parsed so far.
+
+        Returns:
+            IngestStats: Lines read and skipped, games built and dropped.
+        """
+        return IngestStats(
+            lines=self.lines,
+            skipped=self.skipped,
+            games=self.built,
+            incomplete=self.incomplete,
+        )
+
+
+class TrajectoryWriter:
+    """
+    Appendable store of trajectories, written in chunks of games.
+
+    Each chunk is one .npz file (`<chunk>.npz`) holding the per-game columns (seeds, winners,
+    conditions and row offsets) and the concatenated rows of its games. Chunks are written to a
+    temporary file and renamed, so an interrupted ingestion never leaves a partial chunk visible.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Opens a store, creating its directory if needed.
+
+        Args:
+            path (Path): Directory of the store.
+            chunk_size (int): Number of buffered games after which a chunk is written.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be at least 1, but got {chunk_size}")
+
+        path.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.chunk_size = chunk_size
+        self.pending: list[Trajectory] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.flush()
+
+    def append(self, trajectory: Trajectory) -> None:
+        """
+        Adds one game, writing a chunk once enough games are buffered.
+
+        Args:
+            trajectory (Trajectory): Game to add.
+        """
+        self.pending.append(trajectory)
+
+        if len(self.pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered games as a new chunk.
+        """
+        if not self.pending:
+            return
+
+        chunk_ids = chunk_ids_of(self.path)
+        chunk_id = chunk_ids[-1] + 1 if chunk_ids else 0
+
+        lengths = [len(trajectory.turns) for trajectory in self.pending]
+
+        final = self.path / f"{chunk_id:06d}.npz"
+        temporary = final.with_suffix(".tmp")
+
+        with temporary.open("wb") as file:
+            np.savez_compressed(
+                file,
+                seeds=np.array([t.seed for t in self.pending], dtype=np.int64),
+                winners=np.array([t.winner for t in self.pending], dtype=np.int8),
+                conditions=np.array(
+                    [t.conditions for t in self.pending], dtype=MASK_DTYPE
+                ),
+                offsets=np.cumsum([0, *lengths], dtype=np.int64),
+                turns=np.concatenate([t.turns for t in self.pending]),
+            )
+
+        temporary.replace(final)
+
+        logger.debug("Trajectory chunk written", chunk=chunk_id, games=len(lengths))
+
+        self.pending = []
+
+
+def chunk_ids_of(path: Path) -> list[int]:
+    """
+    Lists the complete chunks of a trajectory store.
+
+    Args:
+        path (Path): Directory of the store.
+
+    Returns:
+        list[int]: Sorted chunk IDs.
+    """
+    return sorted(int(file.name.split(".", 1)[0]) for file in path.glob("*.npz"))
+
+
+def load_trajectories(path: Path) -> Iterator[Trajectory]:
+    """
+    Reads the games of a trajectory store, one chunk in memory at a time.
+
+    Args:
+        path (Path): Directory of the store.
+
+    Yields:
+        Trajectory: Every stored game, in ingestion order.
+    """
+    for chunk_id in chunk_ids_of(path):
+        with np.load(path / f"{chunk_id:06d}.npz") as data:
+            offsets = data["offsets"]
+            turns = data["turns"]
+
+            for seed, winner, conditions, start, end in zip(
+                data["seeds"],
+                data["winners"],
+                data["conditions"],
+                offsets[:-1],
+                offsets[1:],
+            ):
+                yield Trajectory(
+                    seed=int(seed),
+                    winner=int(winner),
+                    conditions=tuple(int(condition) for condition in conditions),
+                    turns=turns[start:end],
+                )
+
+
+def ingest_logs(
+    paths: Iterable[Path],
+    output: Path,
+    chunk_size: int = CHUNK_SIZE,
+    stale_lines: int = STALE_LINES,
+) -> IngestStats:
+    """
+    Converts JSON log files into a trajectory store, streaming them line by line.
+
+    Files are read in the given order and form one stream, so the rotated files of a log must
+    be given oldest first. Memory holds the games in progress and one chunk of output.
+
+    Args:
+        paths (Iterable[Path]): Log files written with the JSON format, plain or gzip-compressed.
+        output (Path): Directory of the trajectory store, appended to if it exists.
+        chunk_size (int): Number of games per chunk.
+        stale_lines (int): Number of lines without news after which a game in progress is considered over.
+
+    Returns:
+        IngestStats: Counts of the ingestion.
+    """
+    parser = TrajectoryParser(stale_lines)
+
+    with TrajectoryWriter(output, chunk_size) as writer:
+        for path in paths:
+            with open_log(path) as lines:
+                for trajectory in parser.parse(lines):
+                    writer.append(trajectory)
+
+            logger.info("Log ingested", path=str(path), games=parser.built)
+
+        for trajectory in parser.close():
+            writer.append(trajectory)
+
+    stats = parser.stats()
+
+    logger.info("Logs ingested", **stats._asdict())
+
+    return stats
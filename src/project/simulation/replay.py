@@ -0,0 +1,352 @@
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+import structlog
+
+from project.game.agent import Agent
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.engine import GameEngine
+from project.game.events import EventBus
+from project.game.policy import Policy, RandomPolicy
+from project.game.snapshot import GameSnapshot
+from project.simulation.tournament import MAX_TURNS
+
+logger = structlog.get_logger(__name__)
+
+RECORDING_VERSION: int = 1
+
+# Number of steps between two internal snapshots of a replay
+SNAPSHOT_INTERVAL: int = 32
+
+
+class Decision(NamedTuple):
+    """
+    One policy decision taken during a game.
+
+    Attributes:
+        turn: int - Turn during which the decision was taken.
+        agent_id: int - Deciding agent.
+        kind: str - Kind of decision (choose, lose or steal).
+        mask: int - Valid ingredients offered to the policy.
+        amount: int - Number of ingredients to select.
+        selected: int - Bitmask returned by the policy.
+    """
+
+    turn: int
+    agent_id: int
+    kind: str
+    mask: int
+    amount: int
+    selected: int
+
+
+class GameRecording(NamedTuple):
+    """
+    Everything needed to reproduce a game: dice and deck come from the seed, choices from the decisions.
+
+    Attributes:
+        seed: int - Seed of the game.
+        decisions: tuple[Decision, ...] - Policy decisions, in the order they were taken.
+        steps: int - Number of steps played.
+        winner_id: int | None - Winning agent ID, or None if the game hit the turn limit.
+    """
+
+    seed: int
+    decisions: tuple[Decision, ...]
+    steps: int
+    winner_id: int | None
+
+
+class RecordingPolicy:
+    """
+    Wraps a policy and records every decision it takes.
+    """
+
+    def __init__(self, policy: Policy, decisions: list[Decision]) -> None:
+        """
+        Initializes the wrapper.
+
+        Args:
+            policy (Policy): Policy taking the decisions.
+            decisions (list[Decision]): List the decisions are appended to, usually shared by every seat.
+        """
+        self.policy = policy
+        self.decisions = decisions
+
+    def select(
+        self, engine: GameEngine, agent: Agent, kind: str, mask: int, amount: int
+    ) -> int:
+        """
+        Delegates the decision to the wrapped policy and records it.
+
+        Args:
+            engine (GameEngine): Engine in the middle of resolving the agent's turn.
+            agent (Agent): Deciding agent.
+            kind (str): Kind of decision, one of CHOOSE, LOSE or STEAL.
+            mask (int): Valid ingredients to select from.
+            amount (int): Number of ingredients to select.
+
+        Returns:
+            int: Bitmask of the selected ingredients.
+        """
+        selected = self.policy.select(engine, agent, kind, mask, amount)
+
+        self.decisions.append(
+            Decision(engine.turn_count, agent.id, kind, mask, amount, selected)
+        )
+
+        return selected
+
+
+class ReplayPolicy:
+    """
+    Plays back recorded decisions in order, checking that the game did not diverge.
+    """
+
+    def __init__(self, decisions: tuple[Decision, ...]) -> None:
+        """
+        Initializes the policy at the first decision.
+
+        Args:
+            decisions (tuple[Decision, ...]): Recorded decisions.
+        """
+        self.decisions = decisions
+        self.cursor = 0
+
+    def select(
+        self, engine: GameEngine, agent: Agent, kind: str, mask: int, amount: int
+    ) -> int:
+        """
+        Returns the next recorded decision.
+
+        Args:
+            engine (GameEngine): Engine in the middle of resolving the agent's turn.
+            agent (Agent): Deciding agent.
+            kind (str): Kind of decision, one of CHOOSE, LOSE or STEAL.
+            mask (int): Valid ingredients to select from.
+            amount (int): Number of ingredients to select.
+
+        Returns:
+            int: Bitmask of the recorded selection.
+        """
+        if self.cursor >= len(self.decisions):
+            raise ValueError(
+                f"Replay diverged: no recorded decision left at turn {engine.turn_count}"
+            )
+
+        decision = self.decisions[self.cursor]
+
+        if decision[:5] != (engine.turn_count, agent.id, kind, mask, amount):
+            raise ValueError(
+                f"Replay diverged at turn {engine.turn_count}: expected {decision}"
+            )
+
+        self.cursor += 1
+
+        return decision.selected
+
+
+def record_game(
+    seed: int,
+    policies: list[Policy] | None = None,
+    max_turns: int = MAX_TURNS,
+    events: EventBus | None = None,
+) -> GameRecording:
+    """
+    Plays a game and records it.
+
+    Args:
+        seed (int): Seed of the game.
+        policies (list[Policy] | None): Decision policy of each seat. If None, every seat decides at random.
+        max_turns (int): Turn limit after which the game ends without a winner.
+        events (EventBus | None): Bus receiving the game events.
+
+    Returns:
+        GameRecording: Seed and decisions of the game.
+    """
+    if policies is None:
+        policies = [RandomPolicy()] * NUMBER_OF_PLAYERS
+
+    decisions: list[Decision] = []
+
+    engine = GameEngine(
+        seed=seed,
+        policies=[RecordingPolicy(policy, decisions) for policy in policies],
+        events=events,
+    )
+
+    winner_id = None
+    steps = 0
+
+    while winner_id is None and engine.turn_count < max_turns:
+        winner_id = engine.step()
+        steps += 1
+
+    return GameRecording(seed, tuple(decisions), steps, winner_id)
+
+
+def save_recording(recording: GameRecording, path: Path) -> None:
+    """
+    Writes a recording as JSON.
+
+    Args:
+        recording (GameRecording): Recording to write.
+        path (Path): Destination file.
+    """
+    data = {
+        "version": RECORDING_VERSION,
+        "seed": recording.seed,
+        "steps": recording.steps,
+        "winner_id": recording.winner_id,
+        "decisions": [list(decision) for decision in recording.decisions],
+    }
+
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def load_recording(path: Path) -> GameRecording:
+    """
+    Reads a recording written by save_recording.
+
+    Args:
+        path (Path): Recording file.
+
+    Returns:
+        GameRecording: The recording.
+    """
+    data = json.loads(path.read_text(encoding="utf-8"))
+
+    if data["version"] != RECORDING_VERSION:
+        raise ValueError(f"Unsupported recording version: {data['version']}")
+
+    return GameRecording(
+        seed=data["seed"],
+        decisions=tuple(Decision(*decision) for decision in data["decisions"]),
+        steps=data["steps"],
+        winner_id=data["winner_id"],
+    )
+
+
+class Replay:
+    """
+    Reconstructs a recorded game at any step.
+
+    Snapshots are taken every `interval` steps the first time they are reached, so seeking
+    restores the closest earlier snapshot and only replays the steps after it.
+    """
+
+    def __init__(
+        self,
+        recording: GameRecording,
+        interval: int = SNAPSHOT_INTERVAL,
+        events: EventBus | None = None,
+    ) -> None:
+        """
+        Initializes the replay at the start of the game.
+
+        Args:
+            recording (GameRecording): Recording to replay.
+            interval (int): Number of steps between two snapshots.
+            events (EventBus | None): Bus receiving the replayed game events.
+        """
+        if interval < 1:
+            raise ValueError(
+                f"Snapshot interval must be at least 1, but got {interval}"
+            )
+
+        self.recording = recording
+        self.interval = interval
+
+        self.policy = ReplayPolicy(recording.decisions)
+        self.engine = GameEngine(
+            seed=recording.seed,
+            policies=[self.policy] * NUMBER_OF_PLAYERS,
+            events=events,
+        )
+
+        # Number of steps played so far
+        self.step_index = 0
+
+        # Snapshot and decision cursor at every multiple of the interval reached so far
+        self.snapshots: dict[int, tuple[GameSnapshot, int]] = {
+            0: (self.engine.snapshot(), 0)
+        }
+
+    def step(self) -> int | None:
+        """
+        Plays the next recorded step.
+
+        Returns:
+            int | None: Winning agent ID, or None if no winner yet.
+        """
+        if self.step_index >= self.recording.steps:
+            raise ValueError("The recorded game has no more steps")
+
+        winner_id = self.engine.step()
+        self.step_index += 1
+
+        if (
+            self.step_index % self.interval == 0
+            and self.step_index not in self.snapshots
+        ):
+            self.snapshots[self.step_index] = (
+                self.engine.snapshot(),
+                self.policy.cursor,
+            )
+
+        return winner_id
+
+    def seek(self, step_index: int) -> GameEngine:
+        """
+        Puts the engine in the state it had after a number of steps.
+
+        Args:
+            step_index (int): Number of steps played, between 0 and the recording's steps.
+
+        Returns:
+            GameEngine: The engine in the requested state.
+        """
+        if not 0 <= step_index <= self.recording.steps:
+            raise ValueError(
+                f"Step must be between 0 and {self.recording.steps}, but got {step_index}"
+            )
+
+        # Moving forward from the current state is cheaper than restoring, unless a
+        # closer snapshot exists
+        nearest = step_index - step_index % self.interval
+
+        while nearest not in self.snapshots:
+            nearest -= self.interval
+
+        if not nearest <= self.step_index <= step_index:
+            snapshot, cursor = self.snapshots[nearest]
+
+            self.engine.restore(snapshot)
+            self.policy.cursor = cursor
+            self.step_index = nearest
+
+            logger.debug("Replay restored snapshot", step=nearest)
+
+        while self.step_index < step_index:
+            self.step()
+
+        return self.engine
+
+    def forward(self) -> GameEngine:
+        """
+        Moves one step forward.
+
+        Returns:
+            GameEngine: The engine after the step.
+        """
+        return self.seek(self.step_index + 1)
+
+    def backward(self) -> GameEngine:
+        """
+        Moves one step backward.
+
+        Returns:
+            GameEngine: The engine before the last step.
+        """
+        return self.seek(self.step_index - 1)
@@ -0,0 +1,393 @@
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple, Self
+
+import numpy as np
+import structlog
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.events import CardDrawn, EventBus
+from project.game.policy import RandomPolicy
+from project.game.queue import ACTION_NAMES
+from project.game.rules import DEFAULT_RULES, Rules
+from project.game.table import MASK_DTYPE
+from project.simulation.backends import PROCESS, create_executor
+from project.simulation.tournament import MAX_TURNS, PolicyFactory
+from project.simulation.worker import create_engine
+
+logger = structlog.get_logger(__name__)
+
+# Default number of games per chunk
+CHUNK_SIZE: int = 65536
+
+# Winner value of games that hit the turn limit
+NO_WINNER: int = -1
+
+# Column name, dtype and per-game shape of every stored column
+RESULT_COLUMNS: dict[str, tuple[type, tuple[int, ...]]] = {
+    "seed": (np.int64, ()),
+    "winner": (np.int8, ()),
+    "turns": (np.int32, ()),
+    "states": (MASK_DTYPE, (NUMBER_OF_PLAYERS,)),
+    "conditions": (MASK_DTYPE, (NUMBER_OF_PLAYERS,)),
+    "cards_drawn": (np.uint16, (len(ACTION_NAMES),)),
+}
+
+# Column written last: a chunk is complete once this file exists
+_COMMIT_COLUMN = "seed"
+
+# Mapping from column name to the rows of one chunk
+Chunk = dict[str, np.ndarray]
+
+# Function of a chunk returning one value per row
+ChunkFunction = Callable[[Chunk], np.ndarray]
+
+
+class GameResult(NamedTuple):
+    """
+    Outcome of one game, as stored in a ResultsStore.
+
+    Attributes:
+        seed: int - Seed of the game.
+        winner: int - Winning agent ID, or NO_WINNER if the game hit the turn limit.
+        turns: int - Number of turns played.
+        states: tuple[int, ...] - Final state of each agent.
+        conditions: tuple[int, ...] - Winning condition of each agent.
+        cards_drawn: tuple[int, ...] - Number of cards drawn of each action, indexed like ACTION_NAMES.
+    """
+
+    seed: int
+    winner: int
+    turns: int
+    states: tuple[int, ...]
+    conditions: tuple[int, ...]
+    cards_drawn: tuple[int, ...]
+
+
+class CardCounter:
+    """
+    Event handler counting the cards drawn during a game.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes every count at zero.
+        """
+        self.counts = dict.fromkeys(ACTION_NAMES, 0)
+
+    def __call__(self, event: CardDrawn) -> None:
+        """
+        Counts one drawn card.
+
+        Args:
+            event (CardDrawn): The draw.
+        """
+        self.counts[event.action] += 1
+
+
+def play_result(
+    seed: int,
+    policy: PolicyFactory = RandomPolicy,
+    max_turns: int = MAX_TURNS,
+    rules: Rules = DEFAULT_RULES,
+) -> GameResult:
+    """
+    Plays one game and collects its outcome.
+
+    Args:
+        seed (int): Seed of the game.
+        policy (PolicyFactory): Builds the policy of every seat.
+        max_turns (int): Turn limit after which the game ends without a winner.
+        rules (Rules): Board and deck composition.
+
+    Returns:
+        GameResult: Outcome of the game.
+    """
+    counter = CardCounter()
+    events = EventBus()
+    events.subscribe(counter, CardDrawn)
+
+    engine = create_engine(
+        seed,
+        [policy() for _ in range(NUMBER_OF_PLAYERS)],
+        events=events,
+        rules=rules,
+    )
+
+    winner_id = None
+
+    while winner_id is None and engine.turn_count < max_turns:
+        winner_id = engine.step()
+
+    return GameResult(
+        seed=seed,
+        winner=NO_WINNER if winner_id is None else winner_id,
+        # The winning turn is not counted by the engine
+        turns=engine.turn_count + (winner_id is not None),
+        states=tuple(int(state) for state in engine.table.states),
+        conditions=tuple(int(condition) for condition in engine.table.conditions),
+        cards_drawn=tuple(counter.counts.values()),
+    )
+
+
+class ResultsStore:
+    """
+    Appendable columnar store of game outcomes.
+
+    Games are buffered in memory and written in chunks, one .npy file per column and chunk
+    (`<chunk>.<column>.npy`). Reading memory-maps the chunks one at a time, so queries never
+    load more than one chunk of the requested columns. The commit column is written last, and
+    chunks without it are ignored, so an interrupted flush never leaves a partial chunk visible.
+
+    Only one process should append to a store at a time.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Opens a store, creating its directory if needed.
+
+        Args:
+            path (Path): Directory of the store.
+            chunk_size (int): Number of buffered games after which a chunk is written.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be at least 1, but got {chunk_size}")
+
+        path.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.chunk_size = chunk_size
+        self.pending: list[GameResult] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.flush()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of stored games, including the pending ones.
+
+        Returns:
+            int: Number of games.
+        """
+        return self.count() + len(self.pending)
+
+    # =============================================================================
+    # Writing
+    # =============================================================================
+
+    def append(self, result: GameResult) -> None:
+        """
+        Adds one game, writing a chunk once enough games are buffered.
+
+        Args:
+            result (GameResult): Game to add.
+        """
+        self.pending.append(result)
+
+        if len(self.pending) >= self.chunk_size:
+            self.flush()
+
+    def extend(self, results: Iterable[GameResult]) -> None:
+        """
+        Adds many games.
+
+        Args:
+            results (Iterable[GameResult]): Games to add.
+        """
+        for result in results:
+            self.append(result)
+
+    def flush(self) -> None:
+        """
+        Writes the buffered games as a new chunk.
+        """
+        if not self.pending:
+            return
+
+        chunk_ids = self.chunk_ids()
+        chunk_id = chunk_ids[-1] + 1 if chunk_ids else 0
+
+        names = [name for name in RESULT_COLUMNS if name != _COMMIT_COLUMN]
+
+        for name in [*names, _COMMIT_COLUMN]:
+            dtype, _ = RESULT_COLUMNS[name]
+            values = np.array(
+                [getattr(result, name) for result in self.pending], dtype=dtype
+            )
+
+            final = self.path / f"{chunk_id:06d}.{name}.npy"
+            temporary = final.with_suffix(".tmp")
+
+            with temporary.open("wb") as file:
+                np.save(file, values)
+
+            temporary.replace(final)
+
+        logger.debug("Results chunk written", chunk=chunk_id, games=len(self.pending))
+
+        self.pending = []
+
+    # =============================================================================
+    # Reading
+    # =============================================================================
+
+    def chunk_ids(self) -> list[int]:
+        """
+        Lists the complete chunks on disk.
+
+        Returns:
+            list[int]: Sorted chunk IDs.
+        """
+        return sorted(
+            int(file.name.split(".", 1)[0])
+            for file in self.path.glob(f"*.{_COMMIT_COLUMN}.npy")
+        )
+
+    def chunks(self, columns: Iterable[str] | None = None) -> Iterator[Chunk]:
+        """
+        Iterates over the written chunks, memory-mapped and read-only.
+
+        Pending games are not included until flushed.
+
+        Args:
+            columns (Iterable[str] | None): Columns to map. If None, every column.
+
+        Yields:
+            Chunk: Mapping from column name to the rows of one chunk.
+        """
+        columns = list(RESULT_COLUMNS if columns is None else columns)
+
+        for name in columns:
+            if name not in RESULT_COLUMNS:
+                raise ValueError(f"Unknown results column: {name}")
+
+        for chunk_id in self.chunk_ids():
+            yield {
+                name: np.load(self.path / f"{chunk_id:06d}.{name}.npy", mmap_mode="r")
+                for name in columns
+            }
+
+    def count(self, where: ChunkFunction | None = None) -> int:
+        """
+        Counts the stored games matching a filter.
+
+        Args:
+            where (ChunkFunction | None): Returns a boolean per row of a chunk. If None, every game matches.
+
+        Returns:
+            int: Number of matching games.
+        """
+        if where is None:
+            return sum(
+                len(chunk[_COMMIT_COLUMN]) for chunk in self.chunks([_COMMIT_COLUMN])
+            )
+
+        return sum(int(np.count_nonzero(where(chunk))) for chunk in self.chunks())
+
+    def mean(self, value: ChunkFunction, where: ChunkFunction | None = None) -> float:
+        """
+        Averages a per-game value over the stored games matching a filter.
+
+        For example, the win rate of seat 0 when its condition includes ingredient 3:
+
+            store.mean(
+                lambda c: c["winner"] == 0,
+                where=lambda c: (c["conditions"][:, 0] >> 3) & 1 == 1,
+            )
+
+        Args:
+            value (ChunkFunction): Returns the value of each row of a chunk.
+            where (ChunkFunction | None): Returns a boolean per row of a chunk. If None, every game matches.
+
+        Returns:
+            float: Mean value, or NaN if no game matches.
+        """
+        total = 0.0
+        matched = 0
+
+        for chunk in self.chunks():
+            values = np.asarray(value(chunk), dtype=np.float64)
+
+            if where is not None:
+                values = values[where(chunk)]
+
+            total += float(values.sum())
+            matched += len(values)
+
+        return total / matched if matched else float("nan")
+
+    def select(
+        self, columns: Iterable[str], where: ChunkFunction | None = None
+    ) -> Chunk:
+        """
+        Loads the matching rows of some columns into memory.
+
+        Args:
+            columns (Iterable[str]): Columns to load.
+            where (ChunkFunction | None): Returns a boolean per row of a chunk. If None, every game matches.
+
+        Returns:
+            Chunk: Mapping from column name to the matching rows.
+        """
+        columns = list(columns)
+        parts: dict[str, list[np.ndarray]] = {name: [] for name in columns}
+
+        for chunk in self.chunks():
+            rows = slice(None) if where is None else where(chunk)
+
+            for name in columns:
+                parts[name].append(np.asarray(chunk[name][rows]))
+
+        result = {}
+
+        for name in columns:
+            dtype, shape = RESULT_COLUMNS[name]
+            result[name] = (
+                np.concatenate(parts[name])
+                if parts[name]
+                else np.empty((0, *shape), dtype=dtype)
+            )
+
+        return result
+
+
+def simulate(
+    store: ResultsStore,
+    seeds: Iterable[int],
+    policy: PolicyFactory = RandomPolicy,
+    max_turns: int = MAX_TURNS,
+    rules: Rules = DEFAULT_RULES,
+    workers: int | None = None,
+    backend: str = PROCESS,
+    chunksize: int = 64,
+) -> None:
+    """
+    Plays games over a worker pool and appends their outcomes to a store.
+
+    Args:
+        store (ResultsStore): Store receiving the outcomes, flushed at the end.
+        seeds (Iterable[int]): Seeds to play.
+        policy (PolicyFactory): Builds the policy of every seat.
+        max_turns (int): Turn limit after which a game ends without a winner.
+        rules (Rules): Board and deck composition.
+        workers (int | None): Number of workers. If 1, runs in the current thread. If None, uses every CPU.
+        backend (str): Kind of workers, see project.simulation.backends.
+        chunksize (int): Number of seeds sent to a worker at once.
+    """
+    play = partial(play_result, policy=policy, max_turns=max_turns, rules=rules)
+
+    logger.info("Starting simulation", workers=workers, max_turns=max_turns)
+
+    if workers == 1:
+        store.extend(map(play, seeds))
+    else:
+        with create_executor(backend, workers) as executor:
+            store.extend(executor.map(play, seeds, chunksize=chunksize))
+
+    store.flush()
+
+    logger.info("Simulation completed", games=len(store))
@@ -0,0 +1,476 @@
+import json
+import os
+import random
+import socket
+import time
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple, Self
+
+import structlog
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.rules import Rules
+from project.simulation.backends import PROCESS, create_executor
+from project.simulation.sweep import (
+    VariantSummary,
+    play_variant,
+    summarize_variant,
+    validate_variant,
+)
+from project.simulation.tournament import MAX_TURNS
+
+logger = structlog.get_logger(__name__)
+
+QUEUE_VERSION: int = 1
+
+# Default number of seeds of one variant per shard
+SHARD_SIZE: int = 1000
+
+# Default number of seconds after which a claim that was not renewed is re-queued
+LEASE_SECONDS: float = 300.0
+
+# Number of games played between two renewals of a claim
+RENEW_EVERY: int = 64
+
+# Seconds an idle worker waits before looking again for expired claims
+POLL_SECONDS: float = 5.0
+
+_MANIFEST = "sweep.json"
+_PENDING = "pending"
+_CLAIMED = "claimed"
+_DONE = "done"
+_CLOCK = "clock"
+
+
+class Shard(NamedTuple):
+    """
+    Unit of work of a distributed sweep: a range of seeds played with one variant.
+
+    Attributes:
+        id: int - Index of the shard in the queue.
+        variant: int - Index of the variant in the manifest.
+        seeds: range - Seeds to play.
+    """
+
+    id: int
+    variant: int
+    seeds: range
+
+
+class ShardQueue:
+    """
+    Work queue of a sweep, shared by any number of nodes through a common directory.
+
+    The directory holds the manifest of the sweep and one empty file per shard, moved between
+    three subdirectories: `pending`, `claimed` and `done`. Every transition is a single rename,
+    which is atomic on local filesystems and NFS, so exactly one node wins each claim without
+    any lock or broker. A claim is a lease: its owner renews it by touching the claim file,
+    and claims not renewed for `lease` seconds are renamed back to `pending` by the next node
+    looking for work, so the shards of crashed nodes are played again. Claim times are compared
+    with the time of a clock file touched on the same share, never with the clock of the node,
+    so clock skew between nodes and the file server does not expire or extend leases.
+
+    A shard may thus be played twice (a slow node outliving its lease), never lost. Games are
+    deterministic, so both results are identical and the last one written wins.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Opens an existing queue.
+
+        Args:
+            path (Path): Directory of the queue.
+        """
+        self.path = path
+
+        manifest = json.loads((path / _MANIFEST).read_text(encoding="utf-8"))
+
+        if manifest["version"] != QUEUE_VERSION:
+            raise ValueError(f"Unsupported sweep queue version {manifest['version']}")
+
+        self.variants = [Rules(*values) for values in manifest["variants"]]
+        self.first_seed: int = manifest["first_seed"]
+        self.games: int = manifest["games"]
+        self.shard_size: int = manifest["shard_size"]
+        self.max_turns: int = manifest["max_turns"]
+        self.lease: float = manifest["lease"]
+
+        self.pending = path / _PENDING
+        self.claimed = path / _CLAIMED
+        self.done = path / _DONE
+
+    @classmethod
+    def create(
+        cls,
+        path: Path,
+        variants: Iterable[Rules],
+        seeds: range,
+        shard_size: int = SHARD_SIZE,
+        max_turns: int = MAX_TURNS,
+        lease: float = LEASE_SECONDS,
+    ) -> Self:
+        """
+        Creates a queue holding every shard of a sweep.
+
+        Invalid variants are logged and skipped, like in run_sweep.
+
+        Args:
+            path (Path): Directory of the queue, which must not exist yet.
+            variants (Iterable[Rules]): Rule variants to evaluate.
+            seeds (range): Seeds played by every variant, with a step of 1.
+            shard_size (int): Number of seeds of one variant per shard.
+            max_turns (int): Turn limit after which a game ends without a winner.
+            lease (float): Seconds after which a claim that was not renewed is re-queued.
+
+        Returns:
+            ShardQueue: The new queue.
+        """
+        if not seeds or seeds.step != 1:
+            raise ValueError("Seeds must be a non-empty range with a step of 1")
+
+        if shard_size < 1:
+            raise ValueError(f"Shard size must be at least 1, but got {shard_size}")
+
+        valid = []
+
+        for rules in variants:
+            error = validate_variant(rules)
+
+            if error is None:
+                valid.append(rules)
+            else:
+                logger.warning(
+                    "Skipping invalid rule variant", rules=rules, error=error
+                )
+
+        # Fails if another node already created the queue
+        path.mkdir(parents=True)
+
+        for name in (_PENDING, _CLAIMED, _DONE):
+            (path / name).mkdir()
+
+        (path / _CLOCK).touch()
+
+        shards_per_variant = -(-len(seeds) // shard_size)
+
+        for shard_id in range(len(valid) * shards_per_variant):
+            (path / _PENDING / f"{shard_id:08d}").touch()
+
+        manifest = {
+            "version": QUEUE_VERSION,
+            "variants": [list(rules) for rules in valid],
+            "first_seed": seeds.start,
+            "games": len(seeds),
+            "shard_size": shard_size,
+            "max_turns": max_turns,
+            "lease": lease,
+        }
+
+        # Written last and atomically: nodes only see complete queues
+        temporary = path / f".{_MANIFEST}.tmp"
+        temporary.write_text(json.dumps(manifest), encoding="utf-8")
+        temporary.rename(path / _MANIFEST)
+
+        logger.info(
+            "Sweep queue created",
+            path=str(path),
+            variants=len(valid),
+            shards=len(valid) * shards_per_variant,
+        )
+
+        return cls(path)
+
+    @property
+    def shards_per_variant(self) -> int:
+        """
+        Number of shards each variant is split into.
+
+        Returns:
+            int: Shards per variant.
+        """
+        return -(-self.games // self.shard_size)
+
+    def __len__(self) -> int:
+        """
+        Total number of shards.
+
+        Returns:
+            int: Number of shards.
+        """
+        return len(self.variants) * self.shards_per_variant
+
+    def shard(self, shard_id: int) -> Shard:
+        """
+        Describes a shard.
+
+        Args:
+            shard_id (int): Index of the shard.
+
+        Returns:
+            Shard: Variant and seeds of the shard.
+        """
+        variant, part = divmod(shard_id, self.shards_per_variant)
+        start = self.first_seed + part * self.shard_size
+        stop = min(start + self.shard_size, self.first_seed + self.games)
+
+        return Shard(shard_id, variant, range(start, stop))
+
+    def now(self) -> float:
+        """
+        Reads the current time of the filesystem holding the queue.
+
+        Touching a file sets its modification time like touching a claim does, from the file
+        server's clock on network filesystems, so both times can be compared.
+
+        Returns:
+            float: Modification time of the freshly touched clock file, in seconds.
+        """
+        clock = self.path / _CLOCK
+        clock.touch()
+
+        return clock.stat().st_mtime
+
+    def requeue_expired(self) -> int:
+        """
+        Moves the claims that were not renewed in time back to the pending shards.
+
+        Returns:
+            int: Number of re-queued shards.
+        """
+        deadline = self.now() - self.lease
+        requeued = 0
+
+        for name in os.listdir(self.claimed):
+            claim = self.claimed / name
+
+            try:
+                if claim.stat().st_mtime >= deadline:
+                    continue
+
+                claim.rename(self.pending / name)
+            except FileNotFoundError:
+                # Finished or re-queued by another node in the meantime
+                continue
+
+            requeued += 1
+
+            logger.warning("Expired claim re-queued", shard=int(name))
+
+        return requeued
+
+    def claim(self) -> Shard | None:
+        """
+        Claims a pending shard.
+
+        Returns:
+            Shard | None: The claimed shard, or None if no shard is pending.
+        """
+        self.requeue_expired()
+
+        names = os.listdir(self.pending)
+
+        # Nodes try shards in different orders, so they rarely race for the same one
+        random.shuffle(names)
+
+        for name in names:
+            pending = self.pending / name
+
+            try:
+                # Renaming keeps the modification time, which must not look expired
+                os.utime(pending)
+                pending.rename(self.claimed / name)
+            except FileNotFoundError:
+                continue
+
+            shard_id = int(name)
+
+            if (self.done / f"{name}.json").exists():
+                # Re-queued after its owner finished it
+                self.release(shard_id)
+                continue
+
+            return self.shard(shard_id)
+
+        return None
+
+    def renew(self, shard: Shard) -> None:
+        """
+        Extends the lease of a claimed shard.
+
+        Args:
+            shard (Shard): Shard claimed by this node.
+        """
+        try:
+            os.utime(self.claimed / f"{shard.id:08d}")
+        except FileNotFoundError:
+            # Re-queued: the shard may be played twice, which is harmless
+            pass
+
+    def release(self, shard_id: int) -> None:
+        """
+        Removes the claim of a shard.
+
+        Args:
+            shard_id (int): Index of the shard.
+        """
+        try:
+            (self.claimed / f"{shard_id:08d}").unlink()
+        except FileNotFoundError:
+            pass
+
+    def complete(self, shard: Shard, outcomes: list[tuple[int | None, int]]) -> None:
+        """
+        Writes the aggregates of a played shard and removes its claim.
+
+        Args:
+            shard (Shard): Shard claimed by this node.
+            outcomes (list[tuple[int | None, int]]): Winner and number of turns of each game.
+        """
+        winners = Counter(winner for winner, _ in outcomes)
+
+        aggregate = {
+            "variant": shard.variant,
+            "games": len(outcomes),
+            "seat_wins": [winners[seat] for seat in range(NUMBER_OF_PLAYERS)],
+            "turns": Counter(turns for _, turns in outcomes),
+        }
+
+        name = f"{shard.id:08d}.json"
+        temporary = self.done / f".{name}.{os.getpid()}.tmp"
+        temporary.write_text(json.dumps(aggregate), encoding="utf-8")
+        temporary.replace(self.done / name)
+
+        self.release(shard.id)
+
+    def remaining(self) -> int:
+        """
+        Counts the shards that are not done yet.
+
+        Returns:
+            int: Number of pending or claimed shards.
+        """
+        return len(self) - sum(
+            1 for name in os.listdir(self.done) if name.endswith(".json")
+        )
+
+    def merge(self) -> list[VariantSummary]:
+        """
+        Combines the aggregates of every shard into one summary per variant.
+
+        The turn histograms are exact, so the summaries are those run_sweep computes locally.
+
+        Returns:
+            list[VariantSummary]: Statistics of each variant, in manifest order.
+        """
+        remaining = self.remaining()
+
+        if remaining:
+            raise ValueError(f"{remaining} shards of the sweep are not done yet")
+
+        games = [0] * len(self.variants)
+        seat_wins = [[0] * NUMBER_OF_PLAYERS for _ in self.variants]
+        histograms: list[Counter[int]] = [Counter() for _ in self.variants]
+
+        for shard_id in range(len(self)):
+            path = self.done / f"{shard_id:08d}.json"
+            aggregate = json.loads(path.read_text(encoding="utf-8"))
+            variant = aggregate["variant"]
+
+            games[variant] += aggregate["games"]
+
+            for seat, wins in enumerate(aggregate["seat_wins"]):
+                seat_wins[variant][seat] += wins
+
+            histograms[variant].update(
+                {int(turns): count for turns, count in aggregate["turns"].items()}
+            )
+
+        summaries = []
+
+        for rules, count, wins, histogram in zip(
+            self.variants, games, seat_wins, histograms
+        ):
+            # The statistics are per column, so winners need not be paired with their games
+            winners = [
+                seat for seat, seat_count in enumerate(wins) for _ in range(seat_count)
+            ]
+            winners += [None] * (count - len(winners))
+            outcomes = list(zip(winners, sorted(histogram.elements())))
+
+            summaries.append(summarize_variant(rules, outcomes))
+
+        return summaries
+
+
+def work(path: Path, node: str | None = None) -> int:
+    """
+    Claims and plays shards of a queue until every shard is done.
+
+    Once no shard is pending, the worker keeps polling while other nodes hold claims, so the
+    shards of nodes crashing late are still re-queued and played.
+
+    Args:
+        path (Path): Directory of the queue.
+        node (str | None): Name of this worker in the logs. If None, uses the host name and process ID.
+
+    Returns:
+        int: Number of shards played.
+    """
+    if node is None:
+        node = f"{socket.gethostname()}-{os.getpid()}"
+
+    queue = ShardQueue(path)
+    played = 0
+
+    with structlog.contextvars.bound_contextvars(node=node):
+        while True:
+            shard = queue.claim()
+
+            if shard is None:
+                if not os.listdir(queue.claimed):
+                    break
+
+                time.sleep(min(POLL_SECONDS, queue.lease))
+                continue
+
+            rules = queue.variants[shard.variant]
+            outcomes = []
+
+            for start in range(0, len(shard.seeds), RENEW_EVERY):
+                seeds = tuple(shard.seeds[start : start + RENEW_EVERY])
+                outcomes.extend(play_variant(rules, seeds, max_turns=queue.max_turns))
+                queue.renew(shard)
+
+            queue.complete(shard, outcomes)
+            played += 1
+
+            logger.info("Shard completed", shard=shard.id, games=len(outcomes))
+
+        logger.info("Sweep queue drained", shards=played)
+
+    return played
+
+
+def work_locally(path: Path, processes: int) -> int:
+    """
+    Runs several independent workers of a queue on this machine.
+
+    Each worker process claims shards through the queue directory exactly like a remote node,
+    so this also tests multi-node coordination without a cluster.
+
+    Args:
+        path (Path): Directory of the queue.
+        processes (int): Number of worker processes.
+
+    Returns:
+        int: Number of shards played by all the workers.
+    """
+    if processes == 1:
+        return work(path)
+
+    with create_executor(PROCESS, processes) as executor:
+        futures = [executor.submit(work, path) for _ in range(processes)]
+
+        return sum(future.result() for future in futures)
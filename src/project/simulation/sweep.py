@@ -0,0 +1,329 @@
+import csv
+import itertools
+from collections.abc import Iterable, Mapping
+from functools import partial
+from pathlib import Path
+from random import Random
+from statistics import fmean, median, pstdev
+from typing import NamedTuple
+
+import structlog
+
+from project.game.board import generate_board
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.policy import RandomPolicy
+from project.game.queue import generate_action_queue
+from project.game.rules import DEFAULT_RULES, Rules
+from project.simulation.backends import PROCESS, create_executor
+from project.simulation.cache import OutcomeCache
+from project.simulation.results import NO_WINNER
+from project.simulation.tournament import MAX_TURNS, PolicyFactory
+from project.simulation.worker import create_engine
+
+logger = structlog.get_logger(__name__)
+
+
+class VariantSummary(NamedTuple):
+    """
+    Outcome statistics of the games played with one rule variant.
+
+    Attributes:
+        rules: Rules - The rule variant.
+        games: int - Number of games played.
+        finish_rate: float - Fraction of games that had a winner before the turn limit.
+        seat_win_rates: tuple[float, ...] - Fraction of games won by each seat.
+        mean_turns: float - Mean number of turns played per game.
+        std_turns: float - Standard deviation of the number of turns.
+        median_turns: float - Median number of turns.
+        max_turns: int - Longest game, in turns.
+    """
+
+    rules: Rules
+    games: int
+    finish_rate: float
+    seat_win_rates: tuple[float, ...]
+    mean_turns: float
+    std_turns: float
+    median_turns: float
+    max_turns: int
+
+
+def grid_variants(
+    values: Mapping[str, Iterable[int]], base: Rules = DEFAULT_RULES
+) -> list[Rules]:
+    """
+    Builds every combination of the given rule values.
+
+    Args:
+        values (Mapping[str, Iterable[int]]): Values to try for each swept Rules field.
+        base (Rules): Rules providing the fields that are not swept.
+
+    Returns:
+        list[Rules]: One variant per combination, in row-major order.
+    """
+    names = list(values)
+
+    return [
+        base._replace(**dict(zip(names, combination)))
+        for combination in itertools.product(*(values[name] for name in names))
+    ]
+
+
+def random_variants(
+    ranges: Mapping[str, tuple[int, int]],
+    count: int,
+    seed: int | None = None,
+    base: Rules = DEFAULT_RULES,
+) -> list[Rules]:
+    """
+    Draws rule variants uniformly at random.
+
+    Args:
+        ranges (Mapping[str, tuple[int, int]]): Inclusive bounds of each swept Rules field.
+        count (int): Number of variants to draw.
+        seed (int | None): Seed of the draws. If None, a random seed is used.
+        base (Rules): Rules providing the fields that are not swept.
+
+    Returns:
+        list[Rules]: Drawn variants, possibly with duplicates.
+    """
+    rng = Random(seed)
+
+    return [
+        base._replace(
+            **{name: rng.randint(low, high) for name, (low, high) in ranges.items()}
+        )
+        for _ in range(count)
+    ]
+
+
+def validate_variant(rules: Rules) -> str | None:
+    """
+    Checks that a variant can be played by generating its board and deck.
+
+    Args:
+        rules (Rules): Variant to check.
+
+    Returns:
+        str | None: Why the variant is invalid, or None if it is valid.
+    """
+    try:
+        rules.validate()
+        generate_board(0, rules)
+        generate_action_queue(0, rules)
+    except (AssertionError, ValueError) as error:
+        return str(error)
+
+    return None
+
+
+def play_variant(
+    rules: Rules,
+    seeds: tuple[int, ...],
+    policy: PolicyFactory = RandomPolicy,
+    max_turns: int = MAX_TURNS,
+) -> list[tuple[int | None, int]]:
+    """
+    Plays games of one variant.
+
+    Args:
+        rules (Rules): Variant to play.
+        seeds (tuple[int, ...]): Seed of each game.
+        policy (PolicyFactory): Builds the policy of every seat.
+        max_turns (int): Turn limit after which a game ends without a winner.
+
+    Returns:
+        list[tuple[int | None, int]]: Winner and number of turns played of each game.
+    """
+    outcomes = []
+
+    for seed in seeds:
+        engine = create_engine(
+            seed, [policy() for _ in range(NUMBER_OF_PLAYERS)], rules=rules
+        )
+
+        winner_id = None
+
+        while winner_id is None and engine.turn_count < max_turns:
+            winner_id = engine.step()
+
+        # The winning turn is not counted by the engine
+        turns = engine.turn_count + (winner_id is not None)
+
+        outcomes.append((winner_id, turns))
+
+    return outcomes
+
+
+def summarize_variant(
+    rules: Rules, outcomes: list[tuple[int | None, int]]
+) -> VariantSummary:
+    """
+    Computes the statistics of the games played with one variant.
+
+    Args:
+        rules (Rules): The variant.
+        outcomes (list[tuple[int | None, int]]): Winner and number of turns of each game, at least one.
+
+    Returns:
+        VariantSummary: Win-rate and game-length statistics.
+    """
+    games = len(outcomes)
+    winners = [winner for winner, _ in outcomes]
+    turns = [turn for _, turn in outcomes]
+
+    return VariantSummary(
+        rules=rules,
+        games=games,
+        finish_rate=sum(winner is not None for winner in winners) / games,
+        seat_win_rates=tuple(
+            winners.count(seat) / games for seat in range(NUMBER_OF_PLAYERS)
+        ),
+        mean_turns=fmean(turns),
+        std_turns=pstdev(turns),
+        median_turns=median(turns),
+        max_turns=max(turns),
+    )
+
+
+def run_sweep(
+    variants: Iterable[Rules],
+    seeds: Iterable[int],
+    policy: PolicyFactory = RandomPolicy,
+    max_turns: int = MAX_TURNS,
+    workers: int | None = None,
+    backend: str = PROCESS,
+    chunksize: int = 64,
+    cache: Path | None = None,
+) -> list[VariantSummary]:
+    """
+    Plays the same seeds with every valid rule variant and summarizes each variant.
+
+    Invalid variants are logged and skipped. Every variant plays the same seeds, so differences
+    between variants are not blurred by different dice streams. Games are split into chunks of
+    seeds and distributed over a worker pool.
+
+    Args:
+        variants (Iterable[Rules]): Rule variants to evaluate.
+        seeds (Iterable[int]): Seeds played by every variant.
+        policy (PolicyFactory): Builds the policy of every seat.
+        max_turns (int): Turn limit after which a game ends without a winner.
+        workers (int | None): Number of workers. If 1, runs in the current thread. If None, uses every CPU.
+        backend (str): Kind of workers, see project.simulation.backends.
+        chunksize (int): Number of games of one variant sent to a worker at once.
+        cache (Path | None): Root of an OutcomeCache to read and fill, random policy only. If None, every game is played.
+
+    Returns:
+        list[VariantSummary]: Statistics of each valid variant, in input order.
+    """
+    seeds = tuple(seeds)
+
+    if not seeds:
+        raise ValueError("At least one seed is needed")
+
+    if cache is not None and policy is not RandomPolicy:
+        raise ValueError("Only the outcomes of the random policy can be cached")
+
+    valid = []
+
+    for rules in variants:
+        error = validate_variant(rules)
+
+        if error is None:
+            valid.append(rules)
+        else:
+            logger.warning("Skipping invalid rule variant", rules=rules, error=error)
+
+    chunks = [seeds[i : i + chunksize] for i in range(0, len(seeds), chunksize)]
+    tasks = [(index, chunk) for index in range(len(valid)) for chunk in chunks]
+
+    logger.info(
+        "Starting rule sweep",
+        variants=len(valid),
+        games=len(valid) * len(seeds),
+        workers=workers,
+    )
+
+    if cache is not None:
+        summaries = []
+
+        for rules in valid:
+            columns = OutcomeCache(cache, rules, max_turns).outcomes(
+                seeds, workers=workers, backend=backend, chunksize=chunksize
+            )
+            outcomes = [
+                (None if winner == NO_WINNER else winner, turns)
+                for winner, turns in zip(
+                    columns["winner"].tolist(), columns["turns"].tolist()
+                )
+            ]
+            summaries.append(summarize_variant(rules, outcomes))
+
+        logger.info("Rule sweep completed", variants=len(summaries), cached=True)
+
+        return summaries
+
+    play = partial(play_variant, policy=policy, max_turns=max_turns)
+    task_variants = [valid[index] for index, _ in tasks]
+    task_seeds = [chunk for _, chunk in tasks]
+
+    if workers == 1:
+        results = list(map(play, task_variants, task_seeds))
+    else:
+        with create_executor(backend, workers) as executor:
+            results = list(executor.map(play, task_variants, task_seeds))
+
+    outcomes: list[list[tuple[int | None, int]]] = [[] for _ in valid]
+
+    for (index, _), result in zip(tasks, results):
+        outcomes[index].extend(result)
+
+    summaries = [
+        summarize_variant(rules, variant_outcomes)
+        for rules, variant_outcomes in zip(valid, outcomes)
+    ]
+
+    logger.info("Rule sweep completed", variants=len(summaries))
+
+    return summaries
+
+
+def write_results(summaries: Iterable[VariantSummary], path: Path) -> None:
+    """
+    Writes sweep results as a CSV table, one row per variant.
+
+    Columns are the Rules fields followed by the statistics of VariantSummary, with one
+    seat_<i>_win_rate column per seat.
+
+    Args:
+        summaries (Iterable[VariantSummary]): Results to write.
+        path (Path): Destination file.
+    """
+    header = [
+        *Rules._fields,
+        "games",
+        "finish_rate",
+        *(f"seat_{seat}_win_rate" for seat in range(NUMBER_OF_PLAYERS)),
+        "mean_turns",
+        "std_turns",
+        "median_turns",
+        "max_turns",
+    ]
+
+    with path.open("w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+
+        for summary in summaries:
+            writer.writerow(
+                [
+                    *summary.rules,
+                    summary.games,
+                    f"{summary.finish_rate:.4f}",
+                    *(f"{rate:.4f}" for rate in summary.seat_win_rates),
+                    f"{summary.mean_turns:.2f}",
+                    f"{summary.std_turns:.2f}",
+                    summary.median_turns,
+                    summary.max_turns,
+                ]
+            )
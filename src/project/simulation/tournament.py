@@ -0,0 +1,214 @@
+import math
+from collections.abc import Callable, Iterable
+from functools import partial
+from statistics import fmean, variance
+from typing import NamedTuple
+
+import structlog
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.policy import Policy
+from project.simulation.backends import PROCESS, create_executor
+from project.simulation.worker import create_engine
+
+logger = structlog.get_logger(__name__)
+
+# Safety limit to prevent infinite games
+MAX_TURNS: int = 1000
+
+# Zero-argument callable building a fresh policy (must be picklable, e.g. a class)
+PolicyFactory = Callable[[], Policy]
+
+
+class PairedGames(NamedTuple):
+    """
+    Outcomes of every game played on one seed.
+
+    Attributes:
+        seed: int - Seed shared by every game.
+        baseline_winner: int | None - Winner of the game where every seat plays the baseline.
+        challenger_winners: tuple[int | None, ...] - Winner of the game where seat s plays the challenger, for each seat s.
+    """
+
+    seed: int
+    baseline_winner: int | None
+    challenger_winners: tuple[int | None, ...]
+
+
+class TournamentResult(NamedTuple):
+    """
+    Summary of a paired tournament.
+
+    Win rates are per seat: the probability that the seat playing a policy wins, averaged over seeds and seats.
+
+    Attributes:
+        seeds: int - Number of seeds played.
+        challenger_win_rate: float - Win rate of a seat playing the challenger against baseline opponents.
+        baseline_win_rate: float - Win rate of the same seat playing the baseline.
+        difference: float - Challenger win rate minus baseline win rate.
+        paired_standard_error: float - Standard error of the difference, using the per-seed pairing.
+        unpaired_standard_error: float - Standard error the difference would have with independent games.
+    """
+
+    seeds: int
+    challenger_win_rate: float
+    baseline_win_rate: float
+    difference: float
+    paired_standard_error: float
+    unpaired_standard_error: float
+
+
+def play_game(
+    seed: int, policies: list[Policy], max_turns: int = MAX_TURNS
+) -> int | None:
+    """
+    Plays one game to completion.
+
+    Args:
+        seed (int): Seed of the game.
+        policies (list[Policy]): Decision policy of each seat.
+        max_turns (int): Turn limit after which the game ends without a winner.
+
+    Returns:
+        int | None: Winning agent ID, or None if the turn limit was reached.
+    """
+    engine = create_engine(seed, policies)
+
+    winner_id = None
+
+    while winner_id is None and engine.turn_count < max_turns:
+        winner_id = engine.step()
+
+    return winner_id
+
+
+def play_paired(
+    seed: int,
+    challenger: PolicyFactory,
+    baseline: PolicyFactory,
+    max_turns: int = MAX_TURNS,
+) -> PairedGames:
+    """
+    Plays every seat assignment of the challenger against the baseline on one seed.
+
+    Since dice and deck draws only depend on the seed, every game sees the same dice and deck
+    streams, and the only difference between games is the policy of one seat.
+
+    Args:
+        seed (int): Seed shared by every game.
+        challenger (PolicyFactory): Builds the policy being evaluated.
+        baseline (PolicyFactory): Builds the reference policy, also used by the opponents.
+        max_turns (int): Turn limit after which a game ends without a winner.
+
+    Returns:
+        PairedGames: Winners of the baseline game and of each challenger seat assignment.
+    """
+    baseline_winner = play_game(
+        seed, [baseline() for _ in range(NUMBER_OF_PLAYERS)], max_turns
+    )
+
+    challenger_winners = []
+
+    for seat in range(NUMBER_OF_PLAYERS):
+        policies = [
+            challenger() if i == seat else baseline() for i in range(NUMBER_OF_PLAYERS)
+        ]
+        challenger_winners.append(play_game(seed, policies, max_turns))
+
+    return PairedGames(seed, baseline_winner, tuple(challenger_winners))
+
+
+def summarize(records: list[PairedGames]) -> TournamentResult:
+    """
+    Computes paired win-rate statistics from per-seed outcomes.
+
+    Seats of the same seed share their dice and deck streams, so each seed is one paired sample.
+
+    Args:
+        records (list[PairedGames]): Outcomes of every seed, at least two.
+
+    Returns:
+        TournamentResult: Win rates, their difference and its standard errors.
+    """
+    if len(records) < 2:
+        raise ValueError("At least two seeds are needed to estimate the variance")
+
+    # Win indicator of each (seed, seat) game, for each policy
+    challenger_wins = [
+        [winner == seat for seat, winner in enumerate(record.challenger_winners)]
+        for record in records
+    ]
+    baseline_wins = [
+        [record.baseline_winner == seat for seat in range(NUMBER_OF_PLAYERS)]
+        for record in records
+    ]
+
+    # Seats of a seed are correlated, so the seed-level mean difference is the paired sample
+    differences = [
+        fmean(c - b for c, b in zip(challenger, baseline))
+        for challenger, baseline in zip(challenger_wins, baseline_wins)
+    ]
+
+    challenger_flat = [float(win) for wins in challenger_wins for win in wins]
+    baseline_flat = [float(win) for wins in baseline_wins for win in wins]
+
+    n = len(records)
+    games = len(challenger_flat)
+
+    return TournamentResult(
+        seeds=n,
+        challenger_win_rate=fmean(challenger_flat),
+        baseline_win_rate=fmean(baseline_flat),
+        difference=fmean(differences),
+        paired_standard_error=math.sqrt(variance(differences) / n),
+        # Independent games per policy, one per (seed, seat)
+        unpaired_standard_error=math.sqrt(
+            (variance(challenger_flat) + variance(baseline_flat)) / games
+        ),
+    )
+
+
+def run_tournament(
+    challenger: PolicyFactory,
+    baseline: PolicyFactory,
+    seeds: Iterable[int],
+    max_turns: int = MAX_TURNS,
+    workers: int | None = None,
+    backend: str = PROCESS,
+    chunksize: int = 16,
+) -> TournamentResult:
+    """
+    Runs a paired head-to-head tournament with common random numbers.
+
+    Each seed is played once with every seat on the baseline, and once per seat with that seat
+    on the challenger. Seeds are distributed over a worker pool.
+
+    Args:
+        challenger (PolicyFactory): Builds the policy being evaluated.
+        baseline (PolicyFactory): Builds the reference policy, also used by the opponents.
+        seeds (Iterable[int]): Seeds to play.
+        max_turns (int): Turn limit after which a game ends without a winner.
+        workers (int | None): Number of workers. If 1, runs in the current thread. If None, uses every CPU.
+        backend (str): Kind of workers, see project.simulation.backends.
+        chunksize (int): Number of seeds sent to a worker at once.
+
+    Returns:
+        TournamentResult: Win rates, their difference and its standard errors.
+    """
+    play = partial(
+        play_paired, challenger=challenger, baseline=baseline, max_turns=max_turns
+    )
+
+    logger.info("Starting tournament", workers=workers, max_turns=max_turns)
+
+    if workers == 1:
+        records = [play(seed) for seed in seeds]
+    else:
+        with create_executor(backend, workers) as executor:
+            records = list(executor.map(play, seeds, chunksize=chunksize))
+
+    result = summarize(records)
+
+    logger.info("Tournament completed", **result._asdict())
+
+    return result
@@ -0,0 +1,71 @@
+from collections.abc import Callable
+
+from project.game.engine import GameEngine
+from project.game.events import EventBus, LoggingSubscriber
+from project.game.policy import Policy
+from project.game.rules import DEFAULT_RULES, Rules
+from project.logging import (
+    SinkConnection,
+    configure_logging_from_settings,
+    game_logger,
+    is_traced,
+)
+from project.settings import get_settings
+
+
+def initialize_worker(sink: SinkConnection | None = None) -> None:
+    """
+    Prepares a worker process to run simulations.
+
+    Worker processes may not inherit the parent's logging configuration (spawn and forkserver
+    start methods re-import everything), so logging is configured again from the settings.
+    Forked workers inherit the parent's handlers but not their threads, so they are replaced too.
+    With the file sink, workers send their log lines to the parent's sink instead of opening
+    the file themselves.
+
+    Args:
+        sink (SinkConnection | None): File sink of the parent process, see project.logging.active_sink.
+    """
+    settings = get_settings()
+
+    configure_logging_from_settings(settings.log, sink)
+
+
+def create_engine(
+    seed: int,
+    policies: list[Policy],
+    engine: Callable[..., GameEngine] = GameEngine,
+    events: EventBus | None = None,
+    rules: Rules = DEFAULT_RULES,
+) -> GameEngine:
+    """
+    Builds the engine of a simulated game, logging to its sampled trace logger.
+
+    Sampled games also narrate their events (turns, landings, cards, wins) to their trace, like
+    a game played with `play`, so traces read as a story and can be ingested. The other games
+    stay silent and publish no events unless `events` has subscribers.
+
+    Args:
+        seed (int): Seed of the game.
+        policies (list[Policy]): Decision policy of each seat.
+        engine (Callable[..., GameEngine]): Builds the engine, the reference GameEngine by default.
+        events (EventBus | None): Bus receiving the game events. If None, the engine creates one.
+        rules (Rules): Board and deck composition.
+
+    Returns:
+        GameEngine: The engine, before its first turn.
+    """
+    bound_logger = game_logger(seed)
+
+    game = engine(
+        seed=seed,
+        policies=policies,
+        events=events,
+        rules=rules,
+        bound_logger=bound_logger,
+    )
+
+    if is_traced(bound_logger):
+        game.events.subscribe(LoggingSubscriber(bound_logger))
+
+    return game
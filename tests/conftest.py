@@ -0,0 +1,34 @@
+import logging
+from collections.abc import Iterator
+
+import pytest
+import structlog
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging() -> None:
+    """
+    Drops game logs below warnings, so tests do not spend their time rendering them.
+    """
+    structlog.reset_defaults()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+
+@pytest.fixture
+def root_handlers() -> Iterator[None]:
+    """
+    Restores the root logger handlers replaced by configure_logging.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+
+    yield
+
+    for handler in root.handlers[:]:
+        if handler not in handlers:
+            root.removeHandler(handler)
+            handler.close()
+
+    root.handlers[:] = handlers
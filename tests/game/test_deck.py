@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from project.game.engine import GameEngine
+from project.game.queue import ACTION_NAMES, count_actions
+
+TURNS = 300
+
+
+def assert_counts_match(engine: GameEngine) -> None:
+    """
+    Checks the incremental deck counts against a count of the queue.
+    """
+    assert tuple(engine.deck_counts.tolist()) == count_actions(engine.action_queue)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_counts_follow_draws_and_replenishments(seed: int) -> None:
+    # Start from an exhausted deck, so that the first card replenishes it
+    start = GameEngine(seed=seed).scenario()._replace(action_queue=())
+    engine = GameEngine(seed=seed, scenario=start)
+    replenished = 0
+
+    for _ in range(TURNS):
+        before = len(engine.action_queue)
+
+        winner_id = engine.step()
+        replenished += len(engine.action_queue) > before
+
+        assert_counts_match(engine)
+
+        if winner_id is not None:
+            engine = GameEngine(seed=seed + 100)
+
+    assert replenished > 0
+
+
+def test_next_card_probabilities() -> None:
+    engine = GameEngine(seed=0)
+
+    probabilities = engine.next_card_probabilities()
+
+    assert probabilities.sum() == pytest.approx(1.0)
+    assert np.allclose(
+        probabilities,
+        [
+            engine.action_queue.count(action) / len(engine.action_queue)
+            for action in ACTION_NAMES
+        ],
+    )
+
+    engine.action_queue.clear()
+    engine.deck_counts[:] = 0
+    out = np.empty(len(ACTION_NAMES))
+
+    assert engine.next_card_probabilities(out) is out
+    assert np.allclose(out, engine.full_deck / engine.rules.action_queue_size)
+
+
+def test_snapshots_restore_the_counts() -> None:
+    engine = GameEngine(seed=2)
+    snapshot = engine.snapshot()
+
+    for _ in range(40):
+        engine.step()
+
+    engine.restore(snapshot)
+
+    assert tuple(engine.deck_counts.tolist()) == snapshot.deck_counts
+    assert_counts_match(engine)
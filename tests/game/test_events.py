@@ -0,0 +1,64 @@
+from project.game.engine import GameEngine
+from project.game.events import (
+    EventBus,
+    GameEvent,
+    GameWon,
+    TileResolved,
+    TurnStarted,
+)
+
+
+def play(engine: GameEngine) -> int | None:
+    winner = None
+
+    while winner is None and engine.turn_count < 1000:
+        winner = engine.step()
+
+    return winner
+
+
+def test_bus_is_active_only_with_subscribers() -> None:
+    bus = EventBus()
+    received: list[GameEvent] = []
+
+    assert not bus.active
+
+    bus.subscribe(received.append, TurnStarted)
+    bus.subscribe(received.append)
+    assert bus.active
+
+    bus.publish(TurnStarted(turn=0, agent_id=0))
+    bus.publish(GameWon(agent_id=0, turn=0))
+    assert len(received) == 3
+
+    bus.unsubscribe(received.append)
+    assert not bus.active
+
+
+def test_events_follow_the_game() -> None:
+    bus = EventBus()
+    events: list[GameEvent] = []
+    bus.subscribe(events.append)
+
+    engine = GameEngine(seed=21, events=bus)
+    winner = play(engine)
+
+    turns = [event for event in events if isinstance(event, TurnStarted)]
+    resolved = [event for event in events if isinstance(event, TileResolved)]
+    won = [event for event in events if isinstance(event, GameWon)]
+
+    assert [event.turn for event in turns] == list(range(engine.turn_count + 1))
+    assert len(resolved) == len(turns)
+    assert resolved[-1].state == engine.agents[winner].condition
+    assert won == [GameWon(agent_id=winner, turn=engine.turn_count)]
+
+
+def test_subscribers_do_not_change_the_game() -> None:
+    bus = EventBus()
+    bus.subscribe(lambda event: None)
+
+    silent = GameEngine(seed=22)
+    observed = GameEngine(seed=22, events=bus)
+
+    assert play(silent) == play(observed)
+    assert silent.snapshot() == observed.snapshot()
@@ -0,0 +1,57 @@
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.engine import GameEngine
+from project.game.fastforward import FastForwardEngine
+from project.game.policy import RandomPolicy
+
+GAMES = 300
+
+MAX_TURNS = 500
+
+
+def play(engine: GameEngine, fast: bool) -> tuple[int | None, int]:
+    """
+    Plays a game to the end or the turn limit, returning its winner and turn count.
+    """
+    winner_id = None
+
+    while winner_id is None and engine.turn_count < MAX_TURNS:
+        winner_id = engine.advance(MAX_TURNS) if fast else engine.step()
+
+    return winner_id, engine.turn_count
+
+
+def new_engine(engine_class: type[GameEngine], seed: int) -> GameEngine:
+    """
+    Builds an engine with random policies.
+    """
+    return engine_class(
+        seed=seed, policies=[RandomPolicy() for _ in range(NUMBER_OF_PLAYERS)]
+    )
+
+
+def test_step_follows_the_reference_engine() -> None:
+    for seed in range(10):
+        reference = new_engine(GameEngine, seed)
+        fast = new_engine(FastForwardEngine, seed)
+
+        assert play(fast, fast=False) == play(reference, fast=False)
+        assert fast.table.states.tolist() == reference.table.states.tolist()
+
+
+def test_advance_stops_at_the_turn_limit() -> None:
+    engine = new_engine(FastForwardEngine, 0)
+
+    while engine.advance(5) is None and engine.turn_count < 5:
+        pass
+
+    assert engine.turn_count == 5
+
+
+def test_advance_plays_exactly_like_the_reference_engine() -> None:
+    for seed in range(GAMES):
+        reference = new_engine(GameEngine, seed)
+        fast = new_engine(FastForwardEngine, seed)
+
+        assert play(fast, fast=True) == play(reference, fast=False)
+        assert fast.table.states.tolist() == reference.table.states.tolist()
+        assert fast.board_position == reference.board_position
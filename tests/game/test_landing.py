@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from project.game.constants import NUMBER_OF_INGREDIENTS, NUMBER_OF_PLAYERS
+from project.game.dice import movement_distribution
+from project.game.engine import GameEngine
+from project.game.landing import (
+    LANDING_HORIZON,
+    landing_probabilities,
+    landing_table,
+    needed_landing_probabilities,
+)
+
+
+def enumerate_landings(codes: list[int], start: int, rolls: int) -> dict[int, float]:
+    """
+    Lists every sequence of rolls to get the distribution of the tile code of the last landing.
+    """
+    positions = {start: 1.0}
+
+    for _ in range(rolls):
+        next_positions: dict[int, float] = {}
+
+        for position, chance in positions.items():
+            for steps, probability in movement_distribution():
+                target = (position + steps) % len(codes)
+                next_positions[target] = (
+                    next_positions.get(target, 0.0) + chance * probability
+                )
+
+        positions = next_positions
+
+    landings: dict[int, float] = {}
+
+    for position, chance in positions.items():
+        landings[codes[position]] = landings.get(codes[position], 0.0) + chance
+
+    return landings
+
+
+@pytest.mark.parametrize("start", [0, 17, 34])
+def test_table_matches_enumerated_rolls(start: int) -> None:
+    engine = GameEngine(seed=3)
+    codes = engine.board_codes.tolist()
+    table = landing_table(engine.board_codes)
+
+    for turn in range(LANDING_HORIZON):
+        expected = np.zeros(table.shape[2])
+
+        for code, chance in enumerate_landings(codes, start, turn + 1).items():
+            expected[code] = chance
+
+        np.testing.assert_allclose(table[start, turn], expected, atol=1e-6)
+
+
+def test_table_is_computed_once_per_engine() -> None:
+    engine = GameEngine(seed=4)
+    other = GameEngine(seed=4)
+
+    assert engine.landing is engine.landing
+    assert other.landing is engine.landing
+    assert not engine.landing.flags.writeable
+
+
+def test_batched_lookups() -> None:
+    engines = [GameEngine(seed=seed) for seed in range(5)]
+
+    for engine in engines:
+        engine.step()
+
+    probabilities = landing_probabilities(engines)
+    needed = needed_landing_probabilities(engines)
+
+    for row, engine in enumerate(engines):
+        np.testing.assert_array_equal(
+            probabilities[row], engine.landing[engine.board_position]
+        )
+
+        for turn in range(LANDING_HORIZON):
+            seat = (engine.current_agent_index + turn) % NUMBER_OF_PLAYERS
+            mask = engine.agents[seat].needed_mask
+            expected = sum(
+                probabilities[row, turn, ingredient]
+                for ingredient in range(NUMBER_OF_INGREDIENTS)
+                if mask >> ingredient & 1
+            )
+
+            assert needed[row, turn] == pytest.approx(expected, abs=1e-6)
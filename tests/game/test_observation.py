@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from project.game.board import encode_board
+from project.game.constants import NUMBER_OF_INGREDIENTS
+from project.game.engine import GameEngine
+from project.game.observation import (
+    LOOKAHEAD_TILES,
+    OBSERVATION_LAYOUT,
+    OBSERVATION_SIZE,
+    allocate_observations,
+    encode_observations,
+)
+from project.game.queue import ACTION_NAMES
+
+
+def flags(mask: int) -> list[float]:
+    return [float(mask >> i & 1) for i in range(NUMBER_OF_INGREDIENTS)]
+
+
+def reference_observation(engine: GameEngine, seat: int) -> np.ndarray:
+    """
+    Encodes one observation feature by feature, with plain Python.
+    """
+    agents = engine.agents
+    opponents = [agents[(seat + k) % len(agents)] for k in range(1, len(agents))]
+    codes = encode_board(engine.board).tolist()
+    remaining = len(engine.action_queue)
+
+    features = {
+        "needed": flags(agents[seat].needed_mask),
+        "held": flags(agents[seat].state),
+        "opponent_held": [f for agent in opponents for f in flags(agent.state)],
+        "opponent_needed": [f for agent in opponents for f in flags(agent.needed_mask)],
+        "position": [
+            float(i == engine.board_position) for i in range(len(engine.board))
+        ],
+        "lookahead": [
+            float(codes[(engine.board_position + offset) % len(codes)] == code)
+            for offset in range(1, LOOKAHEAD_TILES + 1)
+            for code in range(NUMBER_OF_INGREDIENTS + 3)
+        ],
+        "deck": [float(engine.action_queue.count(name)) for name in ACTION_NAMES],
+        "next_card": [
+            engine.action_queue.count(name) / remaining for name in ACTION_NAMES
+        ],
+    }
+
+    row = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+
+    for name, columns in OBSERVATION_LAYOUT.items():
+        row[columns] = features[name]
+
+    return row
+
+
+def played_engines(count: int, turns: int) -> list[GameEngine]:
+    engines = [GameEngine(seed=seed) for seed in range(count)]
+
+    for engine in engines:
+        for _ in range(turns):
+            if engine.step() is not None or not engine.action_queue:
+                break
+
+    return engines
+
+
+def test_rows_match_the_reference_encoding() -> None:
+    engines = played_engines(4, 10)
+    out = allocate_observations(len(engines))
+
+    rows = encode_observations(engines, out)
+
+    for engine, row in zip(engines, rows):
+        expected = reference_observation(engine, engine.current_agent_index)
+        np.testing.assert_allclose(row, expected, rtol=1e-6)
+
+
+def test_explicit_seats_and_spare_rows() -> None:
+    engines = played_engines(2, 5)
+    out = np.full((3, OBSERVATION_SIZE), 7.0, dtype=np.float32)
+
+    rows = encode_observations(engines, out, seats=[4, 1])
+
+    assert rows.base is out
+    np.testing.assert_allclose(rows[0], reference_observation(engines[0], 4))
+    np.testing.assert_allclose(rows[1], reference_observation(engines[1], 1))
+    assert (out[2] == 7.0).all()
+
+
+@pytest.mark.parametrize(
+    "out",
+    [
+        np.zeros((1, OBSERVATION_SIZE), dtype=np.float64),
+        np.zeros((1, OBSERVATION_SIZE + 1), dtype=np.float32),
+        np.zeros((0, OBSERVATION_SIZE), dtype=np.float32),
+    ],
+)
+def test_invalid_buffers_are_rejected(out: np.ndarray) -> None:
+    with pytest.raises(ValueError):
+        encode_observations([GameEngine(seed=0)], out)
@@ -0,0 +1,68 @@
+import pytest
+
+from project.game.constants import NUMBER_OF_INGREDIENTS
+from project.game.engine import GameEngine
+from project.game.rules import Rules
+
+
+def test_engine_scenarios_are_valid() -> None:
+    engine = GameEngine(seed=0)
+
+    for _ in range(30):
+        engine.scenario().validate()
+
+        if engine.step() is not None:
+            break
+
+
+@pytest.mark.parametrize("seat", range(2))
+def test_states_outside_the_condition_are_rejected(seat: int) -> None:
+    scenario = GameEngine(seed=1).scenario()
+    condition = scenario.conditions[seat]
+    unneeded = ((1 << NUMBER_OF_INGREDIENTS) - 1) & ~condition
+    extra = unneeded & -unneeded
+
+    states = list(scenario.states)
+    states[seat] = extra
+
+    with pytest.raises(ValueError, match="outside its condition"):
+        scenario._replace(states=tuple(states)).validate()
+
+
+def test_partial_states_are_accepted() -> None:
+    scenario = GameEngine(seed=2).scenario()
+    states = [condition & -condition for condition in scenario.conditions]
+
+    scenario._replace(states=tuple(states)).validate()
+
+
+def test_won_agents_are_rejected() -> None:
+    scenario = GameEngine(seed=3).scenario()
+    states = (scenario.conditions[0], *scenario.states[1:])
+
+    with pytest.raises(ValueError, match="already won"):
+        scenario._replace(states=states).validate()
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("board_position", -1),
+        ("current_agent_index", 99),
+        ("turn_count", -1),
+        ("action_queue", ("NOT_A_CARD",)),
+        ("conditions", (0,)),
+    ],
+)
+def test_invalid_fields_are_rejected(field: str, value: object) -> None:
+    scenario = GameEngine(seed=4).scenario()
+
+    with pytest.raises(ValueError):
+        scenario._replace(**{field: value}).validate()
+
+
+def test_board_must_match_the_rules() -> None:
+    scenario = GameEngine(seed=5).scenario()
+
+    with pytest.raises(ValueError, match="tile counts"):
+        scenario.validate(Rules(tiles_per_ingredient=1))
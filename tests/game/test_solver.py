@@ -0,0 +1,98 @@
+from collections import Counter
+
+import pytest
+
+from project.game.dice import movement_distribution
+from project.game.engine import GameEngine
+from project.game.policy import CHOOSE
+from project.game.solver import CHEF_AMOUNT, EndgamePolicy, EndgameSolver
+
+
+def one_short_engine(seed: int) -> GameEngine:
+    """
+    Builds an engine whose first agent misses one ingredient, which another agent holds.
+    """
+    engine = GameEngine(seed=seed)
+    condition = engine.agents[0].condition
+    missing = condition & -condition
+
+    states = [0] * len(engine.agents)
+    states[0] = condition ^ missing
+    states[1] = missing & engine.agents[1].condition
+
+    scenario = engine.scenario()._replace(states=tuple(states))
+
+    return GameEngine(seed=seed, scenario=scenario)
+
+
+def one_turn_win_probability(engine: GameEngine) -> float:
+    """
+    Plays every dice total and every next card through the engine.
+    """
+    scenario = engine.scenario()
+    deck = Counter(scenario.action_queue)
+    probability = 0.0
+
+    for movement, chance in movement_distribution():
+        for card, copies in deck.items():
+            rest = list(scenario.action_queue)
+            rest.remove(card)
+            start = scenario._replace(action_queue=(card, *rest))
+
+            game = GameEngine(seed=0, scenario=start)
+            won = game.step(movement) == start.current_agent_index
+            probability += chance * copies / len(scenario.action_queue) * won
+
+    return probability
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_one_turn_value_matches_the_engine(seed: int) -> None:
+    engine = one_short_engine(seed)
+
+    value = EndgameSolver(engine, horizon=1).solve(engine.snapshot())
+
+    assert value[0] == pytest.approx(one_turn_win_probability(engine))
+    assert value[1:] == (0.0,) * (len(value) - 1)
+
+
+def test_values_are_probabilities() -> None:
+    engine = one_short_engine(4)
+
+    value = EndgameSolver(engine, horizon=3).solve(engine.snapshot())
+
+    assert all(0.0 <= probability <= 1.0 for probability in value)
+    assert sum(value) <= 1.0 + 1e-9
+
+
+def test_longer_horizons_never_lose_value() -> None:
+    engine = one_short_engine(5)
+    snapshot = engine.snapshot()
+
+    short = EndgameSolver(engine, horizon=1).solve(snapshot)
+    long = EndgameSolver(engine, horizon=2).solve(snapshot)
+
+    assert long[0] >= short[0]
+
+
+def test_best_chef_selection_completes_the_condition() -> None:
+    engine = one_short_engine(6)
+    agent = engine.agents[0]
+
+    selection = EndgameSolver(engine, horizon=1).best_selection(
+        engine.snapshot(), CHOOSE, CHEF_AMOUNT
+    )
+
+    assert selection == agent.needed_mask
+
+
+def test_policy_plays_a_full_game() -> None:
+    engine = GameEngine(seed=9)
+    engine.policies = [EndgamePolicy(horizon=1)] * len(engine.agents)
+
+    winner = None
+
+    while winner is None and engine.turn_count < 1000:
+        winner = engine.step()
+
+    assert winner is not None
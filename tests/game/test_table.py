@@ -0,0 +1,56 @@
+import pytest
+
+from project.game.agent import Agent
+from project.game.engine import GameEngine
+from project.game.table import AgentTable
+
+CONDITIONS = [0b00011111, 0b00111110, 0b01111100]
+
+
+def test_views_share_the_table() -> None:
+    table = AgentTable(CONDITIONS)
+    agents = [Agent.view(table, index) for index in range(len(CONDITIONS))]
+
+    agents[1].choose(0b00000110)
+
+    assert table.states.tolist() == [0, 0b00000110, 0]
+    assert agents[1].needed_count == 3
+    assert table.needed_counts().tolist() == [5, 3, 5]
+
+
+def test_steal_moves_only_held_ingredients() -> None:
+    table = AgentTable(CONDITIONS, [0b00000011, 0b00000100, 0])
+    thief, target, _ = (Agent.view(table, index) for index in range(3))
+
+    thief.steal_from(target, 0b00001100)
+
+    assert thief.state == 0b00000111
+    assert target.state == 0
+
+
+def test_owned_by_others_excludes_the_agent() -> None:
+    table = AgentTable(CONDITIONS, [0b0001, 0b0010, 0b1100])
+
+    assert table.owned_by_others(0) == 0b1110
+    assert table.owned_by_others(2) == 0b0011
+
+
+def test_winner_is_the_first_complete_agent() -> None:
+    table = AgentTable(CONDITIONS, [0, CONDITIONS[1], CONDITIONS[2]])
+
+    assert table.won().tolist() == [False, True, True]
+    assert table.winner() == 1
+    assert AgentTable(CONDITIONS).winner() is None
+
+
+def test_states_must_match_conditions() -> None:
+    with pytest.raises(ValueError):
+        AgentTable(CONDITIONS, [0])
+
+
+def test_engine_agents_are_table_views() -> None:
+    engine = GameEngine(seed=7)
+
+    for agent in engine.agents:
+        assert agent.table is engine.table
+        assert agent.condition == int(engine.table.conditions[agent.index])
@@ -0,0 +1,78 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from project.game.engine import GameEngine
+from project.game.queue import ACTION_NAMES, DECK_DTYPE, count_actions
+from project.game.transitions import NO_CARD, transitions
+
+
+def branch_probabilities(result) -> np.ndarray:
+    """
+    Probability of each chance branch, from its first row.
+    """
+    _, first = np.unique(result.branch, return_index=True)
+
+    return result.probability[first]
+
+
+def empty_deck_engine(seed: int) -> GameEngine:
+    """
+    Engine of a game whose deck is exhausted, so the next card reshuffles a full deck.
+    """
+    engine = GameEngine(seed=seed)
+
+    return GameEngine(seed=seed, scenario=engine.scenario()._replace(action_queue=()))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_probabilities_sum_to_one(seed: int) -> None:
+    result = transitions(GameEngine(seed=seed))
+
+    assert branch_probabilities(result).sum() == pytest.approx(1.0)
+    assert result.policy_probabilities().sum() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_successors_are_consistent(seed: int) -> None:
+    engine = GameEngine(seed=seed)
+    result = transitions(engine)
+
+    assert result.deck.dtype == DECK_DTYPE
+
+    for row, snapshot in enumerate(result.snapshots):
+        assert snapshot.deck_counts == count_actions(snapshot.action_queue)
+        assert snapshot.deck_counts == tuple(result.deck[row].tolist())
+        assert snapshot.states == tuple(result.states[row].tolist())
+
+        engine.restore(snapshot)
+        engine.step()
+
+
+def test_empty_deck_successors_hold_a_shuffled_deck() -> None:
+    engine = empty_deck_engine(1)
+    result = transitions(engine)
+    snapshot = engine.snapshot()
+    full_deck = Counter(engine.rules.action_queue_composition())
+
+    cards = np.flatnonzero(result.card != NO_CARD)
+
+    assert len(cards)
+
+    composition_order = list(full_deck.elements())
+
+    for row in cards.tolist():
+        successor = result.snapshots[row]
+        drawn = ACTION_NAMES[result.card[row]]
+        unshuffled = composition_order.copy()
+        unshuffled.remove(drawn)
+
+        assert Counter(successor.action_queue) + Counter([drawn]) == full_deck
+        assert successor.action_queue != tuple(unshuffled)
+        assert successor.rng_state != snapshot.rng_state
+
+    # Turns without a card leave the deck empty and the RNG untouched
+    for row in np.flatnonzero(result.card == NO_CARD).tolist():
+        assert result.snapshots[row].action_queue == ()
+        assert result.snapshots[row].rng_state == snapshot.rng_state
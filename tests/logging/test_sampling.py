@@ -0,0 +1,92 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from project.logging import configure_logging_from_settings, game_logger, is_traced
+from project.logging.sampling import configure_tracing
+from project.logging.sink import BufferedFileSink
+from project.settings import get_settings
+from project.simulation.ingest import ingest_logs
+from project.simulation.results import ResultsStore, simulate
+
+
+def close_sink() -> None:
+    """
+    Flushes the file sink installed on the root logger.
+    """
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, BufferedFileSink):
+            handler.close()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sampled_games_write_their_narrative(
+    workers: int,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    root_handlers: None,
+) -> None:
+    path = tmp_path / "log.jsonl"
+    monkeypatch.setenv("PROJECT_LOG__SINK", "file")
+    monkeypatch.setenv("PROJECT_LOG__FILE_PATH", str(path))
+    monkeypatch.setenv("PROJECT_LOG__LEVEL", "WARNING")
+    monkeypatch.setenv("PROJECT_LOG__TRACE_SEEDS", "[3]")
+    get_settings.cache_clear()
+
+    try:
+        configure_logging_from_settings(get_settings().log)
+        simulate(ResultsStore(tmp_path / "results"), range(6), workers=workers)
+    finally:
+        get_settings.cache_clear()
+
+    close_sink()
+
+    lines = [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+    events = {line["event"] for line in lines if line.get("seed") == 3}
+
+    assert {"Turn started", "Agent landed on tile", "Agent won"} <= events
+    assert {line.get("seed") for line in lines} <= {3, None}
+
+
+def test_games_over_budget_are_not_traced() -> None:
+    try:
+        configure_tracing(1.0, seeds=[100, 101], max_games_per_second=1e-6, burst=2)
+
+        traced = [is_traced(game_logger(seed)) for seed in range(5)]
+        listed = [is_traced(game_logger(seed)) for seed in (100, 101)]
+    finally:
+        configure_tracing(0.0)
+
+    assert traced == [True, True, False, False, False]
+    assert listed == [True, True]
+
+
+def test_rate_limited_traces_stay_whole(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    root_handlers: None,
+) -> None:
+    path = tmp_path / "log.jsonl"
+    monkeypatch.setenv("PROJECT_LOG__SINK", "file")
+    monkeypatch.setenv("PROJECT_LOG__FILE_PATH", str(path))
+    monkeypatch.setenv("PROJECT_LOG__LEVEL", "WARNING")
+    monkeypatch.setenv("PROJECT_LOG__TRACE_SAMPLE_RATE", "1.0")
+    monkeypatch.setenv("PROJECT_LOG__TRACE_MAX_GAMES_PER_SECOND", "0.000001")
+    monkeypatch.setenv("PROJECT_LOG__TRACE_BURST", "3")
+    get_settings.cache_clear()
+
+    try:
+        configure_logging_from_settings(get_settings().log)
+        simulate(ResultsStore(tmp_path / "results"), range(20), workers=1)
+    finally:
+        get_settings.cache_clear()
+        configure_tracing(0.0)
+
+    close_sink()
+
+    stats = ingest_logs([path], tmp_path / "trajectories")
+
+    assert stats.games == 3
+    assert stats.incomplete == 0
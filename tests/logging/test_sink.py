@@ -0,0 +1,174 @@
+import json
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from project.logging import active_sink, configure_logging
+from project.logging.sink import BufferedFileSink
+from project.logging.types import LogFormat, LogLevel
+from project.settings import get_settings
+from project.simulation.worker import initialize_worker
+
+
+class StalledSink(BufferedFileSink):
+    """
+    Sink whose writer waits for a signal before writing anything.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.release = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def write(self, lines: list[str]) -> None:
+        self.release.wait()
+        super().write(lines)
+
+
+def read_lines(path: Path) -> list[str]:
+    files = sorted(path.parent.glob(f"{path.name}*"), reverse=True)
+
+    return [line for file in files for line in file.read_text("utf-8").splitlines()]
+
+
+def test_lines_are_written_in_order(tmp_path: Path) -> None:
+    path = tmp_path / "log.jsonl"
+    sink = BufferedFileSink(path, 0, 0, buffer_size=1000, batch_size=7)
+
+    for index in range(100):
+        sink.enqueue(f"line {index}")
+
+    sink.close()
+
+    assert read_lines(path) == [f"line {index}" for index in range(100)]
+
+
+def test_rotation_counts_bytes(tmp_path: Path) -> None:
+    path = tmp_path / "log.jsonl"
+    sink = BufferedFileSink(
+        path, max_bytes=64, backup_count=10, buffer_size=100, batch_size=1
+    )
+    line = "é" * 20
+
+    for _ in range(10):
+        sink.enqueue(line)
+
+    sink.close()
+
+    files = list(tmp_path.iterdir())
+
+    assert all(file.stat().st_size <= 64 for file in files)
+    assert read_lines(path) == [line] * 10
+
+
+def test_without_backups_the_file_is_never_rotated(tmp_path: Path) -> None:
+    path = tmp_path / "log.jsonl"
+    sink = BufferedFileSink(
+        path, max_bytes=64, backup_count=0, buffer_size=100, batch_size=1
+    )
+
+    for index in range(10):
+        sink.enqueue(f"line {index:02d} " + "x" * 20)
+
+    sink.close()
+
+    assert [file.name for file in tmp_path.iterdir()] == ["log.jsonl"]
+    assert len(read_lines(path)) == 10
+
+
+def test_empty_files_are_not_rotated(tmp_path: Path) -> None:
+    path = tmp_path / "log.jsonl"
+    sink = BufferedFileSink(
+        path, max_bytes=8, backup_count=3, buffer_size=100, batch_size=1
+    )
+
+    sink.enqueue("first line longer than the limit")
+    sink.enqueue("second line")
+    sink.close()
+
+    assert sorted(file.name for file in tmp_path.iterdir()) == [
+        "log.jsonl",
+        "log.jsonl.1",
+    ]
+    assert path.read_text("utf-8") == "second line\n"
+
+
+def test_lines_after_close_are_dropped(tmp_path: Path) -> None:
+    path = tmp_path / "log.jsonl"
+    sink = BufferedFileSink(path, 0, 0, buffer_size=2, batch_size=1)
+    sink.enqueue("before")
+    sink.close()
+
+    # More lines than the queue holds: blocking puts would never return
+    late = threading.Thread(
+        target=lambda: [sink.enqueue("after") for _ in range(10)], daemon=True
+    )
+    late.start()
+    late.join(timeout=5)
+
+    assert not late.is_alive()
+    assert not sink.blocking
+    assert read_lines(path) == ["before"]
+
+
+def test_dropped_lines_are_reported_through_the_renderer(
+    tmp_path: Path, root_handlers: None
+) -> None:
+    path = tmp_path / "log.jsonl"
+    sink = StalledSink(path, 0, 0, buffer_size=2, batch_size=1)
+    configure_logging(LogLevel.INFO, LogFormat.JSON, handler=sink)
+
+    logger = logging.getLogger("test")
+
+    for index in range(10):
+        logger.info("line %d", index)
+
+    sink.release.set()
+    sink.close()
+
+    report = json.loads(read_lines(path)[-1])
+
+    assert report["event"] == "Log records dropped"
+    assert report["level"] == "warning"
+    assert 0 < report["dropped"] <= 10
+
+
+@pytest.mark.parametrize("method", ["fork", "forkserver", "spawn"])
+def test_worker_processes_write_through_the_parent_sink(
+    method: str,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    root_handlers: None,
+) -> None:
+    path = tmp_path / "log.jsonl"
+    monkeypatch.setenv("PROJECT_LOG__SINK", "file")
+    monkeypatch.setenv("PROJECT_LOG__FILE_PATH", str(path))
+    get_settings.cache_clear()
+
+    # The sink and the pool both use the default start method, as in the runners
+    default = multiprocessing.get_start_method()
+    multiprocessing.set_start_method(method, force=True)
+
+    messages = [f"worker line {index}" for index in range(20)]
+
+    try:
+        sink = BufferedFileSink(path, 0, 0, buffer_size=1000, batch_size=10)
+        configure_logging(LogLevel.INFO, LogFormat.JSON, handler=sink)
+
+        with ProcessPoolExecutor(
+            max_workers=2,
+            initializer=initialize_worker,
+            initargs=(active_sink(),),
+        ) as executor:
+            list(executor.map(logging.getLogger("worker").warning, messages))
+    finally:
+        multiprocessing.set_start_method(default, force=True)
+        get_settings.cache_clear()
+
+    sink.close()
+
+    assert sorted(read_lines(path)) == sorted(messages)
+    assert [file.name for file in tmp_path.iterdir()] == ["log.jsonl"]
@@ -0,0 +1,49 @@
+from functools import partial
+
+import pytest
+
+from project.simulation.backends import (
+    BACKENDS,
+    INTERPRETER,
+    PROCESS,
+    THREAD,
+    available_backends,
+    create_executor,
+    interpreter_support_error,
+)
+from project.simulation.benchmark import benchmark_backends
+from project.simulation.results import play_result
+
+
+def test_backends_play_like_the_current_thread() -> None:
+    play = partial(play_result, max_turns=50)
+    expected = [play(seed) for seed in range(4)]
+
+    for backend in available_backends():
+        with create_executor(backend, 2) as executor:
+            assert list(executor.map(play, range(4))) == expected
+
+
+def test_interpreter_backend_is_gated() -> None:
+    assert {PROCESS, THREAD} <= set(available_backends()) <= set(BACKENDS)
+
+    if interpreter_support_error() is None:
+        pytest.skip("Sub-interpreters can run games here")
+
+    assert INTERPRETER not in available_backends()
+
+    with pytest.raises(RuntimeError):
+        create_executor(INTERPRETER, 1)
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError):
+        create_executor("cluster", 1)
+
+
+def test_benchmark_skips_unavailable_backends() -> None:
+    results = benchmark_backends([1], 4, [INTERPRETER, THREAD], chunksize=2)
+
+    assert results[-1].backend == THREAD
+    assert results[-1].speedup == 1.0
+    assert len(results) == 1 + (interpreter_support_error() is None)
@@ -0,0 +1,128 @@
+import time
+
+import numpy as np
+import pytest
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.engine import GameEngine
+from project.game.policy import CHOOSE
+from project.simulation.batcher import BatchedPolicy, DecisionBatcher, DecisionClient
+from project.simulation.tournament import play_game
+
+
+def lowest_bits(
+    observations: np.ndarray, masks: np.ndarray, kinds: np.ndarray, amounts: np.ndarray
+) -> np.ndarray:
+    """
+    Batch model selecting the lowest valid ingredients of every decision.
+    """
+    selected = np.zeros_like(masks)
+    remaining = masks.copy()
+
+    for _ in range(int(amounts.max())):
+        lowest = remaining & -remaining
+        take = np.bitwise_count(selected) < amounts
+        selected[take] |= lowest[take]
+        remaining[take] &= ~lowest[take]
+
+    return selected
+
+
+def failing(*arrays: np.ndarray) -> np.ndarray:
+    """
+    Batch model that always raises.
+    """
+    raise ValueError("model failure")
+
+
+class SlowFirstBatch:
+    """
+    Batch model answering its first batch late.
+    """
+
+    def __init__(self) -> None:
+        self.answered = False
+
+    def __call__(self, *arrays: np.ndarray) -> np.ndarray:
+        if not self.answered:
+            self.answered = True
+            time.sleep(0.3)
+
+        return lowest_bits(*arrays)
+
+
+def request(
+    batcher: DecisionBatcher, mask: int, amount: int, timeout: float = 5.0
+) -> int:
+    """
+    Sends one decision to a batcher from the current process.
+    """
+    engine = GameEngine(seed=0)
+    client = DecisionClient(batcher.ring, timeout=timeout)
+
+    return client.request(engine, engine.agents[0], CHOOSE, mask, amount)
+
+
+def test_decisions_are_answered_by_the_model() -> None:
+    with DecisionBatcher(lowest_bits) as batcher:
+        assert request(batcher, 0b10110, 2) == 0b00110
+        assert request(batcher, 0b10000, 1) == 0b10000
+
+        stats = batcher.stats()
+
+    assert stats.decisions == 2
+    assert stats.batches == 2
+
+
+def test_model_errors_fail_the_request_and_keep_serving() -> None:
+    with DecisionBatcher(failing) as batcher:
+        with pytest.raises(RuntimeError):
+            request(batcher, 0b11, 1)
+
+        batcher.model = lowest_bits
+
+        assert request(batcher, 0b11, 1) == 0b01
+
+
+@pytest.mark.parametrize(
+    "model, min_batch",
+    [
+        # Given up on while the model evaluates it
+        (SlowFirstBatch(), 1),
+        # Given up on before the batcher collects it
+        (lowest_bits, 2),
+    ],
+)
+def test_abandoned_slots_are_freed(model, min_batch: int) -> None:
+    capacity = 2
+
+    with DecisionBatcher(
+        model, capacity=capacity, min_batch=min_batch, max_wait=0.1
+    ) as batcher:
+        with pytest.raises(TimeoutError):
+            request(batcher, 0b11, 1, timeout=0.02)
+
+        # Enough requests to wrap around the ring onto the abandoned slot
+        for _ in range(2 * capacity + 1):
+            assert request(batcher, 0b110, 1) == 0b010
+
+
+def test_requests_fail_when_the_batcher_is_not_serving() -> None:
+    batcher = DecisionBatcher(lowest_bits)
+
+    try:
+        with pytest.raises(RuntimeError):
+            request(batcher, 0b11, 1)
+    finally:
+        batcher.close()
+
+
+def test_worker_processes_play_through_the_batcher() -> None:
+    seeds = range(4)
+    policies = [BatchedPolicy() for _ in range(NUMBER_OF_PLAYERS)]
+
+    with DecisionBatcher(lowest_bits) as batcher, batcher.executor(2) as executor:
+        winners = list(executor.map(play_game, seeds, [policies] * len(seeds)))
+
+    assert len(winners) == len(seeds)
+    assert batcher.stats().decisions > 0
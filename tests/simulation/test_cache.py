@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+import project.simulation.cache
+from project.game.rules import DEFAULT_RULES
+from project.simulation.cache import (
+    OutcomeCache,
+    constants_fingerprint,
+    outcome_fingerprint,
+)
+from project.simulation.results import RESULT_COLUMNS, play_result
+from project.simulation.sweep import grid_variants, run_sweep
+
+MAX_TURNS = 60
+
+
+@pytest.fixture
+def played(monkeypatch) -> list[int]:
+    """
+    Records the seed of every game the cache plays.
+    """
+    seeds = []
+
+    def play(seed: int, **kwargs) -> object:
+        seeds.append(seed)
+        return play_result(seed, **kwargs)
+
+    monkeypatch.setattr(project.simulation.cache, "play_result", play)
+
+    return seeds
+
+
+def test_outcomes_match_played_games(tmp_path, played) -> None:
+    cache = OutcomeCache(tmp_path, max_turns=MAX_TURNS)
+    seeds = [4, 1, 4, 7]
+
+    columns = cache.outcomes(seeds, workers=1)
+
+    assert played == [1, 4, 7]
+    assert len(cache) == 3
+
+    for row, seed in enumerate(seeds):
+        result = play_result(seed, max_turns=MAX_TURNS)
+
+        for name in RESULT_COLUMNS:
+            assert np.array_equal(columns[name][row], getattr(result, name))
+
+
+def test_only_missing_seeds_are_played(tmp_path, played) -> None:
+    first = OutcomeCache(tmp_path, max_turns=MAX_TURNS).outcomes(range(5), workers=1)
+    played.clear()
+
+    cache = OutcomeCache(tmp_path, max_turns=MAX_TURNS)
+    columns = cache.outcomes(range(8), workers=1)
+
+    assert played == [5, 6, 7]
+    assert len(cache) == 8
+
+    for name in RESULT_COLUMNS:
+        assert np.array_equal(columns[name][:5], first[name])
+
+    played.clear()
+    cache.outcomes([7, 0, 3], workers=1)
+
+    assert played == []
+
+
+def test_settings_have_separate_caches(tmp_path, played) -> None:
+    OutcomeCache(tmp_path, max_turns=MAX_TURNS).outcomes(range(3), workers=1)
+    played.clear()
+
+    other = OutcomeCache(tmp_path, max_turns=MAX_TURNS + 1)
+    other.outcomes(range(3), workers=1)
+
+    assert played == [0, 1, 2]
+    assert outcome_fingerprint(DEFAULT_RULES, MAX_TURNS) != outcome_fingerprint(
+        DEFAULT_RULES, MAX_TURNS + 1
+    )
+    assert outcome_fingerprint(
+        DEFAULT_RULES._replace(steal_one=0), MAX_TURNS
+    ) != outcome_fingerprint(DEFAULT_RULES, MAX_TURNS)
+
+
+def test_version_bump_invalidates_and_prunes(tmp_path, monkeypatch, played) -> None:
+    stale = OutcomeCache(tmp_path, max_turns=MAX_TURNS)
+    stale.outcomes(range(3), workers=1)
+    OutcomeCache(tmp_path, max_turns=MAX_TURNS + 1).outcomes(range(2), workers=1)
+
+    fingerprint = constants_fingerprint()
+    monkeypatch.setattr(
+        project.simulation.cache,
+        "CACHE_VERSION",
+        project.simulation.cache.CACHE_VERSION + 1,
+    )
+
+    assert constants_fingerprint() != fingerprint
+
+    played.clear()
+    cache = OutcomeCache(tmp_path, max_turns=MAX_TURNS)
+
+    assert len(cache) == 0
+
+    cache.outcomes(range(3), workers=1)
+
+    assert played == [0, 1, 2]
+    assert cache.prune() == 2
+    assert not stale.path.exists()
+    assert cache.path.exists()
+    assert cache.prune() == 0
+
+
+def test_cached_sweep_matches_played_sweep(tmp_path) -> None:
+    variants = grid_variants({"steal_one": [0, 4]})
+    seeds = range(12)
+
+    played = run_sweep(variants, seeds, max_turns=MAX_TURNS, workers=1)
+    filled = run_sweep(variants, seeds, max_turns=MAX_TURNS, workers=2, cache=tmp_path)
+    cached = run_sweep(variants, seeds, max_turns=MAX_TURNS, workers=1, cache=tmp_path)
+
+    assert filled == played
+    assert cached == played
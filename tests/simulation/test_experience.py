@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from project.simulation.experience import PrioritizedReplayBuffer, SumTree
+
+COLUMNS = {"value": (np.int64, ()), "pair": (np.float32, (2,))}
+
+
+def transitions(values: range) -> dict[str, np.ndarray]:
+    """
+    Builds a batch of transitions holding their own number.
+    """
+    values = np.asarray(values, dtype=np.int64)
+
+    return {"value": values, "pair": np.stack([values, -values], axis=1)}
+
+
+@pytest.mark.parametrize("capacity", [1, 5, 8, 13])
+def test_sum_tree_sums_and_finds(capacity: int) -> None:
+    rng = np.random.default_rng(capacity)
+    priorities = rng.random(capacity)
+    tree = SumTree(capacity)
+
+    tree.update(np.arange(capacity), priorities)
+
+    assert tree.total == pytest.approx(priorities.sum())
+    assert np.allclose(tree[np.arange(capacity)], priorities)
+
+    bounds = np.concatenate([[0.0], np.cumsum(priorities)])
+    values = rng.random(1000) * tree.total
+    expected = np.searchsorted(bounds, values, side="right") - 1
+
+    assert np.array_equal(tree.find(values), expected)
+
+
+def test_sum_tree_updates_do_not_drift() -> None:
+    rng = np.random.default_rng(0)
+    tree = SumTree(10)
+    priorities = np.zeros(10)
+
+    for _ in range(200):
+        indices = rng.integers(0, 10, size=4)
+        values = rng.random(4)
+
+        tree.update(indices, values)
+        # A repeated index keeps its last priority
+        priorities[indices] = values
+
+    assert tree.total == pytest.approx(priorities.sum(), abs=1e-12)
+    assert tree.find([tree.total]).item() <= 9
+
+
+def test_sampling_follows_priorities() -> None:
+    buffer = PrioritizedReplayBuffer(4, COLUMNS, alpha=1.0, epsilon=0.0, seed=0)
+    priorities = np.array([1.0, 2.0, 3.0, 4.0])
+
+    buffer.add(transitions(range(4)), priorities)
+
+    counts = np.zeros(4)
+
+    for _ in range(500):
+        sample = buffer.sample(20)
+        counts += np.bincount(sample.indices, minlength=4)
+
+        assert np.array_equal(sample.columns["value"], sample.indices)
+
+    assert np.allclose(counts / counts.sum(), priorities / priorities.sum(), atol=0.01)
+
+    sample = buffer.sample(8, beta=1.0)
+
+    # Rarer transitions get larger weights, the most likely one weighs 1
+    expected = (priorities.min() / priorities[sample.indices]).astype(np.float32)
+    assert np.allclose(sample.weights, expected / expected.max())
+
+
+def test_updated_priorities_change_sampling() -> None:
+    buffer = PrioritizedReplayBuffer(4, COLUMNS, alpha=1.0, epsilon=0.0, seed=1)
+    buffer.add(transitions(range(4)), np.ones(4))
+
+    buffer.update_priorities([0, 1, 2], [0.0, 0.0, 0.0])
+
+    assert set(buffer.sample(16).indices.tolist()) == {3}
+    assert buffer.max_priority == 1.0
+
+
+def test_ring_overwrites_the_oldest_transitions() -> None:
+    buffer = PrioritizedReplayBuffer(4, COLUMNS, seed=2)
+
+    buffer.add(transitions(range(3)))
+    slots = buffer.add(transitions(range(3, 9)))
+
+    assert len(buffer) == 4
+    assert slots.tolist() == [3, 0, 1, 2]
+    assert sorted(buffer.columns["value"].tolist()) == [5, 6, 7, 8]
+
+    with pytest.raises(ValueError):
+        buffer.add({"value": np.zeros(1)})
+
+
+def test_empty_buffer_cannot_sample() -> None:
+    with pytest.raises(ValueError):
+        PrioritizedReplayBuffer(4, COLUMNS).sample(1)
+
+
+def test_memory_mapped_buffer_reopens(tmp_path) -> None:
+    with PrioritizedReplayBuffer(6, COLUMNS, path=tmp_path, seed=3) as buffer:
+        buffer.add(transitions(range(4)), [1.0, 5.0, 2.0, 3.0])
+        total = buffer.tree.total
+
+    reopened = PrioritizedReplayBuffer(6, COLUMNS, path=tmp_path, seed=3)
+
+    assert len(reopened) == 4
+    assert reopened.cursor == 4
+    assert reopened.max_priority == 5.0
+    assert reopened.tree.total == pytest.approx(total)
+    assert reopened.columns["value"][:4].tolist() == [0, 1, 2, 3]
+    assert reopened.columns["pair"][3].tolist() == [3.0, -3.0]
@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import numpy as np
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.engine import GameEngine
+from project.game.fastforward import FastForwardEngine
+from project.simulation.golden import (
+    SKIPPED,
+    check_engine,
+    check_seed,
+    describe_divergence,
+    load_traces,
+    record_trace,
+    record_traces,
+    save_traces,
+)
+
+
+class LateDiceEngine(GameEngine):
+    """
+    Candidate engine whose dice total is off by one on turn 5.
+    """
+
+    def roll_movement_dice(self) -> int:
+        total = super().roll_movement_dice()
+
+        return total + 1 if self.turn_count == 5 else total
+
+
+class SkippingEngine(GameEngine):
+    """
+    Candidate engine skipping every other turn silently, without moving the piece.
+    """
+
+    def advance(self, max_turns: int | None = None) -> int | None:
+        if self.turn_count % 2:
+            self.roll_movement_dice()
+            self.current_agent_index = (
+                self.current_agent_index + 1
+            ) % NUMBER_OF_PLAYERS
+            self.turn_count += 1
+
+            return None
+
+        return self.step()
+
+
+def test_reference_engine_matches_itself() -> None:
+    assert check_engine(GameEngine, range(10), workers=1) == []
+
+
+def test_fast_forward_is_checked_through_advance() -> None:
+    traces = [record_trace(seed, FastForwardEngine) for seed in range(10)]
+
+    assert any((trace.turns == SKIPPED).all(axis=1).any() for trace in traces)
+    assert check_engine(FastForwardEngine, range(50), workers=1) == []
+
+
+def test_divergences_are_located() -> None:
+    divergence = check_seed(0, LateDiceEngine)
+
+    assert divergence is not None
+    assert divergence.turn == 5
+    assert divergence.field == "movement"
+    assert divergence.actual == divergence.expected + 1
+    assert "diverged at turn 5" in describe_divergence(divergence)
+
+
+def test_skipped_turns_are_checked_by_the_next_played_turn() -> None:
+    divergence = check_seed(0, SkippingEngine)
+
+    assert divergence is not None
+    assert divergence.turn == 2
+
+
+def test_stored_traces_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "golden.npz"
+    traces = record_traces(range(5), max_turns=30, workers=1)
+
+    save_traces(traces, path)
+    loaded = load_traces(path)
+
+    assert loaded.rules == traces.rules
+    assert loaded.max_turns == 30
+
+    for expected, actual in zip(traces.traces, loaded.traces):
+        assert expected.seed == actual.seed
+        assert expected.winner == actual.winner
+        assert np.array_equal(expected.turns, actual.turns)
+
+    assert check_engine(FastForwardEngine, loaded, workers=2) == []
@@ -0,0 +1,112 @@
+import gzip
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.logging import configure_logging_from_settings
+from project.logging.sink import BufferedFileSink
+from project.settings import get_settings
+from project.simulation.ingest import (
+    TRAJECTORY_FIELDS,
+    TrajectoryParser,
+    ingest_logs,
+    load_trajectories,
+)
+from project.simulation.results import ResultsStore, simulate
+
+TRACED_SEEDS = [1, 3, 4]
+
+
+@pytest.fixture
+def traced_log(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, root_handlers: None
+) -> tuple[Path, ResultsStore]:
+    """
+    Simulates games with two workers, tracing some seeds to a JSON log file.
+    """
+    path = tmp_path / "log.jsonl"
+    monkeypatch.setenv("PROJECT_LOG__SINK", "file")
+    monkeypatch.setenv("PROJECT_LOG__FORMAT", "json")
+    monkeypatch.setenv("PROJECT_LOG__FILE_PATH", str(path))
+    monkeypatch.setenv("PROJECT_LOG__LEVEL", "WARNING")
+    monkeypatch.setenv("PROJECT_LOG__TRACE_SEEDS", json.dumps(TRACED_SEEDS))
+    get_settings.cache_clear()
+
+    store = ResultsStore(tmp_path / "results")
+
+    try:
+        configure_logging_from_settings(get_settings().log)
+        simulate(store, range(6), workers=2, chunksize=1)
+    finally:
+        get_settings.cache_clear()
+
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, BufferedFileSink):
+            handler.close()
+
+    return path, store
+
+
+def test_traced_games_round_trip(tmp_path: Path, traced_log) -> None:
+    path, store = traced_log
+
+    stats = ingest_logs([path], tmp_path / "trajectories")
+    trajectories = sorted(
+        load_trajectories(tmp_path / "trajectories"), key=lambda t: t.seed
+    )
+    results = store.select(["seed", "winner", "turns"])
+
+    assert stats.games == len(TRACED_SEEDS)
+    assert stats.incomplete == 0
+    assert [trajectory.seed for trajectory in trajectories] == TRACED_SEEDS
+
+    for trajectory in trajectories:
+        row = results["seed"].tolist().index(trajectory.seed)
+
+        assert trajectory.winner == results["winner"][row]
+        assert len(trajectory.turns) == results["turns"][row]
+        assert trajectory.turns.shape[1] == len(TRAJECTORY_FIELDS)
+        assert len(trajectory.conditions) == NUMBER_OF_PLAYERS
+
+        # The winner ends the game holding its whole condition
+        final = trajectory.turns[-1, -NUMBER_OF_PLAYERS:]
+        assert final[trajectory.winner] == trajectory.conditions[trajectory.winner]
+
+
+def test_compressed_logs_match_plain_ones(tmp_path: Path, traced_log) -> None:
+    path, _ = traced_log
+    compressed = tmp_path / "log.jsonl.1"
+
+    with gzip.open(compressed, "wb") as file:
+        file.write(path.read_bytes())
+
+    ingest_logs([path], tmp_path / "plain")
+    ingest_logs([compressed], tmp_path / "compressed")
+
+    for plain, unpacked in zip(
+        load_trajectories(tmp_path / "plain"),
+        load_trajectories(tmp_path / "compressed"),
+        strict=True,
+    ):
+        assert plain.seed == unpacked.seed
+        assert (plain.turns == unpacked.turns).all()
+
+
+def test_dropped_lines_make_games_incomplete(traced_log) -> None:
+    path, _ = traced_log
+    lines = path.read_text("utf-8").splitlines()
+    dropped = next(
+        index
+        for index, line in enumerate(lines)
+        if json.loads(line).get("seed") == TRACED_SEEDS[0]
+        and json.loads(line)["event"] == "Agent gained ingredients"
+    )
+
+    parser = TrajectoryParser()
+    games = [*parser.parse(lines[:dropped] + lines[dropped + 1 :]), *parser.close()]
+
+    assert sorted(game.seed for game in games) == TRACED_SEEDS[1:]
+    assert parser.stats().incomplete == 1
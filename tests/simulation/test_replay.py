@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import pytest
+
+from project.game.agent import Agent
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.engine import GameEngine
+from project.game.snapshot import GameSnapshot
+from project.simulation.replay import (
+    GameRecording,
+    Replay,
+    load_recording,
+    record_game,
+    save_recording,
+)
+
+
+class LowestBitsPolicy:
+    """
+    Deterministic policy picking the lowest valid ingredients, unlike the random default.
+    """
+
+    def select(
+        self, engine: GameEngine, agent: Agent, kind: str, mask: int, amount: int
+    ) -> int:
+        selected = 0
+
+        while mask and selected.bit_count() < amount:
+            selected |= mask & -mask
+            mask &= mask - 1
+
+        return selected
+
+
+def states_of(seed: int, steps: int) -> list[GameSnapshot]:
+    """
+    Plays a game straight through, keeping the state after every step.
+    """
+    engine = GameEngine(seed=seed, policies=[LowestBitsPolicy()] * NUMBER_OF_PLAYERS)
+    snapshots = [engine.snapshot()]
+
+    for _ in range(steps):
+        engine.step()
+        snapshots.append(engine.snapshot())
+
+    return snapshots
+
+
+@pytest.fixture
+def recording() -> GameRecording:
+    return record_game(5, policies=[LowestBitsPolicy()] * NUMBER_OF_PLAYERS)
+
+
+def test_seek_matches_a_straight_play(recording: GameRecording) -> None:
+    expected = states_of(recording.seed, recording.steps)
+    replay = Replay(recording, interval=4)
+
+    for step in [recording.steps, 3, 17, 0, 9, 8, recording.steps - 1, 1]:
+        assert replay.seek(step).snapshot() == expected[step]
+
+
+def test_forward_and_backward(recording: GameRecording) -> None:
+    expected = states_of(recording.seed, recording.steps)
+    replay = Replay(recording, interval=3)
+
+    replay.seek(10)
+
+    assert replay.backward().snapshot() == expected[9]
+    assert replay.forward().snapshot() == expected[10]
+
+    replay.seek(0)
+
+    with pytest.raises(ValueError):
+        replay.backward()
+
+
+def test_replay_reaches_the_recorded_winner(recording: GameRecording) -> None:
+    replay = Replay(recording)
+    winner = None
+
+    for _ in range(recording.steps):
+        winner = replay.step()
+
+    assert winner == recording.winner_id
+
+    with pytest.raises(ValueError):
+        replay.step()
+
+
+def test_recording_round_trip(recording: GameRecording, tmp_path: Path) -> None:
+    path = tmp_path / "game.json"
+
+    save_recording(recording, path)
+
+    assert load_recording(path) == recording
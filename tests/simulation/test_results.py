@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.queue import ACTION_NAMES
+from project.simulation.results import (
+    NO_WINNER,
+    RESULT_COLUMNS,
+    GameResult,
+    ResultsStore,
+    play_result,
+    simulate,
+)
+
+
+def test_results_round_trip(tmp_path) -> None:
+    results = [play_result(seed, max_turns=40) for seed in range(5)]
+
+    with ResultsStore(tmp_path, chunk_size=2) as store:
+        store.extend(results)
+
+        assert len(store) == 5
+
+    reopened = ResultsStore(tmp_path)
+    columns = reopened.select(RESULT_COLUMNS)
+
+    assert reopened.chunk_ids() == [0, 1, 2]
+    assert len(reopened) == 5
+
+    for row, result in enumerate(results):
+        for name in RESULT_COLUMNS:
+            assert np.array_equal(columns[name][row], getattr(result, name))
+
+
+def test_queries_filter_rows(tmp_path) -> None:
+    never = (0,) * NUMBER_OF_PLAYERS
+    cards = (0,) * len(ACTION_NAMES)
+    results = [
+        GameResult(seed, seed % 3 - 1, 10 * seed, never, never, cards)
+        for seed in range(9)
+    ]
+
+    with ResultsStore(tmp_path, chunk_size=4) as store:
+        store.extend(results)
+
+    assert store.count() == 9
+    assert store.count(lambda chunk: chunk["winner"] == NO_WINNER) == 3
+    assert store.mean(lambda chunk: chunk["turns"]) == 40.0
+    assert store.mean(
+        lambda chunk: chunk["turns"], where=lambda chunk: chunk["winner"] == 0
+    ) == pytest.approx(40.0)
+    assert np.isnan(
+        store.mean(lambda chunk: chunk["turns"], lambda chunk: chunk["seed"] < 0)
+    )
+
+    selected = store.select(["seed"], where=lambda chunk: chunk["winner"] == 1)
+
+    assert selected["seed"].tolist() == [2, 5, 8]
+
+
+def test_unfinished_chunks_are_ignored(tmp_path) -> None:
+    with ResultsStore(tmp_path) as store:
+        store.append(play_result(0, max_turns=20))
+
+    (tmp_path / "000000.seed.npy").unlink()
+
+    assert len(ResultsStore(tmp_path)) == 0
+
+
+def test_simulate_matches_serial_play(tmp_path) -> None:
+    store = ResultsStore(tmp_path)
+
+    simulate(store, range(6), max_turns=60, workers=2, chunksize=2)
+
+    expected = [play_result(seed, max_turns=60) for seed in range(6)]
+
+    assert store.select(["seed"])["seed"].tolist() == list(range(6))
+    assert store.select(["winner"])["winner"].tolist() == [
+        result.winner for result in expected
+    ]
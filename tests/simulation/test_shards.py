@@ -0,0 +1,82 @@
+import argparse
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from project.__main__ import sweep
+from project.game.rules import DEFAULT_RULES
+from project.simulation.shards import ShardQueue, work, work_locally
+from project.simulation.sweep import grid_variants, run_sweep
+
+VARIANTS = grid_variants({"steal_one": [0, 4]})
+
+
+def age(path: Path, seconds: float, now: float) -> None:
+    """
+    Sets the modification time of a file to some seconds before a given time.
+    """
+    os.utime(path, (now - seconds, now - seconds))
+
+
+def test_merged_shards_match_a_local_sweep(tmp_path: Path) -> None:
+    queue = ShardQueue.create(tmp_path / "queue", VARIANTS, range(10), shard_size=4)
+
+    assert len(queue) == 6
+    assert work(queue.path, node="test") == 6
+    assert queue.remaining() == 0
+    assert queue.merge() == run_sweep(VARIANTS, range(10), workers=1)
+
+
+def test_local_workers_share_the_shards(tmp_path: Path) -> None:
+    queue = ShardQueue.create(tmp_path / "queue", VARIANTS, range(20), shard_size=2)
+
+    # Every shard is played exactly once, whichever worker claims it
+    assert work_locally(queue.path, 3) == len(queue) == 20
+    assert queue.merge() == run_sweep(VARIANTS, range(20), workers=1)
+
+
+def test_merge_needs_every_shard(tmp_path: Path) -> None:
+    queue = ShardQueue.create(tmp_path / "queue", [DEFAULT_RULES], range(4))
+
+    with pytest.raises(ValueError):
+        queue.merge()
+
+
+def test_leases_expire_on_the_share_clock(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    queue = ShardQueue.create(
+        tmp_path / "queue", [DEFAULT_RULES], range(4), shard_size=2, lease=60.0
+    )
+    first = queue.claim()
+    second = queue.claim()
+    now = queue.now()
+
+    age(queue.claimed / f"{first.id:08d}", 30.0, now)
+    age(queue.claimed / f"{second.id:08d}", 90.0, now)
+
+    # The clock of this node is far ahead of the share: only the share's clock counts
+    monkeypatch.setattr(time, "time", lambda: now + 3600.0)
+
+    assert queue.requeue_expired() == 1
+    assert os.listdir(queue.pending) == [f"{second.id:08d}"]
+
+
+def test_queued_sweeps_reject_a_cache(tmp_path: Path) -> None:
+    args = argparse.Namespace(
+        random=[],
+        grid=["steal_one=0,4"],
+        first_seed=0,
+        games=10,
+        queue=tmp_path / "queue",
+        cache=tmp_path / "cache",
+        shard_size=4,
+        lease=60.0,
+    )
+
+    with pytest.raises(SystemExit):
+        sweep(args)
+
+    assert not args.queue.exists()
@@ -0,0 +1,101 @@
+import csv
+
+import pytest
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.rules import DEFAULT_RULES, Rules
+from project.simulation.sweep import (
+    grid_variants,
+    random_variants,
+    run_sweep,
+    summarize_variant,
+    validate_variant,
+    write_results,
+)
+
+
+def test_grid_variants_cover_every_combination() -> None:
+    variants = grid_variants({"lose_one": [0, 1], "steal_two": [2, 3, 4]})
+
+    assert len(variants) == 6
+    assert variants[0] == DEFAULT_RULES._replace(lose_one=0, steal_two=2)
+    assert variants[-1] == DEFAULT_RULES._replace(lose_one=1, steal_two=4)
+
+
+def test_random_variants_depend_only_on_the_seed() -> None:
+    ranges = {"choose_one": (0, 5), "tiles_per_ingredient": (2, 6)}
+
+    variants = random_variants(ranges, 20, seed=3)
+
+    assert variants == random_variants(ranges, 20, seed=3)
+    assert all(0 <= rules.choose_one <= 5 for rules in variants)
+    assert all(2 <= rules.tiles_per_ingredient <= 6 for rules in variants)
+
+
+def test_validate_variant_reports_unplayable_rules() -> None:
+    empty_deck = Rules(
+        lose_one=0,
+        lose_two=0,
+        lose_all=0,
+        choose_one=0,
+        choose_two=0,
+        steal_one=0,
+        steal_two=0,
+    )
+
+    assert validate_variant(DEFAULT_RULES) is None
+    assert validate_variant(DEFAULT_RULES._replace(lose_one=-1)) is not None
+    assert validate_variant(empty_deck) is not None
+    assert validate_variant(empty_deck._replace(queued_random_action_tiles=0)) is None
+
+
+def test_summarize_variant() -> None:
+    outcomes = [(0, 10), (None, 20), (0, 30), (1, 40)]
+
+    summary = summarize_variant(DEFAULT_RULES, outcomes)
+
+    assert summary.games == 4
+    assert summary.finish_rate == 0.75
+    assert summary.seat_win_rates[:2] == (0.5, 0.25)
+    assert sum(summary.seat_win_rates) == 0.75
+    assert summary.mean_turns == 25
+    assert summary.median_turns == 25
+    assert summary.max_turns == 40
+
+
+def test_invalid_variants_are_skipped() -> None:
+    variants = [DEFAULT_RULES._replace(lose_one=-1), DEFAULT_RULES]
+
+    summaries = run_sweep(variants, range(4), workers=1)
+
+    assert [summary.rules for summary in summaries] == [DEFAULT_RULES]
+
+
+def test_workers_do_not_change_the_summaries() -> None:
+    variants = grid_variants({"steal_one": [0, 4]})
+
+    serial = run_sweep(variants, range(6), workers=1, chunksize=4)
+    parallel = run_sweep(variants, range(6), workers=2, chunksize=4)
+
+    assert serial == parallel
+
+
+def test_sweep_needs_a_seed() -> None:
+    with pytest.raises(ValueError):
+        run_sweep([DEFAULT_RULES], [], workers=1)
+
+
+def test_write_results(tmp_path) -> None:
+    summary = summarize_variant(DEFAULT_RULES, [(0, 10), (None, 20)])
+    path = tmp_path / "sweep.csv"
+
+    write_results([summary], path)
+
+    with path.open(encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+
+    assert len(rows) == 1
+    assert int(rows[0]["lose_one"]) == DEFAULT_RULES.lose_one
+    assert float(rows[0]["finish_rate"]) == 0.5
+    assert float(rows[0]["seat_0_win_rate"]) == 0.5
+    assert f"seat_{NUMBER_OF_PLAYERS - 1}_win_rate" in rows[0]
@@ -0,0 +1,48 @@
+import pytest
+
+from project.game.constants import NUMBER_OF_PLAYERS
+from project.game.policy import RandomPolicy
+from project.simulation.tournament import (
+    PairedGames,
+    play_game,
+    play_paired,
+    run_tournament,
+    summarize,
+)
+
+
+def test_identical_policies_replay_the_same_game() -> None:
+    record = play_paired(11, RandomPolicy, RandomPolicy)
+    winner = play_game(11, [RandomPolicy() for _ in range(NUMBER_OF_PLAYERS)])
+
+    assert record.baseline_winner == winner
+    assert record.challenger_winners == (winner,) * NUMBER_OF_PLAYERS
+
+
+def test_summarize_pairs_seats_of_a_seed() -> None:
+    never = (None,) * NUMBER_OF_PLAYERS
+    seat_zero = (0, *never[1:])
+    records = [PairedGames(0, None, seat_zero), PairedGames(1, None, never)]
+
+    result = summarize(records)
+
+    assert result.seeds == 2
+    assert result.challenger_win_rate == pytest.approx(1 / (2 * NUMBER_OF_PLAYERS))
+    assert result.baseline_win_rate == 0.0
+    assert result.difference == pytest.approx(1 / (2 * NUMBER_OF_PLAYERS))
+
+
+def test_summarize_needs_two_seeds() -> None:
+    with pytest.raises(ValueError):
+        summarize([PairedGames(0, None, (None,) * NUMBER_OF_PLAYERS)])
+
+
+def test_workers_do_not_change_the_result() -> None:
+    seeds = range(8)
+
+    serial = run_tournament(RandomPolicy, RandomPolicy, seeds, workers=1)
+    parallel = run_tournament(RandomPolicy, RandomPolicy, seeds, workers=2)
+
+    assert serial == parallel
+    assert serial.difference == 0.0
+    assert serial.paired_standard_error == 0.0